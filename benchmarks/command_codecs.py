@@ -0,0 +1,104 @@
+# Encode and decode time and encoded size of every command the server sends, for each codec a
+# connection can agree on. Every OutboundCommands method needs a sample below, so a command added
+# later is not silently left out. Run from the repository root:
+#     python benchmarks/command_codecs.py [--repeat 2000]
+import argparse
+import inspect
+import os
+import sys
+import time
+from datetime import date, datetime
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+from networking.command_codec import CODECS, Codec
+from static.commands import OutboundCommands
+
+FILE_HASH = 'ab' * 32
+QUESTION = {
+    'title': 'Help with homework', 'subject': 'Mathematics', 'description': 'Can someone explain this topic, I missed the lesson on it',
+    'expires_date': date(2024, 6, 1), 'second_year_content': False
+}
+STATISTICS = {'recipient_ammount': 24, 'recipient_awnsers': 3}
+USER_DETAILS = {
+    'first_name': 'George', 'last_name': 'Taylor', 'email': 'george.taylor@school.org', 'password': '',
+    'tutor_group': '13SL', 'option_one': 'Mathematics', 'option_two': 'Physics', 'option_three': 'Computer Science',
+    'option_four': 'None', 'points': 120
+}
+MESSAGE = {'first_name': 'George', 'last_name': 'Jones', 'date_sent': datetime(2024, 5, 1, 12, 30), 'body': 'thanks that helps', 'reply_id': 48213}
+FILE_DETAILS = {'file_name': 'worksheet.pdf', 'file_size': 183_204, 'file_hash': FILE_HASH}
+LOGIN_BATCH_SIZE = 250
+
+SAMPLES: dict[str, tuple] = {
+    'register_response': (False, 'That email is already registered'),
+    'verify_response': (True,),
+    'login_response': (True,),
+    'ask_question_response': (True,),
+    'add_pending_question': (4812, QUESTION, STATISTICS),
+    'add_incoming_question': (4812, 41, 'George', 'Jones', QUESTION),
+    'load_user_details': (41, USER_DETAILS, 'Online'),
+    'create_profile_viewer': (USER_DETAILS, 'Offline'),
+    'message_ack': (124, 'f3a1c2d4e5b60718293a4b5c6d7e8f90', 48213),
+    'create_new_chat': (124, 41, 'George', 'Jones', QUESTION, True),
+    'create_chat_reply': (124, MESSAGE),
+    'delete_pending_question': (4812,),
+    'delete_incoming_question': (4812,),
+    'delete_question_chat': (124,),
+    'load_file': (124, 'worksheet.pdf', 'QUJD' * 4_096, 12_288, False),
+    'create_chat_file': (124, FILE_DETAILS),
+    'file_begin': (7, 124, 'worksheet.pdf', 183_204, FILE_HASH, 65_536),
+    'file_begin_response': (124, FILE_HASH, 7, 0, True, '', 262_144),
+    'file_window': (7, 65_536),
+    'file_end': (7,),
+    'create_manual_user': (41, 'George', 'Jones', 'Online'),
+    'update_question_statistics': (4812, STATISTICS),
+    'batch': ([OutboundCommands.add_incoming_question(4812 + index, 41, 'George', 'Jones', QUESTION) for index in range(LOGIN_BATCH_SIZE)],),
+    'display_rating_error': (124, 'You have already rated this user'),
+    'rate_limited': ('send-message-request', 0.25),
+    'session_token': ('4Jd8' * 24,),
+    'resume_response': (False, 'The session has expired'),
+    'ping': (),
+    'pong': ()
+}
+
+
+def get_commands() -> dict[str, Any]:
+    names = [name for name, member in inspect.getmembers(OutboundCommands, inspect.isfunction) if not name.startswith('_')]
+    missing = [name for name in names if name not in SAMPLES]
+    if missing: raise SystemExit(f'no sample for {", ".join(missing)}')
+    return {name: getattr(OutboundCommands, name)(*SAMPLES[name]) for name in names}
+
+
+# Microseconds for each encode and each decode
+def measure(codec: Codec, command: Any, repeat: int) -> tuple[int, float, float]:
+    encoded_command = codec.encode(command)
+    start = time.perf_counter()
+    for _ in range(repeat): codec.encode(command)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeat): codec.decode(encoded_command)
+    decode_time = time.perf_counter() - start
+    return len(encoded_command), encode_time / repeat * 1e6, decode_time / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = list(CODECS.values())
+    print(f'{"command":<28}' + ''.join(f'{codec.name + " bytes":>15}{"enc us":>9}{"dec us":>9}' for codec in codecs))
+    totals = {codec.name: [0, 0.0, 0.0] for codec in codecs}
+    for name, command in get_commands().items():
+        row = f'{name:<28}'
+        for codec in codecs:
+            results = measure(codec, command, max(args.repeat // 100, 10) if name == 'batch' else args.repeat)
+            row += f'{results[0]:>15,}{results[1]:>9.2f}{results[2]:>9.2f}'
+            totals[codec.name] = [total + result for total, result in zip(totals[codec.name], results)]
+        print(row)
+    print(f'{"total":<28}' + ''.join(f'{totals[codec.name][0]:>15,}{totals[codec.name][1]:>9.2f}{totals[codec.name][2]:>9.2f}' for codec in codecs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Bytes on the wire and CPU time per frame for every codec and compression a connection can agree
+# on, with and without the shared dictionary. Frames are the commands sent over a set of sessions
+# built like the ones the dictionary is trained on but from a different seed, so the dictionary
+# is not measured on its own training data. Run from the repository root:
+#     python benchmarks/compression.py [--sessions 50] [--dictionary server/networking/compression_dictionary.bin]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from train_dictionary import sample_commands
+
+from networking.command_codec import CODECS
+from networking.compression import DEFAULT_COMPRESSION_THRESHOLD, DICTIONARY_PATH, NO_COMPRESSION, Compressor, load_dictionary, supported_compressions
+
+BENCHMARK_SEED = 1
+
+
+def measure(frames: list[bytes], compressor: Compressor) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    compressed_frames = [compressor.compress(frame) for frame in frames]
+    compress_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in compressed_frames: compressor.decompress(frame)
+    decompress_time = time.perf_counter() - start
+    return sum(map(len, compressed_frames)), compress_time / len(frames) * 1e6, decompress_time / len(frames) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--dictionary', default=DICTIONARY_PATH)
+    args = parser.parse_args()
+
+    commands = sample_commands(args.sessions, BENCHMARK_SEED)
+    dictionary = load_dictionary(args.dictionary)
+    print(f'{len(commands)} frames, {len(dictionary)} byte dictionary')
+    print(f'{"codec":<9}{"compression":<13}{"dictionary":<12}{"bytes":>10}{"ratio":>8}{"compress us":>13}{"decompress us":>15}')
+    for codec in CODECS.values():
+        frames = [codec.encode(command) for command in commands]
+        raw_size = sum(map(len, frames))
+        for algorithm in [NO_COMPRESSION] + supported_compressions():
+            for frame_dictionary in ([b''] if algorithm == NO_COMPRESSION else [b'', dictionary]):
+                compressor = Compressor(algorithm, frame_dictionary, DEFAULT_COMPRESSION_THRESHOLD)
+                size, compress_time, decompress_time = measure(frames, compressor)
+                print(f'{codec.name:<9}{algorithm:<13}{"yes" if frame_dictionary else "no":<12}{size:>10,}'
+                      f'{raw_size / size:>8.2f}{compress_time:>13.1f}{decompress_time:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# RSA decrypts per second for legacy frames, done on the connection threads as before and through
+# a CryptoPool with each number of worker processes. The counts go past the core count, so where
+# adding workers stops paying off shows up too. Several connections decrypt at once, each sending
+# its frames to the pool a read at a time as the servers do.
+# Run from the repository root:
+#     python benchmarks/crypto_pool.py [--frames 400] [--connections 8] [--batch-size 8] [--workers 1 2 4]
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+from networking.crypto_pool import DEFAULT_CRYPTO_BATCH_SIZE, CryptoPool
+from networking.crypto_utils import CryptoUtils, KeyType
+
+PRIVATE_KEY_PATH = os.path.join(ROOT, 'server', 'networking', 'server_private_key.pem')
+PUBLIC_KEY_PATH = os.path.join(ROOT, 'client', 'networking', 'server_public_key.pem')
+FRAMES_PER_READ = 16 # Legacy frames a connection gets from one recv while the server is busy
+
+
+# Every connection decrypts its share of the frames on its own thread, returns decrypts per second
+def measure(frames: list[bytes], connections: int, decrypt: Any) -> float:
+    def run_connection(connection_frames: list[bytes]) -> None:
+        for index in range(0, len(connection_frames), FRAMES_PER_READ):
+            if None in decrypt(connection_frames[index:index + FRAMES_PER_READ]): raise SystemExit('a frame did not decrypt')
+
+    threads = [threading.Thread(target=run_connection, args=(frames[index::connections],)) for index in range(connections)]
+    start = time.perf_counter()
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=400)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_CRYPTO_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, 4, 8, cores, cores * 2}))
+    args = parser.parse_args()
+
+    private_key = CryptoUtils.load_key_from_file(PRIVATE_KEY_PATH, KeyType.PRIVATE)
+    public_key = CryptoUtils.load_key_from_file(PUBLIC_KEY_PATH, KeyType.PUBLIC)
+    frames = [CryptoUtils.encrypt_data(b'{"command_name": "ping", "arguments": {}}', public_key) for _ in range(args.frames)]
+
+    print(f'{args.frames} frames from {args.connections} connections, batch size {args.batch_size}, {cores} cores')
+    print(f'{"decrypted by":<24}{"decrypts/s":>12}{"speedup":>9}{"per worker":>12}')
+    inline = measure(frames, args.connections, lambda batch: [CryptoUtils.decrypt_data(frame, private_key) for frame in batch])
+    print(f'{"connection threads":<24}{inline:>12,.0f}{1:>8.2f}x')
+    for workers in args.workers:
+        pool = CryptoPool(PRIVATE_KEY_PATH, workers, args.batch_size)
+        try:
+            pool.decrypt(frames[:workers * args.batch_size]) # Starts the processes before timing
+            decrypts = measure(frames, args.connections, pool.decrypt)
+        finally:
+            pool.shutdown()
+        print(f'{f"pool of {workers}":<24}{decrypts:>12,.0f}{decrypts / inline:>8.2f}x{decrypts / workers:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# MB/s of a file sent over a real socket as the clients and the server send attachments: a
+# file-begin, the file in binary frames of the chunk size and a file-end. Uploads go through the
+# server's flow controlled transfers and downloads are streamed from a memory mapped blob, on both
+# socket backends. Every transfer is checked against the file's hash. Run from the repository root:
+#     python benchmarks/file_transfer.py [--size 16777216] [--chunk-size 65536] [--runs 3]
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT, 'server')
+CLIENT_PATH = os.path.join(ROOT, 'client')
+BACKENDS = ('threaded', 'asyncio')
+HEADER_SIZE = 4
+CHAT_ID = 1
+TRANSFER_TIMEOUT = 120 # Seconds
+
+
+# Takes uploads into the server's transfers and streams downloads from its blob store the same
+# way the server's handlers do, without the database behind them
+def serve(backend: str, port: int, blob_path: str, chunk_size: int) -> None:
+    sys.path.insert(0, SERVER_PATH)
+    from networking.async_server_socket import AsyncServerSocket
+    from networking.binary_frames import DEFAULT_STREAM_WINDOW
+    from networking.server_socket import ServerSocket
+    from services.blob_store import BlobStore
+    from services.file_transfers import FileTransfers
+    from static.commands import OutboundCommands
+
+    blob_store, file_transfers = BlobStore(blob_path), FileTransfers()
+
+    def stream_file(user: Any, file_hash: str) -> None:
+        transfer_id = 1
+        with blob_store.map(file_hash) as contents, memoryview(contents) as view:
+            user.send_command(OutboundCommands.file_begin(transfer_id, CHAT_ID, 'download', len(contents), file_hash))
+            for offset in range(0, len(contents), chunk_size):
+                if not user.send_binary(transfer_id, offset, view[offset:offset + chunk_size]): return
+        user.send_command(OutboundCommands.file_end(transfer_id))
+
+    def recv_command(user: Any, command: dict) -> None:
+        name, arguments = command['command_name'], command['arguments']
+        if name == 'file-begin':
+            transfer = file_transfers.begin(user.address[1], CHAT_ID, arguments['file_name'], arguments['file_size'], arguments['file_hash'])
+            user.send_command(OutboundCommands.file_begin_response(CHAT_ID, arguments['file_hash'], transfer.transfer_id, window=DEFAULT_STREAM_WINDOW))
+        elif name == 'file-end':
+            transfer = file_transfers.get(arguments['transfer_id'], user.address[1])
+            complete = transfer.received == transfer.file_size and file_transfers.finish(transfer) and transfer.is_complete()
+            transfer.close()
+            user.send_command({'command_name': 'upload-complete', 'arguments': {'complete': complete}})
+        elif name == 'file-download-request':
+            threading.Thread(target=stream_file, args=(user, arguments['file_hash'])).start()
+
+    def recv_chunk(user: Any, transfer_id: int, offset: int, data: memoryview) -> None:
+        transfer = file_transfers.get(transfer_id, user.address[1])
+        if not transfer or not transfer.write(offset, data): return
+        increment = transfer.release_window(DEFAULT_STREAM_WINDOW)
+        if increment: user.send_command(OutboundCommands.file_window(transfer_id, increment))
+
+    server_socket_class = AsyncServerSocket if backend == 'asyncio' else ServerSocket
+    server_socket = server_socket_class(
+        server_private_key_path=os.path.join(SERVER_PATH, 'networking', 'server_private_key.pem'),
+        client_public_key_path=os.path.join(SERVER_PATH, 'networking', 'client_public_key.pem'),
+        port=port, format='utf-8', backlog=16, header_size=HEADER_SIZE,
+        recv_callback=recv_command, binary_callback=recv_chunk, user_disconnect_callback=lambda user: None
+    )
+    print('ready', flush=True)
+    server_socket.serve_forever()
+
+
+def start_server(backend: str, blob_path: str, chunk_size: int) -> tuple[subprocess.Popen, int]:
+    with socket.socket() as probe:
+        probe.bind(('', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, __file__, '--serve', backend, str(port), blob_path, str(chunk_size)], stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()
+    return server, port
+
+
+class Client:
+    def __init__(self, port: int) -> None:
+        from networking.client_socket import ClientSocket
+        self.replies: dict[str, dict] = dict()
+        self.replied = threading.Condition()
+        self.download_hash = hashlib.sha256()
+        self.download_offset = 0
+        self.socket = ClientSocket(
+            port=port, format='utf-8', backlog=10, header_size=HEADER_SIZE,
+            client_private_key_path=os.path.join(CLIENT_PATH, 'networking', 'client_private_key.pem'),
+            server_public_key_path=os.path.join(CLIENT_PATH, 'networking', 'server_public_key.pem'),
+            recv_callback=self.on_command, binary_callback=self.on_chunk, reconnect=False
+        )
+        while not self.socket.capabilities: time.sleep(0.01)
+
+
+    def on_command(self, command: dict) -> None:
+        with self.replied:
+            self.replies[command['command_name']] = command['arguments']
+            self.replied.notify_all()
+
+
+    def on_chunk(self, transfer_id: int, offset: int, data: memoryview) -> None:
+        if offset != self.download_offset: raise SystemExit(f'chunk at {offset}, expected {self.download_offset}')
+        self.download_hash.update(data)
+        self.download_offset += len(data)
+
+
+    def wait_for(self, command_name: str) -> dict:
+        with self.replied:
+            if not self.replied.wait_for(lambda: command_name in self.replies, TRANSFER_TIMEOUT):
+                raise SystemExit(f'no {command_name} from the server')
+            return self.replies.pop(command_name)
+
+
+    # Returns MB/s from sending the file-begin until the server has checked the whole file
+    def upload(self, contents: bytes, file_hash: str, chunk_size: int) -> float:
+        from static.commands import OutboundCommands
+        start = time.perf_counter()
+        self.socket.send_command(OutboundCommands.file_begin(CHAT_ID, 'upload', len(contents), file_hash))
+        response = self.wait_for('file-begin-response')
+        self.socket.open_stream(response['transfer_id'], response['window'])
+        with memoryview(contents) as view:
+            for offset in range(0, len(contents), chunk_size):
+                if not self.socket.send_binary(response['transfer_id'], offset, view[offset:offset + chunk_size]):
+                    raise SystemExit('the upload was not sent')
+        self.socket.close_stream(response['transfer_id'])
+        self.socket.send_command(OutboundCommands.file_end(response['transfer_id']))
+        if not self.wait_for('upload-complete')['complete']: raise SystemExit('the upload did not match its hash')
+        return len(contents) / (time.perf_counter() - start) / 1e6
+
+
+    # Returns MB/s from sending the request until the file-end arrives
+    def download(self, file_size: int, file_hash: str) -> float:
+        from static.commands import OutboundCommands
+        self.download_hash, self.download_offset = hashlib.sha256(), 0
+        start = time.perf_counter()
+        self.socket.send_command(OutboundCommands.file_download_request(CHAT_ID, file_hash))
+        self.wait_for('file-end')
+        elapsed = time.perf_counter() - start
+        if self.download_offset != file_size or self.download_hash.hexdigest() != file_hash:
+            raise SystemExit('the download did not match its hash')
+        return file_size / elapsed / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=16_777_216)
+    parser.add_argument('--chunk-size', type=int, default=65_536)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--serve', nargs=4, metavar=('BACKEND', 'PORT', 'BLOB_PATH', 'CHUNK_SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve: serve(args.serve[0], int(args.serve[1]), args.serve[2], int(args.serve[3])); return
+
+    sys.path.insert(0, SERVER_PATH)
+    from services.blob_store import BlobStore
+    sys.path.remove(SERVER_PATH)
+    for module in [name for name in sys.modules if name == 'static' or name.startswith(('networking', 'static.', 'services'))]:
+        del sys.modules[module]
+    sys.path.insert(0, CLIENT_PATH)
+
+    contents = os.urandom(args.size)
+    file_hash = hashlib.sha256(contents).hexdigest()
+    print(f'{args.size:,} byte file in {args.chunk_size:,} byte chunks, best of {args.runs}')
+    print(f'{"backend":<10}{"upload MB/s":>14}{"download MB/s":>16}')
+    with tempfile.TemporaryDirectory() as blob_path:
+        BlobStore(blob_path).put(file_hash, contents)
+        for backend in BACKENDS:
+            server, port = start_server(backend, blob_path, args.chunk_size)
+            try:
+                client = Client(port)
+                uploads = [client.upload(contents, file_hash, args.chunk_size) for _ in range(args.runs)]
+                downloads = [client.download(len(contents), file_hash) for _ in range(args.runs)]
+                client.socket.close()
+            finally:
+                server.kill()
+                server.wait()
+            print(f'{backend:<10}{max(uploads):>14,.1f}{max(downloads):>16,.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# Checks that FrameDecoder gives back the same frames however the stream is split or joined, and
+# measures how many MB/s it decodes over a socket pair compared with reading each header and body
+# with their own recv calls. The frames mix small commands with file chunks and a few frames
+# larger than the decoder's buffer. Run from the repository root:
+#     python benchmarks/framing.py [--megabytes 256]
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from typing import Any, Iterator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+from networking.framing import DEFAULT_BUFFER_SIZE, FrameDecoder, FrameSizeError
+
+HEADER_SIZE = 4
+FRAME_SIZES = (120, 600, 4_096, 65_536, 300_000) # Commands, batches, file chunks and one over the buffer size
+FRAME_WEIGHTS = (60, 20, 10, 9, 1)
+
+
+def create_frames(rng: random.Random, total_size: int, sizes: tuple = FRAME_SIZES, weights: tuple = FRAME_WEIGHTS) -> list[bytes]:
+    frames, size = [], 0
+    while size < total_size:
+        frame = rng.randbytes(rng.choices(sizes, weights)[0])
+        frames.append(frame)
+        size += len(frame)
+    return frames
+
+
+def pack(frames: list[bytes]) -> bytes:
+    return b''.join(len(frame).to_bytes(HEADER_SIZE, byteorder='big') + frame for frame in frames)
+
+
+# Every way a stream of frames is cut up by TCP: a byte at a time (over the frames that fit in the
+# first 200 KB), at random points, in the middle of headers, on frame boundaries and all at once
+def split_stream(rng: random.Random, frames: list[bytes]) -> Iterator[tuple[str, list[bytes], list[bytes]]]:
+    stream = pack(frames)
+    first_frames = frames[:next(index for index in range(len(frames)) if len(pack(frames[:index + 1])) > 200_000)]
+    yield 'single bytes', [bytes([byte]) for byte in pack(first_frames)], first_frames
+    cuts = sorted(rng.sample(range(1, len(stream)), 2_000))
+    yield 'random cuts', [stream[start:end] for start, end in zip([0] + cuts, cuts + [len(stream)])], frames
+    boundaries, offset = [], 0
+    for frame in frames:
+        boundaries += [offset + 2, offset + HEADER_SIZE]
+        offset += HEADER_SIZE + len(frame)
+    yield 'split headers', [stream[start:end] for start, end in zip([0] + boundaries, boundaries + [len(stream)])], frames
+    yield 'whole frames', [pack([frame]) for frame in frames], frames
+    yield 'one chunk', [stream], frames
+
+
+def decode(decoder: FrameDecoder, chunks: list[bytes]) -> list[bytes]:
+    frames = []
+    for chunk in chunks:
+        decoder.feed(chunk)
+        frames += [bytes(frame) for frame in decoder.frames()]
+    return frames
+
+
+def check_fragmentation(rng: random.Random) -> None:
+    for name, chunks, expected in split_stream(rng, create_frames(rng, 2_000_000)):
+        decoded = decode(FrameDecoder(HEADER_SIZE), chunks)
+        if decoded != expected: raise SystemExit(f'{name}: decoded {len(decoded)} frames, expected {len(expected)}')
+        print(f'{name:<16}{len(chunks):>8} chunks {len(decoded):>6} frames ok')
+
+    decoder = FrameDecoder(HEADER_SIZE, max_frame_size=1_024)
+    decoder.feed((1_025).to_bytes(HEADER_SIZE, byteorder='big'))
+    try: list(decoder.frames())
+    except FrameSizeError: print(f'{"oversized frame":<16} rejected')
+    else: raise SystemExit('oversized frame was not rejected')
+
+
+def recv_exactly(connection: socket.socket, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk: raise ConnectionError('connection closed')
+        data += chunk
+    return data
+
+
+def read_with_decoder(connection: socket.socket, frame_count: int) -> None:
+    decoder = FrameDecoder(HEADER_SIZE, buffer_size=DEFAULT_BUFFER_SIZE)
+    while frame_count:
+        if not decoder.recv_into(connection): raise ConnectionError('connection closed')
+        for _ in decoder.frames(): frame_count -= 1
+
+
+def read_with_recv(connection: socket.socket, frame_count: int) -> None:
+    for _ in range(frame_count):
+        recv_exactly(connection, int.from_bytes(recv_exactly(connection, HEADER_SIZE), byteorder='big'))
+
+
+def measure_throughput(stream: bytes, frame_count: int, reader: Any) -> float:
+    receiver, sender = socket.socketpair()
+    writer = threading.Thread(target=sender.sendall, args=(stream,))
+    start = time.perf_counter()
+    writer.start()
+    reader(receiver, frame_count)
+    elapsed = time.perf_counter() - start
+    writer.join()
+    receiver.close(); sender.close()
+    return len(stream) / elapsed / 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--megabytes', type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    check_fragmentation(rng)
+    for description, frames in (
+        ('mixed frames', create_frames(rng, args.megabytes * 1_000_000)),
+        ('commands only', create_frames(rng, args.megabytes * 100_000, FRAME_SIZES[:1], FRAME_WEIGHTS[:1]))
+    ):
+        stream = pack(frames)
+        print(f'\n{description}: {len(frames):,} frames, {len(stream) / 1_000_000:,.0f} MB over a socket pair')
+        for name, reader in (('FrameDecoder', read_with_decoder), ('recv per frame', read_with_recv)):
+            print(f'{name:<16}{measure_throughput(stream, len(frames), reader):>10,.0f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
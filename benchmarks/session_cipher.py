@@ -0,0 +1,64 @@
+# Frames per second and MB/s for a frame sealed by one side and opened by the other, with the
+# per-connection AES-GCM session key and with RSA for every frame as old clients still do. RSA
+# can only carry a few hundred bytes, larger frames are only measured with the session key.
+# Run from the repository root:
+#     python benchmarks/session_cipher.py [--sizes 64 256 446 4096 65536] [--seconds 1]
+import argparse
+import os
+import sys
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+from networking.crypto_utils import CryptoUtils, KeyType, Role, SessionCipher
+
+SERVER_PRIVATE_KEY_PATH = os.path.join(ROOT, 'server', 'networking', 'server_private_key.pem')
+SERVER_PUBLIC_KEY_PATH = os.path.join(ROOT, 'client', 'networking', 'server_public_key.pem')
+
+
+# Seals and opens the frame over and over for at least the given time, returns frames per second
+def measure(seal_and_open: Any, payload: bytes, seconds: float) -> float:
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if seal_and_open(payload) != payload: raise SystemExit('a frame did not survive the round trip')
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 256, 446, 4096, 65536])
+    parser.add_argument('--seconds', type=float, default=1)
+    args = parser.parse_args()
+
+    private_key = CryptoUtils.load_key_from_file(SERVER_PRIVATE_KEY_PATH, KeyType.PRIVATE)
+    public_key = CryptoUtils.load_key_from_file(SERVER_PUBLIC_KEY_PATH, KeyType.PUBLIC)
+    session_key = CryptoUtils.generate_session_key()
+    client_cipher, server_cipher = SessionCipher(session_key, Role.CLIENT), SessionCipher(session_key, Role.SERVER)
+
+    def rsa(payload: bytes) -> Any:
+        encrypted_payload = CryptoUtils.encrypt_data(payload, public_key)
+        return encrypted_payload and CryptoUtils.decrypt_data(encrypted_payload, private_key)
+
+    def session(payload: bytes) -> Any:
+        return server_cipher.decrypt(client_cipher.encrypt(payload))
+
+    print(f'{private_key.key_size} bit RSA key, {len(session_key) * 8} bit session key, {args.seconds}s per size')
+    print(f'{"bytes":>8}{"rsa frames/s":>15}{"rsa MB/s":>11}{"session frames/s":>19}{"session MB/s":>15}{"speedup":>10}')
+    for size in args.sizes:
+        payload = os.urandom(size)
+        session_rate = measure(session, payload, args.seconds)
+        if CryptoUtils.encrypt_data(payload, public_key) is None:
+            print(f'{size:>8}{"too large":>15}{"":>11}{session_rate:>19,.0f}{session_rate * size / 1e6:>15,.1f}')
+            continue
+        rsa_rate = measure(rsa, payload, args.seconds)
+        print(
+            f'{size:>8}{rsa_rate:>15,.0f}{rsa_rate * size / 1e6:>11,.2f}{session_rate:>19,.0f}'
+            f'{session_rate * size / 1e6:>15,.1f}{session_rate / rsa_rate:>9,.0f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# Compares the threaded and asyncio server backends: the memory each idle connection costs the
+# server, and how many commands a second it echoes back to a number of clients at once along
+# with the round trip time of a single command. Each server runs in its own process so its
+# memory can be read on its own. Run from the repository root:
+#     python benchmarks/socket_backends.py [--connections 500] [--clients 8] [--commands 2000]
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT, 'server')
+CLIENT_PATH = os.path.join(ROOT, 'client')
+BACKENDS = ('threaded', 'asyncio')
+HEADER_SIZE = 4
+
+
+# Echoes every command back, so only the socket backend is measured and not the handlers
+def serve(backend: str, port: int) -> None:
+    sys.path.insert(0, SERVER_PATH)
+    from networking.async_server_socket import AsyncServerSocket
+    from networking.server_socket import ServerSocket
+
+    server_socket_class = AsyncServerSocket if backend == 'asyncio' else ServerSocket
+    server_socket = server_socket_class(
+        server_private_key_path=os.path.join(SERVER_PATH, 'networking', 'server_private_key.pem'),
+        client_public_key_path=os.path.join(SERVER_PATH, 'networking', 'client_public_key.pem'),
+        port=port, format='utf-8', backlog=1024, header_size=HEADER_SIZE,
+        recv_callback=lambda user, command: user.send_command(command),
+        user_disconnect_callback=lambda user: None
+    )
+    print('ready', flush=True)
+    server_socket.serve_forever()
+
+
+def start_server(backend: str) -> tuple[subprocess.Popen, int]:
+    with socket.socket() as probe:
+        probe.bind(('', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([sys.executable, __file__, '--serve', backend, str(port)], stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()
+    return server, port
+
+
+# Resident memory in bytes, read from /proc so only Linux is supported
+def get_memory(pid: int) -> int:
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'): return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure_idle_connections(pid: int, port: int, connections: int) -> float:
+    time.sleep(0.5)
+    memory_before = get_memory(pid)
+    sockets = [socket.create_connection((socket.gethostname(), port)) for _ in range(connections)]
+    time.sleep(1 + connections / 500)
+    memory_after = get_memory(pid)
+    for connection in sockets: connection.close()
+    return (memory_after - memory_before) / connections
+
+
+def create_client(port: int, recv_callback: Any) -> Any:
+    from networking.client_socket import ClientSocket
+    client = ClientSocket(
+        port=port, format='utf-8', backlog=10, header_size=HEADER_SIZE,
+        client_private_key_path=os.path.join(CLIENT_PATH, 'networking', 'client_private_key.pem'),
+        server_public_key_path=os.path.join(CLIENT_PATH, 'networking', 'server_public_key.pem'),
+        recv_callback=recv_callback, reconnect=False
+    )
+    while not client.capabilities: time.sleep(0.01)
+    return client
+
+
+def send_commands(client: Any, commands: int) -> None:
+    for index in range(commands): client.send_command({'command_name': 'echo', 'arguments': {'index': index}})
+
+
+# Every client sends all of its commands at once and waits for them to come back
+def measure_throughput(port: int, clients: int, commands: int) -> float:
+    done = threading.Barrier(clients + 1)
+    sockets, received = [], [0] * clients
+
+    def on_command(index: int, command: dict) -> None:
+        received[index] += 1
+        if received[index] == commands: done.wait()
+
+    for index in range(clients): sockets.append(create_client(port, lambda command, index=index: on_command(index, command)))
+    start = time.perf_counter()
+    for client in sockets: threading.Thread(target=send_commands, args=(client, commands)).start()
+    done.wait()
+    elapsed = time.perf_counter() - start
+    for client in sockets: client.close()
+    return clients * commands / elapsed
+
+
+# One command in flight at a time, in milliseconds
+def measure_latency(port: int, commands: int) -> list[float]:
+    reply = threading.Event()
+    client = create_client(port, lambda command: reply.set())
+    round_trips = []
+    for index in range(commands):
+        reply.clear()
+        start = time.perf_counter()
+        client.send_command({'command_name': 'echo', 'arguments': {'index': index}})
+        reply.wait()
+        round_trips.append((time.perf_counter() - start) * 1000)
+    client.close()
+    return round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--commands', type=int, default=2000)
+    parser.add_argument('--serve', nargs=2, metavar=('BACKEND', 'PORT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve: serve(args.serve[0], int(args.serve[1])); return
+
+    sys.path.insert(0, CLIENT_PATH)
+    print(f'{"backend":<10}{"bytes/idle conn":>18}{"commands/s":>14}{"p50 ms":>10}{"p99 ms":>10}')
+    for backend in BACKENDS:
+        server, port = start_server(backend)
+        try:
+            memory = measure_idle_connections(server.pid, port, args.connections)
+            throughput = measure_throughput(port, args.clients, args.commands)
+            round_trips = sorted(measure_latency(port, min(args.commands, 1000)))
+        finally:
+            server.kill()
+            server.wait()
+        p50 = statistics.median(round_trips)
+        p99 = round_trips[int(len(round_trips) * 0.99) - 1]
+        print(f'{backend:<10}{memory:>18,.0f}{throughput:>14,.0f}{p50:>10.3f}{p99:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
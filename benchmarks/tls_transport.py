@@ -0,0 +1,189 @@
+# Compares the RSA hello and AES-GCM session frames with TLS: how long a client takes from connecting
+# to reading the hello reply, how long a TLS reconnect takes when it resumes its last session, and
+# how many MB/s of commands are echoed back. The TLS server uses a certificate for its existing key
+# signed by a CA generated for the run, which the client verifies. Run from the repository root:
+#     python benchmarks/tls_transport.py [--connects 50] [--commands 2000] [--command-size 16384]
+import argparse
+import datetime
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT, 'server')
+CLIENT_PATH = os.path.join(ROOT, 'client')
+SERVER_PRIVATE_KEY_PATH = os.path.join(SERVER_PATH, 'networking', 'server_private_key.pem')
+HEADER_SIZE = 4
+
+
+# A CA for this run only, and a certificate it signs for the server's RSA key and host name
+def create_certificates(directory: str) -> tuple[str, str]:
+    with open(SERVER_PRIVATE_KEY_PATH, 'rb') as key_file:
+        server_key = serialization.load_pem_private_key(key_file.read(), password=None)
+    ca_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'StudyChat benchmark CA')])
+    host_name = socket.gethostname()
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    def build(subject: x509.Name, public_key: Any) -> x509.CertificateBuilder:
+        return (
+            x509.CertificateBuilder().subject_name(subject).issuer_name(ca_name).public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1))
+        )
+
+    ca_certificate = build(ca_name, ca_key.public_key()).add_extension(x509.BasicConstraints(ca=True, path_length=0), critical=True).sign(ca_key, hashes.SHA256())
+    server_certificate = build(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host_name)]), server_key.public_key()) \
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(host_name)]), critical=False).sign(ca_key, hashes.SHA256())
+
+    paths = (os.path.join(directory, 'ca.pem'), os.path.join(directory, 'server_certificate.pem'))
+    for path, certificate in zip(paths, (ca_certificate, server_certificate)):
+        with open(path, 'wb') as certificate_file: certificate_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    return paths
+
+
+# Echoes every command back
+def serve(port: int, certificate_path: str) -> None:
+    sys.path.insert(0, SERVER_PATH)
+    from networking.server_socket import ServerSocket
+
+    server_socket = ServerSocket(
+        server_private_key_path=SERVER_PRIVATE_KEY_PATH,
+        client_public_key_path=os.path.join(SERVER_PATH, 'networking', 'client_public_key.pem'),
+        port=port, format='utf-8', backlog=128, header_size=HEADER_SIZE,
+        recv_callback=lambda user, command: user.send_command(command), user_disconnect_callback=lambda user: None,
+        tls=bool(certificate_path), tls_certificate_path=certificate_path
+    )
+    print('ready', flush=True)
+    server_socket.serve_forever()
+
+
+def start_server(certificate_path: str) -> tuple[subprocess.Popen, int]:
+    with socket.socket() as probe:
+        probe.bind(('', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([sys.executable, __file__, '--serve', str(port), certificate_path], stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()
+    return server, port
+
+
+def create_client(port: int, ca_path: str, recv_callback: Any = None, previous_client: Any = None) -> Any:
+    from networking.client_socket import ClientSocket
+    client = ClientSocket(
+        port=port, format='utf-8', backlog=10, header_size=HEADER_SIZE,
+        client_private_key_path=os.path.join(CLIENT_PATH, 'networking', 'client_private_key.pem'),
+        server_public_key_path=os.path.join(CLIENT_PATH, 'networking', 'server_public_key.pem'),
+        recv_callback=recv_callback or (lambda command: None), connect_to_server=False, reconnect=False,
+        tls=bool(ca_path), tls_ca_path=ca_path or None
+    )
+    # A session can only be resumed through the context it was made by
+    if previous_client: client.tls_context, client.tls_session = previous_client.tls_context, previous_client.tls_session
+    return client
+
+
+# Counts the handshakes the client socket logs as having resumed a session
+class ResumedHandshakes(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.getMessage().endswith('session reused: True'): self.count += 1
+
+
+
+# Milliseconds from connecting until the hello reply has been read, each client resuming the
+# last one's session when resume is set
+def measure_connects(port: int, ca_path: str, connects: int, resume: bool) -> tuple[list[float], int]:
+    connect_times, previous_client = [], None
+    resumed = ResumedHandshakes()
+    if resume:
+        previous_client = create_client(port, ca_path)
+        previous_client.initiate_socket()
+        while not previous_client.capabilities: time.sleep(0.0001)
+        previous_client.close()
+
+    logging.getLogger().addHandler(resumed)
+    logging.getLogger().setLevel(logging.DEBUG)
+    try:
+        for _ in range(connects):
+            client = create_client(port, ca_path, previous_client=previous_client)
+            start = time.perf_counter()
+            client.initiate_socket()
+            while not client.capabilities: time.sleep(0.0001)
+            connect_times.append((time.perf_counter() - start) * 1000)
+            client.close()
+            if resume: previous_client = client
+    finally:
+        logging.getLogger().removeHandler(resumed)
+        logging.getLogger().setLevel(logging.WARNING)
+    return sorted(connect_times), resumed.count
+
+
+def measure_throughput(port: int, ca_path: str, commands: int, command_size: int) -> float:
+    done, received = threading.Event(), [0]
+
+    def on_command(command: dict) -> None:
+        received[0] += 1
+        if received[0] == commands: done.set()
+
+    client = create_client(port, ca_path, on_command)
+    client.initiate_socket()
+    while not client.capabilities: time.sleep(0.0001)
+    padding = os.urandom(command_size // 2).hex()
+    start = time.perf_counter()
+    for index in range(commands): client.send_command({'command_name': 'echo', 'arguments': {'index': index, 'padding': padding}})
+    done.wait()
+    elapsed = time.perf_counter() - start
+    client.close()
+    return 2 * commands * command_size / elapsed / 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connects', type=int, default=50)
+    parser.add_argument('--commands', type=int, default=2000)
+    parser.add_argument('--command-size', type=int, default=16_384)
+    parser.add_argument('--serve', nargs=2, metavar=('PORT', 'CERTIFICATE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve: serve(int(args.serve[0]), args.serve[1]); return
+
+    # The client socket's debug messages are only passed on while connects are being counted
+    warnings = logging.StreamHandler()
+    warnings.setLevel(logging.WARNING)
+    logging.basicConfig(level=logging.WARNING, handlers=[warnings])
+
+    sys.path.insert(0, CLIENT_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        ca_path, certificate_path = create_certificates(directory)
+        print(f'{"transport":<18}{"connect p50 ms":>16}{"connect p99 ms":>16}{"resumed":>10}{"echo MB/s":>12}')
+        for name, (transport_ca_path, transport_certificate_path, resume) in {
+            'rsa + aes-gcm': ('', '', False), 'tls': (ca_path, certificate_path, False), 'tls resumed': (ca_path, certificate_path, True)
+        }.items():
+            server, port = start_server(transport_certificate_path)
+            try:
+                connect_times, resumed = measure_connects(port, transport_ca_path, args.connects, resume)
+                throughput = measure_throughput(port, transport_ca_path, args.commands, args.command_size) if not resume else None
+            finally:
+                server.kill()
+                server.wait()
+            p99 = connect_times[int(len(connect_times) * 0.99) - 1]
+            print(f'{name:<18}{statistics.median(connect_times):>16.2f}{p99:>16.2f}{f"{resumed}/{args.connects}" if resume else "-":>10}'
+                  f'{f"{throughput:,.0f}" if throughput else "-":>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# Commands a second a number of clients get echoed back from the server run as 1, 2, 4... worker
+# processes. The workers are laid out as start_workers lays them out, without the database and
+# mail behind the handlers: the broker forked into a process of its own, then every worker forked
+# with its own listening socket on the same port and its own link to the broker. Every client
+# runs in a process of its own too, so one client's GIL does not hold back the others. Run from
+# the repository root:
+#     python benchmarks/workers.py [--clients 8] [--commands 2000] [--workers 1 2 4 8] [--backend asyncio]
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT, 'server')
+CLIENT_PATH = os.path.join(ROOT, 'client')
+HEADER_SIZE = 4
+
+
+def serve(backend: str, port: int, workers: int) -> None:
+    sys.path.insert(0, SERVER_PATH)
+    from networking.async_server_socket import AsyncServerSocket
+    from networking.broker import Broker, BrokerClient
+    from networking.server_socket import ServerSocket
+
+    def serve_worker(worker_id: int, ready: int) -> None:
+        broker.close()
+        BrokerClient(broker.path, worker_id, lambda user_ids, command, file_hash: None).start()
+        server_socket_class = AsyncServerSocket if backend == 'asyncio' else ServerSocket
+        server_socket = server_socket_class(
+            server_private_key_path=os.path.join(SERVER_PATH, 'networking', 'server_private_key.pem'),
+            client_public_key_path=os.path.join(SERVER_PATH, 'networking', 'client_public_key.pem'),
+            port=port, format='utf-8', backlog=1024, header_size=HEADER_SIZE, reuse_port=True,
+            recv_callback=lambda user, command: user.send_command(command),
+            user_disconnect_callback=lambda user: None
+        )
+        os.write(ready, b'.')
+        server_socket.serve_forever()
+
+    # Forked before anything starts a thread, as the server does
+    broker = Broker()
+    pids = []
+    ready_reader, ready_writer = os.pipe()
+    for worker_id in [None, *range(workers)]:
+        pid = os.fork()
+        if pid: pids.append(pid); continue
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            if worker_id is None: broker.serve_forever()
+            else: serve_worker(worker_id, ready_writer)
+        finally:
+            os._exit(1)
+
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+    try:
+        for _ in range(workers): os.read(ready_reader, 1)
+        print('ready', flush=True)
+        while True: os.wait()
+    finally:
+        for pid in pids: os.kill(pid, signal.SIGTERM)
+        broker.remove()
+
+
+def start_server(backend: str, workers: int) -> tuple[subprocess.Popen, int]:
+    with socket.socket() as probe:
+        probe.bind(('', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, __file__, '--serve', backend, str(port), str(workers)], stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()
+    return server, port
+
+
+# Connects, says it is ready and waits to be told to go, then sends all of its commands at once
+# and says when every one of them has come back
+def run_client(port: int, commands: int) -> None:
+    sys.path.insert(0, CLIENT_PATH)
+    from networking.client_socket import ClientSocket
+    received = [0]
+    done = threading.Event()
+
+    def on_command(command: dict) -> None:
+        received[0] += 1
+        if received[0] == commands: done.set()
+
+    client = ClientSocket(
+        port=port, format='utf-8', backlog=10, header_size=HEADER_SIZE,
+        client_private_key_path=os.path.join(CLIENT_PATH, 'networking', 'client_private_key.pem'),
+        server_public_key_path=os.path.join(CLIENT_PATH, 'networking', 'server_public_key.pem'),
+        recv_callback=on_command, reconnect=False
+    )
+    while not client.capabilities: time.sleep(0.01)
+    print('ready', flush=True)
+    sys.stdin.readline()
+    for index in range(commands): client.send_command({'command_name': 'echo', 'arguments': {'index': index}})
+    done.wait()
+    print('done', flush=True)
+    client.close()
+
+
+def measure_throughput(port: int, clients: int, commands: int) -> float:
+    processes = [
+        subprocess.Popen([sys.executable, __file__, '--client', str(port), str(commands)],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(clients)
+    ]
+    try:
+        for process in processes: process.stdout.readline()
+        start = time.perf_counter()
+        for process in processes:
+            process.stdin.write('go\n')
+            process.stdin.flush()
+        for process in processes:
+            if process.stdout.readline().strip() != 'done': raise SystemExit('a client lost its connection')
+        return clients * commands / (time.perf_counter() - start)
+    finally:
+        for process in processes: process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--commands', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+')
+    parser.add_argument('--backend', choices=('threaded', 'asyncio'), default='asyncio')
+    parser.add_argument('--serve', nargs=3, metavar=('BACKEND', 'PORT', 'WORKERS'), help=argparse.SUPPRESS)
+    parser.add_argument('--client', nargs=2, type=int, metavar=('PORT', 'COMMANDS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve: serve(args.serve[0], int(args.serve[1]), int(args.serve[2])); return
+    if args.client: run_client(*args.client); return
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or [count for count in sorted({1, 2, 4, cores, args.clients}) if count <= args.clients]
+    print(f'{args.clients} clients, {args.commands} commands each, {args.backend} backend, {cores} cores')
+    print(f'{"workers":>8}{"commands/s":>14}{"per worker":>12}{"speedup":>10}')
+    baseline = None
+    for count in workers:
+        server, port = start_server(args.backend, count)
+        try:
+            throughput = measure_throughput(port, args.clients, args.commands)
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or throughput
+        print(f'{count:>8}{throughput:>14,.0f}{throughput / count:>12,.0f}{throughput / baseline:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
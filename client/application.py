@@ -1,377 +1,680 @@
-import base64
-import os
-from tkinter import filedialog
-from typing import Any, Union
-
-import customtkinter
-from networking import client_socket
-from scenes.access import Access
-from scenes.dashboard import Dashboard
-from scenes.profile_viewer import ProfileViewer
-from static.commands import InboundCommands, OutboundCommands
-from static.shared_types import (
-    MessageDetails,
-    QuestionDetails,
-    QuestionStatistics,
-    SocketCommand,
-)
-
-MAX_FILE_SIZE = 100_000 # Bytes
-BUFFER_CHUNK_SIZE = 200
-
-
-class Application(customtkinter.CTk) :
-    def __init__(self, socket_settings: dict[str, Any], app_settings: dict[str, Any]) -> None:
-        super().__init__()
-        self.running = True
-        self.incoming_questions = dict()
-        self.pending_questions = dict()
-        self.chat_links = dict()
-        self.chat_feeds = dict()
-        self.file_buffers = dict()
-        self.manual_user_widgets = dict()
-        self.selected_manual_ids = list()
-
-        # Create the server socket
-        self.client_socket = client_socket.ClientSocket(
-            port=socket_settings['port'], format=socket_settings['format'], backlog=socket_settings['backlog'], 
-            header_size=socket_settings['header_size'], client_private_key_path=socket_settings['client_private_key'],
-            server_public_key_path=socket_settings['server_public_key'], recv_callback=self.recv_command, 
-            connect_to_server=socket_settings['connect_to_server']
-        )
-
-        self.title(app_settings['window_title'])
-        self.geometry(f"{app_settings['window_width']}x{app_settings['window_height']}")
-        self.minsize(width=app_settings['window_min_width'], height=app_settings['window_min_height'])
-        self.resizable(app_settings['window_resizable'], app_settings['window_resizable'])
-
-        self.profile_viewer = ProfileViewer(master=self)
-        self.container = customtkinter.CTkFrame(self, fg_color=app_settings['light_grey'])  
-        self.container.pack(side=customtkinter.LEFT, fill=customtkinter.BOTH, expand=True)
-
-        # For the sub root ui elements
-        self.dashboard = Dashboard(master=self.container, options=app_settings['options'], hide=True)
-        self.access = Access(master=self.container, options=app_settings['options'], hide=False)
-
-        self.frames = {"dashboard": self.dashboard, "access": self.access}
-        self.protocol('WM_DELETE_WINDOW', func=self.exit)
-        if app_settings['testing_mode']: self.login_testing_account()
-
-        self.command_map = {
-            InboundCommands.RegisterResponse.value: self.handle_register_response,
-            InboundCommands.VerifyResponse.value: self.handle_verify_response,
-            InboundCommands.LoadUserDetails.value: self.dashboard.load_user_details,
-            InboundCommands.LoginResponse.value: self.handle_login_response,
-            InboundCommands.AskQuestionResponse.value: self.handle_ask_question_response,
-            InboundCommands.AddPendingQuestion.value: self.handle_add_pending_question,
-            InboundCommands.AddIncomingQuestion.value: self.handle_add_incoming_question,
-            InboundCommands.CreateProfileViewer.value: self.profile_viewer.show_profile,
-            InboundCommands.CreateNewChat.value: self.handle_create_chat,
-            InboundCommands.CreateChatReply.value: self.handle_create_chat_reply,
-            InboundCommands.LoadFile.value: self.receive_file,
-            InboundCommands.CreateManualUser.value: self.handle_add_manual_recipients,
-            InboundCommands.UpdateQuestionStatistics.value: self.update_question_statistics,
-            InboundCommands.DeleteIncomingQuestion.value: self.delete_incoming_question,
-            InboundCommands.DeleteQuestionChat.value: self.delete_question_chat,
-            InboundCommands.DeletePendingQuestion.value: self.delete_pending_question,
-            InboundCommands.DisplayRatingError.value: self.display_rating_error
-        }
-
-        self.bind_buttons()
-        self.mainloop()
-
-
-    def login_testing_account(self) -> None:
-        command = OutboundCommands.login(email='testing', password='1234')
-        self.client_socket.send_command(command)
-
-
-    def login_user(self) -> None:
-        self.access.login_page.toggle_freeze_page(freeze=True)
-        email, password = self.access.get_login_details()
-        command = OutboundCommands.login(email, password)
-        self.client_socket.send_command(command)
-
-
-    def register_user(self) -> None:
-        self.access.register_page.toggle_freeze_page(freeze=True)
-        register_details = self.access.get_register_details()
-        command = OutboundCommands.register(user_details=register_details)
-        self.client_socket.send_command(command)
-        
-
-    def verify_user(self) -> None:
-        self.access.verification_page.toggle_freeze_page(freeze=True)
-        code_entered = self.access.verification_page.get_verification_code()
-        command = OutboundCommands.verify(code=code_entered)
-        self.client_socket.send_command(command)
-
-
-    def handle_verify_response(self, accepted: bool, reason: str) -> None:
-        if not accepted: self.access.verification_page.display_verification_error(reason)
-        else: self.switch_frame('dashboard')
-        self.access.verification_page.toggle_freeze_page(freeze=False)
-
-
-    def handle_register_response(self, accepted: bool, reason: str) -> None:
-        if not accepted: self.access.register_page.display_register_error(reason)
-        else: self.access.switch_page('verification')
-        self.access.register_page.toggle_freeze_page(freeze=False)
-
-    
-    def handle_login_response(self, accepted: bool, reason: str) -> None:
-        if not accepted: self.access.login_page.display_login_error(reason)
-        else: self.switch_frame('dashboard')
-        self.access.login_page.toggle_freeze_page(freeze=False)
-
-
-    def handle_ask_question_response(self, accepted: bool, reason: str) -> None:
-        if not accepted: self.dashboard.ask_question_page.display_error(reason)
-        else: self.dashboard.switch_page('pending-questions-page'); self.dashboard.clear_question_details()
-        self.dashboard.ask_question_page.toggle_freeze_page(freeze=False)
-
-    
-    def request_question_deletion(self, question_id: int) -> None:
-        command = OutboundCommands.delete_pending_question_request(question_id)
-        self.client_socket.send_command(command)
-
-    
-    def delete_pending_question(self, question_id: int) -> None:
-        if not self.pending_questions.get(question_id): return
-        pending_question = self.pending_questions[question_id]
-        pending_question.pack_forget()
-        del self.pending_questions[question_id]
-
-    
-    def handle_add_pending_question(self, question_id: int, question_details: QuestionDetails, question_statistics: QuestionStatistics) -> None:
-        pending_question = self.dashboard.pending_questions_page.create_pending_question(question_details, question_statistics)
-        pending_question.toggle_description_button.configure(command=pending_question.toggle_description)
-        pending_question.delete_question_button.configure(command=lambda: self.request_question_deletion(question_id))
-        pending_question.toggle_statistics_button.configure(command=pending_question.toggle_statistics)
-        self.pending_questions[question_id] = pending_question
-
-
-    def handle_add_incoming_question(self, question_id: int, publisher_id: int, first_name: str, last_name: str, question_details: QuestionDetails) -> None:
-        incoming_question = self.dashboard.incoming_questions_page.create_incoming_question(publisher_id, first_name, last_name, question_details)
-        self.incoming_questions[question_id] = incoming_question
-        view_profile_command = OutboundCommands.view_user_profile(publisher_id)
-        delete_question_command = OutboundCommands.delete_incoming_question_request(question_id)
-        create_chat_command = OutboundCommands.create_new_chat_request(question_id, publisher_id)
-        incoming_question.view_profile_button.configure(command=lambda: self.client_socket.send_command(view_profile_command))
-        incoming_question.delete_button.configure(command=lambda: self.client_socket.send_command(delete_question_command))
-        incoming_question.awnser_question_button.configure(command=lambda: self.client_socket.send_command(create_chat_command))
-        incoming_question.toggle_description_button.configure(command=incoming_question.toggle_description)
-
-    
-    def display_rating_error(self, chat_id: int, reason: str) -> None:
-        if not self.chat_links.get(chat_id): return 
-        chat_link = self.chat_links[chat_id]
-        chat_link.display_rating_error(reason)
-
-    
-    def delete_incoming_question(self, question_id: int) -> None:
-        if not self.incoming_questions.get(question_id): return 
-        incoming_question = self.incoming_questions[question_id]
-        incoming_question.pack_forget()
-        del self.incoming_questions[question_id]
-
-
-    def handle_add_manual_recipients(self, user_id: int, first_name: str, last_name: str, status: str) -> None:
-        self.dashboard.ask_question_page.toggle_empty_label(True)
-        user_widget = self.dashboard.ask_question_page.add_user_to_results(first_name, last_name, status)
-        self.manual_user_widgets[user_id] = {'widget': user_widget, 'selected': False}
-        user_widget.add_button.configure(command=lambda: self.toggle_manual_user_selection(user_id))
-
-
-    def toggle_manual_user_selection(self, user_id: int) -> None:
-        widget = self.manual_user_widgets[user_id]
-        if widget['selected']:
-            widget['widget'].toggle_user_widget(False)
-            widget['selected'] = False
-            self.selected_manual_ids.remove(user_id)
-        else:
-            widget['widget'].toggle_user_widget(True)
-            widget['selected'] = True
-            self.selected_manual_ids.append(user_id)
-
-    
-    def search_for_user(self) -> None:
-        input = self.dashboard.ask_question_page.get_user_search_entry()
-        self.dashboard.ask_question_page.clear_user_search_entry()
-        for widget in self.manual_user_widgets.values(): 
-            widget['widget'].destroy()
-
-        self.manual_user_widgets.clear()
-        self.dashboard.ask_question_page.toggle_empty_label(False)
-        command = OutboundCommands.search_for_user(input)
-        self.client_socket.send_command(command)
-
-
-    def handle_create_chat_reply(self, chat_id: int, message_details: MessageDetails) -> None:
-        if not self.chat_feeds.get(chat_id): return 
-        self.chat_feeds[chat_id].create_message(message_details)
-
-
-    def send_message(self, chat_id: int) -> None:
-        if not self.chat_feeds.get(chat_id): return
-        message_body = self.chat_feeds[chat_id].get_message()
-        command = OutboundCommands.send_message_request(chat_id, message_body)
-        self.client_socket.send_command(command)
-
-    
-    def receive_file(self, chat_id: int, file_name: str, contents: str, file_size: int, end: bool) -> None:
-        if not self.chat_feeds.get(chat_id): return
-        if end: 
-            with open(file_name, 'wb') as file:
-                file.write(self.file_buffers[file_name])
-            file_widget = self.chat_feeds[chat_id].create_file(file_name, file_size)
-            file_widget.open_button.configure(command=lambda: os.system(f'start {file_name}'))
-            del self.file_buffers[file_name]
-        else:
-            base64_decoded = base64.b64decode(contents)
-            if not self.file_buffers.get(file_name):
-                self.file_buffers[file_name] = b""
-            self.file_buffers[file_name] += base64_decoded
-
-    
-    def send_file(self, chat_id: int) -> None:
-        file_path = filedialog.askopenfilename(initialdir="/Documents", title="Browse")
-        file_size, file_name = os.path.getsize(file_path), os.path.basename(file_path)
-        if file_size > MAX_FILE_SIZE or ' ' in file_name: return
-
-        with open(file_path, 'rb') as file:
-              while True:
-                data = file.read(BUFFER_CHUNK_SIZE)
-                base64_encoded = base64.b64encode(data)
-                base64_string = base64_encoded.decode('utf-8')
-
-                if not data:
-                    self.client_socket.send_command(
-                        OutboundCommands.send_file_request(
-                            chat_id=chat_id, contents='', end=True,
-                            file_name=file_name, file_size=file_size
-                        )
-                    )
-                    break       
-                self.client_socket.send_command(
-                    OutboundCommands.send_file_request(
-                        chat_id=chat_id, contents=base64_string,
-                        file_name=file_name, file_size=file_size,
-                        end=False
-                    )
-                )
-    
-    
-    def end_chat_as_recipient(self, chat_id: int) -> None:
-        command = OutboundCommands.end_chat_request_as_recipient(chat_id)
-        self.client_socket.send_command(command)
-
-
-    def end_chat_as_publisher(self, chat_id: int, rating: str) -> None:
-        command = OutboundCommands.end_chat_request_as_publisher(chat_id, rating)
-        self.client_socket.send_command(command)
-
-    
-    def handle_create_chat(self, chat_id: int, user_id: int, first_name: str, last_name: str, question_details: QuestionDetails, question_publisher: bool) -> None:
-        view_profile_command = OutboundCommands.view_user_profile(user_id)
-        chat_feed = self.dashboard.chat_page.create_chat_feed(first_name, last_name, question_details)
-        chat_link = self.dashboard.chat_page.chat_link_page.create_chat_link(first_name, last_name)
-        self.chat_feeds[chat_id], self.chat_links[chat_id] = chat_feed, chat_link
-
-        chat_feed.back_button.configure(command=lambda: self.close_question_chat(chat_id))
-        chat_link.view_chat_button.configure(command=lambda: self.open_question_chat(chat_id))
-        chat_link.view_profile_button.configure(command=lambda: self.client_socket.send_command(view_profile_command))
-        chat_feed.send_message_button.configure(command=lambda: self.send_message(chat_id))
-        chat_feed.send_file_button.configure(command=lambda: self.send_file(chat_id))
-        chat_feed.message_entry.bind('<Return>', command=lambda _: self.send_message(chat_id))
-
-        if not question_publisher: 
-            chat_link.end_chat_button.configure(
-                command=lambda: self.end_chat_as_recipient(chat_id)
-            ); return
-        
-        else:
-            chat_link.accent.configure(fg_color='#245480')
-            chat_link.end_chat_button.configure(text='End chat and review user')
-            chat_link.end_chat_button.configure(command=chat_link.toggle_rating_input)
-            chat_link.rate_user_button.configure(
-                command=lambda: self.end_chat_as_publisher(
-                    chat_id, chat_link.get_question_feedback()
-                )
-            )
-
-    
-    def delete_question_chat(self, chat_id: int) -> None:
-        if not self.chat_links.get(chat_id) or not self.chat_feeds.get(chat_id): 
-            return 
-        self.chat_links[chat_id].pack_forget()
-        self.chat_feeds[chat_id].pack_forget()
-        del self.chat_links[chat_id]
-        del self.chat_feeds[chat_id]
-
-
-    def ask_question(self) -> None:
-        self.dashboard.ask_question_page.toggle_freeze_page(freeze=True)
-        question_details = self.dashboard.get_question_details()
-        manual_searching = self.dashboard.ask_question_page.manual_searching
-        command: Union[SocketCommand, None] = None
-
-        if manual_searching: command = OutboundCommands.ask_question(question_details, self.selected_manual_ids)
-        else: command =  OutboundCommands.ask_question(question_details)
-        self.client_socket.send_command(command)
-
-    
-    def update_question_statistics(self, question_id: int, question_statistics: QuestionStatistics) -> None:
-        pending_question = self.pending_questions.get(question_id)
-        if not pending_question: return
-        pending_question.update_statistics(question_statistics)
-
-    
-    def sign_out_user(self) -> None:
-        command = OutboundCommands.sign_out()
-        self.client_socket.send_command(command)
-        self.switch_frame('access')
-
-
-    # Other application methods
-    def recv_command(self, command: SocketCommand) -> None:
-        command_name, arguments = command.get('command_name'), command.get('arguments')
-        if not InboundCommands.has_command(command_name): return
-        try: self.command_map[command_name](**arguments)
-        except (KeyError, TypeError) as err: print(f'Could not map command: {err}')
-
-    
-    def bind_buttons(self) -> None:
-        self.access.register_page.register_button.configure(command=lambda: self.register_user())
-        self.access.verification_page.verify_button.configure(command=lambda: self.verify_user())
-        self.access.login_page.login_button.configure(command=lambda: self.login_user())
-        self.dashboard.ask_question_page.ask_question_button.configure(command=lambda: self.ask_question())
-        self.dashboard.ask_question_page.manual_user_search.bind('<Return>', command=lambda _: self.search_for_user())
-
-
-    def open_question_chat(self, question_id: int) -> None:
-        if not question_id in self.chat_feeds.keys(): return
-        self.dashboard.chat_page.chat_link_page.toggle_page(hide=True)
-        self.chat_feeds[question_id].toggle_page(False)
-
-    
-    def close_question_chat(self, question_id: int) -> None:
-        if not question_id in self.chat_feeds.keys(): return
-        self.chat_feeds[question_id].toggle_page(True)
-        self.dashboard.chat_page.chat_link_page.toggle_page(hide=False)
-
-    
-    def switch_frame(self, _to: str) -> None:
-        if not self.frames[_to].displaying: 
-            for frame in self.frames.values():
-                if frame.displaying: frame.toggle_frame(True)
-            self.frames[_to].toggle_frame(False)
-
-
-    def exit(self) -> None:
-        self.running = False
-        if self.client_socket.connected:
-            self.client_socket.close()
-        self.destroy()
-
+import base64
+import math
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from tkinter import filedialog
+from typing import Any, Union
+
+import customtkinter
+from networking import client_socket
+from networking.binary_frames import DEFAULT_FILE_CHUNK_SIZE, hash_file
+from scenes.access import Access
+from scenes.dashboard import Dashboard
+from scenes.profile_viewer import ProfileViewer
+from static.commands import InboundCommands, OutboundCommands
+from static.shared_types import (
+    FileDetails,
+    MessageDetails,
+    QuestionDetails,
+    QuestionStatistics,
+    SocketCommand,
+)
+
+MAX_FILE_SIZE = 16_777_216 # Bytes
+LEGACY_MAX_FILE_SIZE = 100_000 # Bytes, for servers that only take base64 chunks
+BUFFER_CHUNK_SIZE = 200
+REQUEST_FAILED_REASON = 'The server did not answer, please try again'
+ACK_DELAY = 1 # Seconds replies are collected for before they are acknowledged together
+
+
+class Application(customtkinter.CTk) :
+    def __init__(self, socket_settings: dict[str, Any], app_settings: dict[str, Any]) -> None:
+        super().__init__()
+        self.running = True
+        self.incoming_questions = dict()
+        self.pending_questions = dict()
+        self.chat_links = dict()
+        self.chat_feeds = dict()
+        self.file_buffers = dict()
+        self.uploads: dict[tuple, dict[str, Any]] = dict()
+        self.downloads: dict[int, dict[str, Any]] = dict()
+
+        # Files in chats are only downloaded when they are opened, into the download path
+        self.chat_files: dict[tuple, dict[str, Any]] = dict()
+        self.local_files: dict[str, str] = dict()
+        self.download_path = os.path.expanduser(app_settings['download_path'])
+        os.makedirs(self.download_path, exist_ok=True)
+
+        self.manual_user_widgets = dict()
+        self.selected_manual_ids = list()
+
+        # Lets the session be resumed after a dropped connection, the cursors are the newest
+        # reply id and file id seen in each chat so only what was missed is sent back
+        self.resume_token: Union[str, None] = None
+        self.chat_cursors: dict[int, int] = dict()
+        self.file_cursors: dict[int, int] = dict()
+
+        # Messages the server has not acknowledged yet, sent again with the same id after a
+        # reconnect. Replies from the server are acknowledged in one command every ack delay
+        self.outbox: dict[str, dict[str, Any]] = dict()
+        self.outbox_timer: Union[threading.Timer, None] = None
+        self.reply_acks: dict[int, int] = dict()
+        self.reply_ack_timer: Union[threading.Timer, None] = None
+        self.reply_ack_lock = threading.Lock()
+
+        # Create the server socket
+        self.client_socket = client_socket.ClientSocket(
+            port=socket_settings['port'], format=socket_settings['format'], backlog=socket_settings['backlog'], 
+            header_size=socket_settings['header_size'], client_private_key_path=socket_settings['client_private_key'],
+            server_public_key_path=socket_settings['server_public_key'], recv_callback=self.recv_command, 
+            connect_to_server=socket_settings['connect_to_server'], max_frame_size=socket_settings['max_frame_size'],
+            compression=socket_settings['compression'], compression_threshold=socket_settings['compression_threshold'],
+            binary_codec=socket_settings['binary_codec'], heartbeat_interval=socket_settings['heartbeat_interval'],
+            server_timeout=socket_settings['server_timeout'], reconnect=socket_settings['reconnect'],
+            reconnect_callback=self.handle_reconnect, max_reconnect_delay=socket_settings['max_reconnect_delay'],
+            binary_callback=self.receive_file_chunk, tls=socket_settings['tls'],
+            tls_ca_path=socket_settings['tls_ca_path'] or None
+        )
+
+        self.title(app_settings['window_title'])
+        self.geometry(f"{app_settings['window_width']}x{app_settings['window_height']}")
+        self.minsize(width=app_settings['window_min_width'], height=app_settings['window_min_height'])
+        self.resizable(app_settings['window_resizable'], app_settings['window_resizable'])
+
+        self.profile_viewer = ProfileViewer(master=self)
+        self.container = customtkinter.CTkFrame(self, fg_color=app_settings['light_grey'])  
+        self.container.pack(side=customtkinter.LEFT, fill=customtkinter.BOTH, expand=True)
+
+        # For the sub root ui elements
+        self.dashboard = Dashboard(master=self.container, options=app_settings['options'], hide=True)
+        self.access = Access(master=self.container, options=app_settings['options'], hide=False)
+
+        self.frames = {"dashboard": self.dashboard, "access": self.access}
+        self.protocol('WM_DELETE_WINDOW', func=self.exit)
+        if app_settings['testing_mode']: self.login_testing_account()
+
+        self.command_map = {
+            InboundCommands.RegisterResponse.value: self.handle_register_response,
+            InboundCommands.VerifyResponse.value: self.handle_verify_response,
+            InboundCommands.LoadUserDetails.value: self.dashboard.load_user_details,
+            InboundCommands.LoginResponse.value: self.handle_login_response,
+            InboundCommands.AskQuestionResponse.value: self.handle_ask_question_response,
+            InboundCommands.AddPendingQuestion.value: self.handle_add_pending_question,
+            InboundCommands.AddIncomingQuestion.value: self.handle_add_incoming_question,
+            InboundCommands.CreateProfileViewer.value: self.profile_viewer.show_profile,
+            InboundCommands.CreateNewChat.value: self.handle_create_chat,
+            InboundCommands.CreateChatReply.value: self.handle_create_chat_reply,
+            InboundCommands.LoadFile.value: self.receive_file,
+            InboundCommands.CreateManualUser.value: self.handle_add_manual_recipients,
+            InboundCommands.UpdateQuestionStatistics.value: self.update_question_statistics,
+            InboundCommands.DeleteIncomingQuestion.value: self.delete_incoming_question,
+            InboundCommands.DeleteQuestionChat.value: self.delete_question_chat,
+            InboundCommands.DeletePendingQuestion.value: self.delete_pending_question,
+            InboundCommands.DisplayRatingError.value: self.display_rating_error,
+            InboundCommands.Batch.value: self.handle_batch,
+            InboundCommands.RateLimited.value: self.handle_rate_limited,
+            InboundCommands.SessionToken.value: self.handle_session_token,
+            InboundCommands.ResumeResponse.value: self.handle_resume_response,
+            InboundCommands.FileBegin.value: self.handle_file_begin,
+            InboundCommands.FileBeginResponse.value: self.handle_file_begin_response,
+            InboundCommands.FileEnd.value: self.handle_file_end,
+            InboundCommands.CreateChatFile.value: self.handle_create_chat_file,
+            InboundCommands.MessageAck.value: self.handle_message_ack
+        }
+
+        self.bind_buttons()
+        self.mainloop()
+
+
+    def login_testing_account(self) -> None:
+        command = OutboundCommands.login(email='testing', password='1234')
+        self.client_socket.send_command(command)
+
+
+    def login_user(self) -> None:
+        self.access.login_page.toggle_freeze_page(freeze=True)
+        email, password = self.access.get_login_details()
+        command = OutboundCommands.login(email, password)
+        self.send_request(command, self.handle_login_response)
+
+
+    def register_user(self) -> None:
+        self.access.register_page.toggle_freeze_page(freeze=True)
+        register_details = self.access.get_register_details()
+        command = OutboundCommands.register(user_details=register_details)
+        self.send_request(command, self.handle_register_response)
+        
+
+    def verify_user(self) -> None:
+        self.access.verification_page.toggle_freeze_page(freeze=True)
+        code_entered = self.access.verification_page.get_verification_code()
+        command = OutboundCommands.verify(code=code_entered)
+        self.send_request(command, self.handle_verify_response)
+
+
+    def handle_verify_response(self, accepted: bool, reason: str) -> None:
+        if not accepted: self.access.verification_page.display_verification_error(reason)
+        else: self.switch_frame('dashboard')
+        self.access.verification_page.toggle_freeze_page(freeze=False)
+
+
+    def handle_register_response(self, accepted: bool, reason: str) -> None:
+        if not accepted: self.access.register_page.display_register_error(reason)
+        else: self.access.switch_page('verification')
+        self.access.register_page.toggle_freeze_page(freeze=False)
+
+    
+    def handle_login_response(self, accepted: bool, reason: str) -> None:
+        if not accepted: self.access.login_page.display_login_error(reason)
+        else: self.switch_frame('dashboard')
+        self.access.login_page.toggle_freeze_page(freeze=False)
+
+
+    # The server refused a command because it was sent too often, a page waiting on its
+    # response is given the reason instead so it unfreezes
+    def handle_rate_limited(self, command: str, retry_after: float) -> None:
+        reason = f'Too many attempts, try again in {math.ceil(retry_after)} seconds'
+        response_handlers = {
+            'login': self.handle_login_response,
+            'register': self.handle_register_response,
+            'verify': self.handle_verify_response,
+            'ask-question': self.handle_ask_question_response
+        }
+        if command in response_handlers: response_handlers[command](accepted=False, reason=reason)
+        if command == 'send-message-request': self.schedule_outbox(retry_after)
+
+
+    def handle_session_token(self, token: str) -> None:
+        self.resume_token = token
+
+
+    def handle_reconnect(self) -> None:
+        if not self.resume_token: return
+        cursors = {
+            'chats': self.chat_cursors,
+            'chat_files': self.file_cursors,
+            'pending_question_id': max(self.pending_questions, default=0),
+            'incoming_question_id': max(self.incoming_questions, default=0),
+            'pending_question_ids': list(self.pending_questions),
+            'incoming_question_ids': list(self.incoming_questions)
+        }
+        self.client_socket.send_command(OutboundCommands.resume(self.resume_token, cursors))
+
+
+    # Uploads cut off by the dropped connection carry on from wherever the server got to
+    def handle_resume_response(self, accepted: bool, reason: str) -> None:
+        if accepted:
+            self.resend_outbox()
+            for upload in list(self.uploads.values()): self.begin_upload(upload)
+            for transfer_id in list(self.downloads): self.resume_download(transfer_id)
+            return
+        for download in self.downloads.values(): download['part_file'].close()
+        self.downloads.clear()
+        self.uploads.clear()
+        self.outbox.clear()
+        self.resume_token = None
+        self.switch_frame('access')
+        self.access.login_page.display_login_error(reason)
+
+
+    def handle_ask_question_response(self, accepted: bool, reason: str) -> None:
+        if not accepted: self.dashboard.ask_question_page.display_error(reason)
+        else: self.dashboard.switch_page('pending-questions-page'); self.dashboard.clear_question_details()
+        self.dashboard.ask_question_page.toggle_freeze_page(freeze=False)
+
+    
+    def request_question_deletion(self, question_id: int) -> None:
+        command = OutboundCommands.delete_pending_question_request(question_id)
+        self.client_socket.send_command(command)
+
+    
+    def delete_pending_question(self, question_id: int) -> None:
+        if not self.pending_questions.get(question_id): return
+        pending_question = self.pending_questions[question_id]
+        pending_question.pack_forget()
+        del self.pending_questions[question_id]
+
+    
+    def handle_add_pending_question(self, question_id: int, question_details: QuestionDetails, question_statistics: QuestionStatistics) -> None:
+        if question_id in self.pending_questions: self.update_question_statistics(question_id, question_statistics); return
+        pending_question = self.dashboard.pending_questions_page.create_pending_question(question_details, question_statistics)
+        pending_question.toggle_description_button.configure(command=pending_question.toggle_description)
+        pending_question.delete_question_button.configure(command=lambda: self.request_question_deletion(question_id))
+        pending_question.toggle_statistics_button.configure(command=pending_question.toggle_statistics)
+        self.pending_questions[question_id] = pending_question
+
+
+    def handle_add_incoming_question(self, question_id: int, publisher_id: int, first_name: str, last_name: str, question_details: QuestionDetails) -> None:
+        if question_id in self.incoming_questions: return
+        incoming_question = self.dashboard.incoming_questions_page.create_incoming_question(publisher_id, first_name, last_name, question_details)
+        self.incoming_questions[question_id] = incoming_question
+        view_profile_command = OutboundCommands.view_user_profile(publisher_id)
+        delete_question_command = OutboundCommands.delete_incoming_question_request(question_id)
+        create_chat_command = OutboundCommands.create_new_chat_request(question_id, publisher_id)
+        incoming_question.view_profile_button.configure(command=lambda: self.send_request(view_profile_command))
+        incoming_question.delete_button.configure(command=lambda: self.client_socket.send_command(delete_question_command))
+        incoming_question.awnser_question_button.configure(command=lambda: self.client_socket.send_command(create_chat_command))
+        incoming_question.toggle_description_button.configure(command=incoming_question.toggle_description)
+
+    
+    def display_rating_error(self, chat_id: int, reason: str) -> None:
+        if not self.chat_links.get(chat_id): return 
+        chat_link = self.chat_links[chat_id]
+        chat_link.display_rating_error(reason)
+
+    
+    def delete_incoming_question(self, question_id: int) -> None:
+        if not self.incoming_questions.get(question_id): return 
+        incoming_question = self.incoming_questions[question_id]
+        incoming_question.pack_forget()
+        del self.incoming_questions[question_id]
+
+
+    def handle_add_manual_recipients(self, user_id: int, first_name: str, last_name: str, status: str) -> None:
+        self.dashboard.ask_question_page.toggle_empty_label(True)
+        user_widget = self.dashboard.ask_question_page.add_user_to_results(first_name, last_name, status)
+        self.manual_user_widgets[user_id] = {'widget': user_widget, 'selected': False}
+        user_widget.add_button.configure(command=lambda: self.toggle_manual_user_selection(user_id))
+
+
+    def toggle_manual_user_selection(self, user_id: int) -> None:
+        widget = self.manual_user_widgets[user_id]
+        if widget['selected']:
+            widget['widget'].toggle_user_widget(False)
+            widget['selected'] = False
+            self.selected_manual_ids.remove(user_id)
+        else:
+            widget['widget'].toggle_user_widget(True)
+            widget['selected'] = True
+            self.selected_manual_ids.append(user_id)
+
+    
+    def search_for_user(self) -> None:
+        input = self.dashboard.ask_question_page.get_user_search_entry()
+        self.dashboard.ask_question_page.clear_user_search_entry()
+        for widget in self.manual_user_widgets.values(): 
+            widget['widget'].destroy()
+
+        self.manual_user_widgets.clear()
+        self.dashboard.ask_question_page.toggle_empty_label(False)
+        command = OutboundCommands.search_for_user(input)
+        self.send_request(command)
+
+
+    def handle_create_chat_reply(self, chat_id: int, message_details: MessageDetails) -> None:
+        if not self.chat_feeds.get(chat_id): return 
+        reply_id = message_details.get('reply_id', 0)
+        if reply_id and reply_id <= self.chat_cursors.get(chat_id, 0): return
+        self.chat_cursors[chat_id] = max(reply_id, self.chat_cursors.get(chat_id, 0))
+        self.chat_feeds[chat_id].create_message(message_details)
+        if reply_id: self.acknowledge_reply(chat_id, reply_id)
+
+
+    def acknowledge_reply(self, chat_id: int, reply_id: int) -> None:
+        capabilities = self.client_socket.capabilities
+        if not capabilities or not capabilities.message_acks: return
+        with self.reply_ack_lock:
+            self.reply_acks[chat_id] = max(reply_id, self.reply_acks.get(chat_id, 0))
+            if self.reply_ack_timer: return
+            self.reply_ack_timer = threading.Timer(ACK_DELAY, self.send_reply_acks)
+            self.reply_ack_timer.daemon = True
+            self.reply_ack_timer.start()
+
+
+    # Acks lost with the connection do no harm, the server sends those replies again on resume
+    def send_reply_acks(self) -> None:
+        with self.reply_ack_lock:
+            cursors, self.reply_acks = self.reply_acks, dict()
+            self.reply_ack_timer = None
+        if cursors: self.client_socket.send_command(OutboundCommands.ack_replies(cursors))
+
+
+    def send_message(self, chat_id: int) -> None:
+        if not self.chat_feeds.get(chat_id): return
+        message_body = self.chat_feeds[chat_id].get_message()
+        capabilities = self.client_socket.capabilities
+        if not capabilities or not capabilities.message_acks:
+            self.client_socket.send_command(OutboundCommands.send_message_request(chat_id, message_body))
+            return
+
+        client_message_id = uuid.uuid4().hex
+        self.outbox[client_message_id] = {'chat_id': chat_id, 'body': message_body}
+        self.client_socket.send_command(OutboundCommands.send_message_request(chat_id, message_body, client_message_id))
+
+
+    # The server stores each id once however many times it is sent
+    def resend_outbox(self) -> None:
+        for client_message_id, message in list(self.outbox.items()):
+            self.client_socket.send_command(
+                OutboundCommands.send_message_request(message['chat_id'], message['body'], client_message_id)
+            )
+
+
+    # Messages refused for being sent too fast are sent again once, however many were refused
+    def schedule_outbox(self, delay: float) -> None:
+        if self.outbox_timer and self.outbox_timer.is_alive(): return
+        self.outbox_timer = threading.Timer(delay, self.resend_outbox)
+        self.outbox_timer.daemon = True
+        self.outbox_timer.start()
+
+
+    def handle_message_ack(self, chat_id: int, client_message_id: str, reply_id: int) -> None:
+        self.outbox.pop(client_message_id, None)
+
+    
+    def receive_file(self, chat_id: int, file_name: str, contents: str, file_size: int, end: bool) -> None:
+        if not self.chat_feeds.get(chat_id): return
+        if end: 
+            self.save_file(chat_id, file_name, self.file_buffers[file_name], file_size)
+            del self.file_buffers[file_name]
+        else:
+            base64_decoded = base64.b64decode(contents)
+            if not self.file_buffers.get(file_name):
+                self.file_buffers[file_name] = b""
+            self.file_buffers[file_name] += base64_decoded
+
+    
+    # Files pushed in full by servers that cannot serve downloads
+    def save_file(self, chat_id: int, file_name: str, contents: Union[bytes, bytearray], file_size: int) -> None:
+        file_path = os.path.join(self.download_path, os.path.basename(file_name))
+        with open(file_path, 'wb') as file:
+            file.write(contents)
+        file_widget = self.chat_feeds[chat_id].create_file(file_name, file_size)
+        file_widget.open_button.configure(command=lambda: self.open_local_file(file_path))
+
+
+    def open_local_file(self, file_path: str) -> None:
+        os.system(f'start "" "{file_path}"')
+
+
+    # Only the details of a file arrive when it is sent to a chat, nothing is downloaded until it is opened
+    def handle_create_chat_file(self, chat_id: int, file_details: FileDetails) -> None:
+        if not self.chat_feeds.get(chat_id): return
+        self.file_cursors[chat_id] = max(file_details.get('file_id', 0), self.file_cursors.get(chat_id, 0))
+        if (chat_id, file_details['file_hash']) in self.chat_files: return
+        file_widget = self.chat_feeds[chat_id].create_file(file_details['file_name'], file_details['file_size'])
+        file_widget.open_button.configure(command=lambda: self.open_chat_file(chat_id, file_details['file_hash']))
+        self.chat_files[(chat_id, file_details['file_hash'])] = {**file_details, 'chat_id': chat_id, 'widget': file_widget}
+
+
+    def get_download_paths(self, chat_file: dict[str, Any]) -> tuple[str, str]:
+        file_path = os.path.join(self.download_path, os.path.basename(chat_file['file_name']))
+        return file_path, f"{file_path}.{chat_file['file_hash'][:16]}.part"
+
+
+    # Opens the file if it has already been downloaded, otherwise asks for the bytes still missing
+    def open_chat_file(self, chat_id: int, file_hash: str) -> None:
+        chat_file = self.chat_files.get((chat_id, file_hash))
+        if not chat_file or chat_file.get('downloading'): return
+        file_path, part_path = self.get_download_paths(chat_file)
+
+        local_path = self.local_files.get(file_hash)
+        if local_path and os.path.exists(local_path): self.open_local_file(local_path); return
+        if os.path.exists(file_path) and os.path.getsize(file_path) == chat_file['file_size'] and hash_file(file_path) == file_hash:
+            self.local_files[file_hash] = file_path
+            self.open_local_file(file_path); return
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        chat_file['downloading'] = True
+        chat_file['widget'].set_status('Downloading')
+        self.client_socket.send_command(OutboundCommands.file_download_request(chat_id, file_hash, offset))
+
+
+    # Downloads are written straight to a part file, which is what lets them carry on from where they stopped
+    def handle_file_begin(self, transfer_id: int, chat_id: int, file_name: str, file_size: int, file_hash: str, offset: int) -> None:
+        chat_file = self.chat_files.get((chat_id, file_hash))
+        if not chat_file: return
+        _, part_path = self.get_download_paths(chat_file)
+        part_file = open(part_path, 'r+b' if os.path.exists(part_path) else 'wb')
+        part_file.seek(offset)
+        part_file.truncate()
+        self.downloads[transfer_id] = {'chat_file': chat_file, 'part_file': part_file, 'offset': offset}
+
+
+    def receive_file_chunk(self, transfer_id: int, offset: int, data: memoryview) -> None:
+        download = self.downloads.get(transfer_id)
+        if not download or offset != download['offset']: return
+        download['part_file'].write(data)
+        download['offset'] += len(data)
+
+
+    def handle_file_end(self, transfer_id: int) -> None:
+        download = self.downloads.pop(transfer_id, None)
+        if not download: return
+        download['part_file'].close()
+        chat_file = download['chat_file']
+        chat_file['downloading'] = False
+        file_path, part_path = self.get_download_paths(chat_file)
+
+        if download['offset'] != chat_file['file_size']: chat_file['widget'].set_status('Download stopped, open to carry on'); return
+        if hash_file(part_path) != chat_file['file_hash']:
+            os.remove(part_path)
+            chat_file['widget'].set_status('Download failed'); return
+
+        os.replace(part_path, file_path)
+        self.local_files[chat_file['file_hash']] = file_path
+        chat_file['widget'].set_status('')
+        self.open_local_file(file_path)
+
+
+    # A download cut off by a dropped connection is asked for again from the last byte written
+    def resume_download(self, transfer_id: int) -> None:
+        download = self.downloads.pop(transfer_id)
+        download['part_file'].close()
+        chat_file = download['chat_file']
+        command = OutboundCommands.file_download_request(chat_file['chat_id'], chat_file['file_hash'], download['offset'])
+        self.client_socket.send_command(command)
+
+
+    # The server is told the size and hash once, then the file goes as large binary chunks
+    def send_file(self, chat_id: int) -> None:
+        file_path = filedialog.askopenfilename(initialdir="/Documents", title="Browse")
+        if not file_path: return
+        file_size, file_name = os.path.getsize(file_path), os.path.basename(file_path)
+        capabilities = self.client_socket.capabilities
+        if not capabilities or not capabilities.file_transfer: self.send_file_legacy(chat_id, file_path); return
+        if not file_size or file_size > MAX_FILE_SIZE or ' ' in file_name: return
+
+        upload = {
+            'chat_id': chat_id, 'file_path': file_path, 'file_name': file_name,
+            'file_size': file_size, 'file_hash': hash_file(file_path)
+        }
+        self.uploads[(chat_id, upload['file_hash'])] = upload
+        self.begin_upload(upload)
+
+
+    def begin_upload(self, upload: dict[str, Any]) -> None:
+        command = OutboundCommands.file_begin(upload['chat_id'], upload['file_name'], upload['file_size'], upload['file_hash'])
+        self.client_socket.send_command(command)
+
+
+    # The server replies with where to start from, which is only past zero when resuming, and how
+    # much it can be sent before it has to give more window
+    def handle_file_begin_response(self, chat_id: int, file_hash: str, transfer_id: int, offset: int, accepted: bool,
+                                   reason: str, window: int = 0) -> None:
+        upload = self.uploads.get((chat_id, file_hash))
+        if not upload: return
+        if not accepted: del self.uploads[(chat_id, file_hash)]; print(f'Could not send file: {reason}'); return
+        self.client_socket.open_stream(transfer_id, window)
+        threading.Thread(target=self.upload_file, args=(upload, transfer_id, offset), daemon=True).start()
+
+
+    # Runs on its own thread so a large file does not hold up the window or incoming commands
+    def upload_file(self, upload: dict[str, Any], transfer_id: int, offset: int) -> None:
+        try:
+            with open(upload['file_path'], 'rb') as file:
+                file.seek(offset)
+                while data := file.read(DEFAULT_FILE_CHUNK_SIZE):
+                    if not self.client_socket.send_binary(transfer_id, offset, data): return
+                    offset += len(data)
+        finally:
+            self.client_socket.close_stream(transfer_id)
+        self.client_socket.send_command(OutboundCommands.file_end(transfer_id))
+        self.uploads.pop((upload['chat_id'], upload['file_hash']), None)
+        self.local_files[upload['file_hash']] = upload['file_path']
+
+
+    # Servers without binary frames are sent base64 chunks in send-file-request commands
+    def send_file_legacy(self, chat_id: int, file_path: str) -> None:
+        file_size, file_name = os.path.getsize(file_path), os.path.basename(file_path)
+        if file_size > LEGACY_MAX_FILE_SIZE or ' ' in file_name: return
+
+        with open(file_path, 'rb') as file:
+              while True:
+                data = file.read(BUFFER_CHUNK_SIZE)
+                base64_encoded = base64.b64encode(data)
+                base64_string = base64_encoded.decode('utf-8')
+
+                if not data:
+                    self.client_socket.send_command(
+                        OutboundCommands.send_file_request(
+                            chat_id=chat_id, contents='', end=True,
+                            file_name=file_name, file_size=file_size
+                        )
+                    )
+                    break       
+                self.client_socket.send_command(
+                    OutboundCommands.send_file_request(
+                        chat_id=chat_id, contents=base64_string,
+                        file_name=file_name, file_size=file_size,
+                        end=False
+                    )
+                )
+    
+    
+    def end_chat_as_recipient(self, chat_id: int) -> None:
+        command = OutboundCommands.end_chat_request_as_recipient(chat_id)
+        self.client_socket.send_command(command)
+
+
+    def end_chat_as_publisher(self, chat_id: int, rating: str) -> None:
+        command = OutboundCommands.end_chat_request_as_publisher(chat_id, rating)
+        self.client_socket.send_command(command)
+
+    
+    def handle_create_chat(self, chat_id: int, user_id: int, first_name: str, last_name: str, question_details: QuestionDetails, question_publisher: bool) -> None:
+        if chat_id in self.chat_feeds: return
+        self.chat_cursors.setdefault(chat_id, 0)
+        view_profile_command = OutboundCommands.view_user_profile(user_id)
+        chat_feed = self.dashboard.chat_page.create_chat_feed(first_name, last_name, question_details)
+        chat_link = self.dashboard.chat_page.chat_link_page.create_chat_link(first_name, last_name)
+        self.chat_feeds[chat_id], self.chat_links[chat_id] = chat_feed, chat_link
+
+        chat_feed.back_button.configure(command=lambda: self.close_question_chat(chat_id))
+        chat_link.view_chat_button.configure(command=lambda: self.open_question_chat(chat_id))
+        chat_link.view_profile_button.configure(command=lambda: self.send_request(view_profile_command))
+        chat_feed.send_message_button.configure(command=lambda: self.send_message(chat_id))
+        chat_feed.send_file_button.configure(command=lambda: self.send_file(chat_id))
+        chat_feed.message_entry.bind('<Return>', command=lambda _: self.send_message(chat_id))
+
+        if not question_publisher: 
+            chat_link.end_chat_button.configure(
+                command=lambda: self.end_chat_as_recipient(chat_id)
+            ); return
+        
+        else:
+            chat_link.accent.configure(fg_color='#245480')
+            chat_link.end_chat_button.configure(text='End chat and review user')
+            chat_link.end_chat_button.configure(command=chat_link.toggle_rating_input)
+            chat_link.rate_user_button.configure(
+                command=lambda: self.end_chat_as_publisher(
+                    chat_id, chat_link.get_question_feedback()
+                )
+            )
+
+    
+    def delete_question_chat(self, chat_id: int) -> None:
+        if not self.chat_links.get(chat_id) or not self.chat_feeds.get(chat_id): 
+            return 
+        self.chat_links[chat_id].pack_forget()
+        self.chat_feeds[chat_id].pack_forget()
+        del self.chat_links[chat_id]
+        del self.chat_feeds[chat_id]
+        self.chat_cursors.pop(chat_id, None)
+        self.file_cursors.pop(chat_id, None)
+        for chat_file_key in [key for key in self.chat_files if key[0] == chat_id]: del self.chat_files[chat_file_key]
+
+
+    def ask_question(self) -> None:
+        self.dashboard.ask_question_page.toggle_freeze_page(freeze=True)
+        question_details = self.dashboard.get_question_details()
+        manual_searching = self.dashboard.ask_question_page.manual_searching
+        command: Union[SocketCommand, None] = None
+
+        if manual_searching: command = OutboundCommands.ask_question(question_details, self.selected_manual_ids)
+        else: command =  OutboundCommands.ask_question(question_details)
+        self.send_request(command, self.handle_ask_question_response)
+
+    
+    def update_question_statistics(self, question_id: int, question_statistics: QuestionStatistics) -> None:
+        pending_question = self.pending_questions.get(question_id)
+        if not pending_question: return
+        pending_question.update_statistics(question_statistics)
+
+    
+    def sign_out_user(self) -> None:
+        command = OutboundCommands.sign_out()
+        self.resume_token = None
+        self.outbox.clear()
+        self.client_socket.send_command(command)
+        self.switch_frame('access')
+
+
+    # Other application methods
+    # The response is handled like any other command. If the request fails instead (no answer in
+    # time or the connection dropped) the response handler is told, so a frozen page unfreezes
+    def send_request(self, command: SocketCommand, response_handler: Any = None) -> None:
+        def handle_response(future: Future) -> None:
+            if future.exception():
+                if response_handler: response_handler(accepted=False, reason=REQUEST_FAILED_REASON)
+            elif future.result(): self.recv_command(future.result())
+        self.client_socket.request(command, handle_response)
+
+
+    def recv_command(self, command: SocketCommand) -> None:
+        command_name, arguments = command.get('command_name'), command.get('arguments')
+        if not InboundCommands.has_command(command_name): return
+        try: self.command_map[command_name](**arguments)
+        except (KeyError, TypeError) as err: print(f'Could not map command: {err}')
+
+
+    def handle_batch(self, commands: list[SocketCommand]) -> None:
+        for command in commands:
+            self.recv_command(command)
+
+    
+    def bind_buttons(self) -> None:
+        self.access.register_page.register_button.configure(command=lambda: self.register_user())
+        self.access.verification_page.verify_button.configure(command=lambda: self.verify_user())
+        self.access.login_page.login_button.configure(command=lambda: self.login_user())
+        self.dashboard.ask_question_page.ask_question_button.configure(command=lambda: self.ask_question())
+        self.dashboard.ask_question_page.manual_user_search.bind('<Return>', command=lambda _: self.search_for_user())
+
+
+    def open_question_chat(self, question_id: int) -> None:
+        if not question_id in self.chat_feeds.keys(): return
+        self.dashboard.chat_page.chat_link_page.toggle_page(hide=True)
+        self.chat_feeds[question_id].toggle_page(False)
+
+    
+    def close_question_chat(self, question_id: int) -> None:
+        if not question_id in self.chat_feeds.keys(): return
+        self.chat_feeds[question_id].toggle_page(True)
+        self.dashboard.chat_page.chat_link_page.toggle_page(hide=False)
+
+    
+    def switch_frame(self, _to: str) -> None:
+        if not self.frames[_to].displaying: 
+            for frame in self.frames.values():
+                if frame.displaying: frame.toggle_frame(True)
+            self.frames[_to].toggle_frame(False)
+
+
+    def exit(self) -> None:
+        self.running = False
+        self.client_socket.close()
+        self.destroy()
+
  
\ No newline at end of file
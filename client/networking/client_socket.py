@@ -1,94 +1,381 @@
-import json
-import logging
-import socket
-import threading
-from typing import Any
-
-from networking.crypto_utils import CryptoUtils, KeyType
-from static.shared_types import *
-
-
-# Used to connect to the server socket and receive commands
-class ClientSocket:
-    def __init__(self, port: int, format: str, backlog: int, 
-                 header_size: int, client_private_key_path: str, 
-                 server_public_key_path: str, recv_callback: Any,
-                 connect_to_server: bool = True) -> None:
-        
-        # Initiate private and public key path attributes
-        self.__server_public_key = CryptoUtils.load_key_from_file(server_public_key_path, KeyType.PUBLIC)
-        self.__client_private_key = CryptoUtils.load_key_from_file(client_private_key_path, KeyType.PRIVATE)
-
-        # Initiate socket settings
-        self.port = port
-        self.format = format
-        self.backlog = backlog
-        self.header_size = header_size
-        self.connected = bool()
-        self.recv_callback = recv_callback
-
-        # Start the socket if connect to server is true
-        if connect_to_server: 
-            self.initiate_socket()
-     
-
-    def initiate_socket(self) -> None:
-        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.__address = (socket.gethostname(), self.port)
-        self.start_socket()
-
-
-    def start_socket(self) -> None:
-        try:
-            self.__socket.connect(self.__address)
-            self.__debug(f'connected to {self.__address}')
-            self.connected = True
-            threading.Thread(target=self.listen_for_commands).start()
-    
-        except socket.error as err:
-            self.__debug(err.strerror)
-            self.close()
-
-
-    def listen_for_commands(self) -> None:
-        while self.connected:
-            try:
-                header = self.__socket.recv(self.header_size)
-                if not header: 
-                    raise(socket.error)
-                
-                data_length = int.from_bytes(header, byteorder='big')
-                encrypted_command = self.__socket.recv(data_length)
-                if encrypted_command: self.receive_command(encrypted_command)
-
-            except (socket.error, json.JSONDecodeError) as err:
-                self.__debug(err)
-                self.close()
-
-
-    def receive_command(self, encrypted_command: bytes) -> None:
-        decrypted_message = CryptoUtils.decrypt_data(encrypted_command, self.__client_private_key)
-        if decrypted_message is None: self.__debug(f'could not decrypt: {encrypted_command}'); return
-        json_command = decrypted_message.decode()
-        raw_command: SocketCommand = json.loads(json_command)
-        self.__debug(f'command from server: {raw_command}')
-        self.recv_callback(raw_command)
-
-
-    def send_command(self, command: SocketCommand) -> None:
-        if self.connected:
-            json_command = json.dumps(command)
-            encrypted_command = CryptoUtils.encrypt_data(json_command.encode(), self.__server_public_key)
-            if not encrypted_command: self.__debug(f'Command too large: {json_command}'); return
-            header = len(encrypted_command).to_bytes(self.header_size, byteorder='big')
-            self.__socket.sendall(header + encrypted_command) 
-            self.__debug(f'to server: {json_command}')
-
-
-    def close(self) -> None:
-        self.connected = False
-        self.__socket.close()
-
-            
-    def __debug(self, message) -> None:
-        logging.debug(f'[client] {message}')
+import base64
+import itertools
+import json
+import logging
+import random
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Optional, Union
+
+from networking.binary_frames import is_binary_frame, pack_binary_frame, unpack_binary_frame
+from networking.command_codec import CODECS, JSON, Codec, CodecError, decode_command
+from networking.compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    CompressionError,
+    Compressor,
+    get_dictionary_id,
+    load_dictionary,
+)
+from networking.crypto_utils import CryptoUtils, KeyType, PlainCipher, Role, SessionCipher
+from networking.flow_control import StreamCredits
+from networking.framing import DEFAULT_MAX_FRAME_SIZE, FrameDecoder
+from networking.handshake import Capabilities, create_hello, read_hello_reply
+from networking.tls import check_pinned_key, create_client_context
+from static.commands import InboundCommands, OutboundCommands
+from static.shared_types import *
+
+DEFAULT_HEARTBEAT_INTERVAL = 15 # Seconds
+DEFAULT_SERVER_TIMEOUT = 45 # Seconds
+MIN_RECONNECT_DELAY = 1 # Seconds
+DEFAULT_MAX_RECONNECT_DELAY = 30 # Seconds
+
+
+# Used to connect to the server socket and receive commands
+class ClientSocket:
+    def __init__(self, port: int, format: str, backlog: int, 
+                 header_size: int, client_private_key_path: str, 
+                 server_public_key_path: str, recv_callback: Any,
+                 connect_to_server: bool = True, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 compression: bool = True, compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                 binary_codec: bool = True, heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+                 server_timeout: float = DEFAULT_SERVER_TIMEOUT, reconnect: bool = True,
+                 reconnect_callback: Any = None, max_reconnect_delay: float = DEFAULT_MAX_RECONNECT_DELAY,
+                 binary_callback: Any = None, tls: bool = False, tls_ca_path: Optional[str] = None) -> None:
+        
+        # Initiate private and public key path attributes
+        self.__server_public_key = CryptoUtils.load_key_from_file(server_public_key_path, KeyType.PUBLIC)
+        self.__client_private_key = CryptoUtils.load_key_from_file(client_private_key_path, KeyType.PRIVATE)
+
+        # Initiate socket settings
+        self.port = port
+        self.format = format
+        self.backlog = backlog
+        self.header_size = header_size
+        self.max_frame_size = max_frame_size
+        self.connected = bool()
+        self.recv_callback = recv_callback
+        self.binary_callback = binary_callback
+        self.heartbeat_interval = heartbeat_interval
+        self.server_timeout = server_timeout
+        self.last_activity = time.monotonic()
+        self.__send_lock = threading.Lock()
+        self.session_cipher: Union[SessionCipher, PlainCipher, None] = None
+
+        # Connections can be wrapped in TLS instead of the RSA hello. Without a CA the certificate has
+        # to carry the server public key. The last session is kept so a reconnect can resume it
+        self.tls_context: Union[ssl.SSLContext, None] = create_client_context(tls_ca_path) if tls else None
+        self.tls_verified = bool(tls_ca_path)
+        self.tls_session: Union[ssl.SSLSession, None] = None
+
+        # A lost connection is retried with backoff until close is called, the callback runs
+        # once the new session has started so the application can resume where it left off
+        self.reconnect = reconnect
+        self.reconnect_callback = reconnect_callback
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnecting = False
+        self.__retrying = False
+        self.__closing = False
+        self.__connection_lock = threading.Lock()
+        self.__socket: Union[socket.socket, None] = None
+
+        # Frames are sent as uncompressed JSON until the server replies to the hello with
+        # the capabilities it agreed to
+        self.capabilities: Union[Capabilities, None] = None
+        self.binary_codec = binary_codec
+        self.codec: Codec = CODECS[JSON]
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_dictionary = load_dictionary()
+        self.compressor = Compressor(max_size=max_frame_size)
+
+        # Credit for every upload stream the server flow controls
+        self.stream_credits = StreamCredits()
+
+        # Requests waiting for their response, by request id, with the time they give up at
+        self.__request_ids = itertools.count(1)
+        self.__requests: dict[int, tuple[Future, float]] = dict()
+        self.__requests_lock = threading.Lock()
+
+        # Start the socket if connect to server is true
+        if connect_to_server: 
+            self.initiate_socket()
+     
+
+    def initiate_socket(self) -> None:
+        self.__address = (socket.gethostname(), self.port)
+        if not self.start_socket() and self.reconnect: self.connection_lost(None)
+
+
+    # Every connection gets its own socket, frame decoder and session, so threads left over
+    # from a lost connection can never read from the new one
+    def start_socket(self) -> bool:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        frame_decoder = FrameDecoder(self.header_size, self.max_frame_size)
+        self.reset_session()
+        try:
+            connection.connect(self.__address)
+            if self.tls_context: connection = self.start_tls(connection)
+        except socket.error as err:
+            self.__debug(err.strerror)
+            connection.close()
+            return False
+
+        with self.__connection_lock:
+            if self.__closing: connection.close(); return False
+            self.__socket = connection
+            self.__retrying = False
+        self.__debug(f'connected to {self.__address}')
+
+        # Nothing else can be sent until the hello has gone out
+        try: self.send_session_key()
+        except socket.error as err:
+            self.__debug(err.strerror)
+            self.connection_lost(connection)
+            return True
+
+        self.connected = True
+        self.last_activity = time.monotonic()
+        threading.Thread(target=self.listen_for_commands, args=(connection, frame_decoder)).start()
+        threading.Thread(target=self.watch_server, args=(connection,), daemon=True).start()
+        return True
+
+
+    def start_tls(self, connection: socket.socket) -> ssl.SSLSocket:
+        connection = self.tls_context.wrap_socket(connection, server_hostname=self.__address[0], session=self.tls_session)
+        if not self.tls_verified and not check_pinned_key(connection, self.__server_public_key):
+            connection.close()
+            raise ssl.SSLError(ssl.SSL_ERROR_SSL, 'the server certificate does not have the server public key')
+        self.__debug(f'tls started, session reused: {connection.session_reused}')
+        return connection
+
+
+    # Frames are JSON and uncompressed again until the new hello has been answered
+    def reset_session(self) -> None:
+        self.stream_credits.reset()
+        self.session_cipher = None
+        self.capabilities = None
+        self.codec = CODECS[JSON]
+        self.compressor = Compressor(max_size=self.max_frame_size)
+
+
+    def listen_for_commands(self, connection: socket.socket, frame_decoder: FrameDecoder) -> None:
+        while self.connected and connection is self.__socket:
+            try:
+                if not frame_decoder.recv_into(connection): 
+                    raise(socket.error)
+                for encrypted_command in frame_decoder.frames():
+                    self.receive_command(encrypted_command)
+
+            except (socket.error, json.JSONDecodeError) as err:
+                self.__debug(err)
+                self.connection_lost(connection)
+
+
+    # Pings the server once it has been quiet for a heartbeat interval and gives up on it after
+    # the server timeout, a dead server would otherwise leave recv waiting forever
+    def watch_server(self, connection: socket.socket) -> None:
+        while self.connected and connection is self.__socket:
+            time.sleep(self.heartbeat_interval)
+            self.expire_requests()
+            idle_time = time.monotonic() - self.last_activity
+            if idle_time >= self.server_timeout:
+                self.__debug(f'no reply from the server for {round(idle_time)} seconds')
+                self.connection_lost(connection)
+            elif idle_time >= self.heartbeat_interval:
+                self.send_command(OutboundCommands.ping())
+
+
+    # Only the first thread to notice a connection has gone starts reconnecting
+    def connection_lost(self, connection: Union[socket.socket, None]) -> None:
+        with self.__connection_lock:
+            if connection is not self.__socket or self.__closing or self.__retrying: return
+            self.connected = False
+            self.reconnecting = self.__retrying = self.reconnect
+        self.stream_credits.reset()
+        self.fail_requests(ConnectionError('the connection to the server was lost'))
+        if connection: self.close_connection(connection)
+        if self.__retrying: threading.Thread(target=self.reconnect_to_server, daemon=True).start()
+
+
+    # Exponential backoff with jitter, so clients dropped by the same server restart do not
+    # all come back at the same moment
+    def reconnect_to_server(self) -> None:
+        delay = MIN_RECONNECT_DELAY
+        while not self.__closing:
+            time.sleep(random.uniform(delay / 2, delay))
+            self.__debug(f'reconnecting to {self.__address}')
+            if self.start_socket(): return
+            delay = min(delay * 2, self.max_reconnect_delay)
+        self.reconnecting = self.__retrying = False
+
+
+    # The only RSA encrypted frame sent by the client, after this both sides use AES-GCM. Over TLS
+    # there is no session key and the hello is sent as it is
+    def send_session_key(self) -> None:
+        session_key = b'' if self.tls_context else CryptoUtils.generate_session_key()
+        handshake = json.dumps(create_hello(
+            session_key=base64.b64encode(session_key).decode(), max_frame_size=self.max_frame_size,
+            dictionary_id=get_dictionary_id(self.compression_dictionary),
+            binary_codec=self.binary_codec, compression=self.compression, tls=bool(self.tls_context)
+        ))
+        if self.tls_context: encrypted_handshake = handshake.encode()
+        else: encrypted_handshake = CryptoUtils.encrypt_data(handshake.encode(), self.__server_public_key)
+        header = len(encrypted_handshake).to_bytes(self.header_size, byteorder='big')
+        self.__socket.sendall(header + encrypted_handshake)
+        self.session_cipher = PlainCipher() if self.tls_context else SessionCipher(session_key, Role.CLIENT)
+
+
+    def receive_command(self, encrypted_command: Union[bytes, memoryview]) -> None:
+        self.last_activity = time.monotonic()
+        decrypted_message = self.session_cipher.decrypt(encrypted_command)
+        if decrypted_message is None: self.__debug(f'could not decrypt: {bytes(encrypted_command)}'); return
+        if is_binary_frame(decrypted_message):
+            if self.binary_callback: self.binary_callback(*unpack_binary_frame(decrypted_message))
+            return
+        try: decrypted_message = self.compressor.decompress(decrypted_message)
+        except CompressionError as err: self.__debug(f'could not decompress: {err}'); return
+
+        try: raw_command: SocketCommand = decode_command(decrypted_message)
+        except CodecError as err: self.__debug(f'could not decode: {err}'); return
+        if not self.capabilities: self.complete_handshake(raw_command); return
+
+        command_name = raw_command.get('command_name')
+        if command_name == InboundCommands.Ping.value: self.send_command(OutboundCommands.pong()); return
+        if command_name == InboundCommands.Pong.value: return
+        if command_name == InboundCommands.FileWindow.value:
+            self.stream_credits.add(raw_command['arguments']['transfer_id'], raw_command['arguments']['increment']); return
+        self.__debug(f'command from server: {raw_command}')
+        if 'request_id' in raw_command and self.resolve_request(raw_command['request_id'], raw_command): return
+        self.recv_callback(raw_command)
+
+
+    # The server's first frame is its reply to the hello
+    def complete_handshake(self, hello_reply: dict) -> None:
+        capabilities = read_hello_reply(hello_reply)
+        dictionary = self.compression_dictionary if capabilities.dictionary else b''
+        self.compressor = Compressor(capabilities.compression, dictionary, self.compression_threshold, self.max_frame_size)
+        self.codec = CODECS.get(capabilities.codec, CODECS[JSON])
+
+        # The server's session tickets arrive before its hello reply. The session is kept now, as
+        # one taken after the connection has failed can no longer be resumed. It is kept before the
+        # capabilities are set, so anything waiting on them never sees the ticket that was just used
+        if isinstance(self.__socket, ssl.SSLSocket): self.tls_session = self.__socket.session
+        self.capabilities = capabilities
+        self.__debug(f'session started: {capabilities}')
+        if self.reconnecting:
+            self.reconnecting = False
+            if self.reconnect_callback: self.reconnect_callback()
+
+
+    def send_command(self, command: SocketCommand) -> None:
+        if self.connected:
+            connection = self.__socket
+            compressed_command = self.compressor.compress(self.codec.encode(command))
+            # The watchdog thread sends pings too, so frames are sealed and written one at a time
+            # and reach the server in the order of their nonces
+            try:
+                with self.__send_lock:
+                    encrypted_command = self.session_cipher.encrypt(compressed_command)
+                    if self.capabilities and self.capabilities.max_frame_size and len(encrypted_command) > self.capabilities.max_frame_size:
+                        self.__debug(f"command of {len(encrypted_command)} bytes is over the server's frame limit"); return
+                    header = len(encrypted_command).to_bytes(self.header_size, byteorder='big')
+                    connection.sendall(header + encrypted_command)
+            except socket.error as err:
+                self.__debug(err); self.connection_lost(connection); return
+            self.__debug(f'to server: {command}')
+
+
+    # Sends a command the server answers and returns a future for the response. Responses are
+    # matched by request id, so any number of requests can be in flight at once. The callback is
+    # added before the command is sent, so it runs on the listening thread in the same order as
+    # the commands around the response. Servers without request ids resolve the future with None
+    # straight away and their response goes to the recv callback as before
+    def request(self, command: SocketCommand, callback: Any = None) -> Future:
+        future: Future = Future()
+        if callback: future.add_done_callback(callback)
+        if not self.connected:
+            future.set_exception(ConnectionError('not connected to the server'))
+            return future
+        if not self.capabilities or not self.capabilities.request_ids:
+            self.send_command(command)
+            future.set_result(None)
+            return future
+
+        with self.__requests_lock:
+            request_id = next(self.__request_ids)
+            self.__requests[request_id] = (future, time.monotonic() + self.server_timeout)
+        self.send_command({**command, 'request_id': request_id})
+        return future
+
+
+    def resolve_request(self, request_id: int, response: SocketCommand) -> bool:
+        with self.__requests_lock: request = self.__requests.pop(request_id, None)
+        if not request: return False
+        request[0].set_result(response)
+        return True
+
+
+    # Not every request is answered, a handler can refuse one without saying so
+    def expire_requests(self) -> None:
+        now = time.monotonic()
+        with self.__requests_lock:
+            expired = [request_id for request_id, (_, deadline) in self.__requests.items() if deadline <= now]
+            futures = [self.__requests.pop(request_id)[0] for request_id in expired]
+        for future in futures: future.set_exception(TimeoutError('the server did not answer the request'))
+
+
+    # The server forgets a connection's requests with it, so none of them can be answered any more
+    def fail_requests(self, error: Exception) -> None:
+        with self.__requests_lock:
+            futures = [future for future, _ in self.__requests.values()]
+            self.__requests.clear()
+        for future in futures: future.set_exception(error)
+
+
+    # Raw file data for servers that agreed to file transfers, returns whether it was sent. On a flow
+    # controlled stream this waits until the server has room for it
+    def send_binary(self, transfer_id: int, offset: int, data: bytes) -> bool:
+        if not self.connected or not self.capabilities or not self.capabilities.file_transfer: return False
+        if not self.stream_credits.acquire(transfer_id, len(data), self.server_timeout):
+            self.__debug(f'no window for transfer {transfer_id}'); return False
+        connection = self.__socket
+        try:
+            with self.__send_lock:
+                encrypted_data = self.session_cipher.encrypt(pack_binary_frame(transfer_id, offset, data))
+                header = len(encrypted_data).to_bytes(self.header_size, byteorder='big')
+                connection.sendall(header + encrypted_data)
+        except socket.error as err:
+            self.__debug(err); self.connection_lost(connection); return False
+        return True
+
+
+    # A window of zero means the server does not flow control the stream
+    def open_stream(self, transfer_id: int, window: int) -> None:
+        if window: self.stream_credits.open(transfer_id, window)
+
+
+    def close_stream(self, transfer_id: int) -> None:
+        self.stream_credits.close(transfer_id)
+
+
+    def close(self) -> None:
+        with self.__connection_lock:
+            self.__closing = True
+            self.connected = False
+        self.fail_requests(ConnectionError('the client socket was closed'))
+        if self.__socket: self.close_connection(self.__socket)
+
+
+    @staticmethod
+    def close_connection(connection: socket.socket) -> None:
+        # Shutting down first wakes up the listening thread, close alone leaves it in recv
+        try: connection.shutdown(socket.SHUT_RDWR)
+        except socket.error: pass
+        connection.close()
+
+            
+    def __debug(self, message) -> None:
+        logging.debug(f'[client] {message}')
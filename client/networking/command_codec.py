@@ -0,0 +1,120 @@
+import json
+import struct
+from datetime import date, datetime
+from typing import Any, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+
+# Dates are sent as strings by the JSON codec, in the same format the handlers used to send them
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# msgpack extension types, dates are packed field by field so naive datetimes survive the trip
+DATETIME_EXT_TYPE = 1
+DATE_EXT_TYPE = 2
+DATETIME_STRUCT = struct.Struct('>HBBBBBI')
+DATE_STRUCT = struct.Struct('>HBB')
+
+
+class CodecError(ValueError):
+    pass
+
+
+# Turns commands into bytes and back. A connection picks its codec during the session handshake
+class Codec:
+    name: str = str()
+
+    def encode(self, command: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        raise NotImplementedError
+
+
+
+class JsonCodec(Codec):
+    name = JSON
+
+    def __init__(self) -> None:
+        self.__encoder = json.JSONEncoder(default=self.__encode_default)
+
+
+    def encode(self, command: Any) -> bytes:
+        return self.__encoder.encode(command).encode()
+
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        try:
+            return json.loads(bytes(data))
+        except (ValueError, UnicodeDecodeError) as err:
+            raise CodecError(str(err))
+
+
+    @staticmethod
+    def __encode_default(value: Any) -> str:
+        if isinstance(value, datetime): return value.strftime(DATETIME_FORMAT)
+        if isinstance(value, date): return value.strftime(DATE_FORMAT)
+        raise TypeError(f'{type(value).__name__} cannot be sent as JSON')
+
+
+
+# Compact binary encoding, ints and dates are sent as they are instead of as strings
+class MsgpackCodec(Codec):
+    name = MSGPACK
+
+    def encode(self, command: Any) -> bytes:
+        return msgpack.packb(command, default=self.__encode_default)
+
+
+    def decode(self, data: Union[bytes, memoryview]) -> Any:
+        try:
+            return msgpack.unpackb(data, ext_hook=self.__decode_ext, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException, struct.error) as err:
+            raise CodecError(str(err))
+
+
+    @staticmethod
+    def __encode_default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return msgpack.ExtType(DATETIME_EXT_TYPE, DATETIME_STRUCT.pack(
+                value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond
+            ))
+        if isinstance(value, date):
+            return msgpack.ExtType(DATE_EXT_TYPE, DATE_STRUCT.pack(value.year, value.month, value.day))
+        raise TypeError(f'{type(value).__name__} cannot be sent as msgpack')
+
+
+    @staticmethod
+    def __decode_ext(ext_type: int, data: bytes) -> Any:
+        if ext_type == DATETIME_EXT_TYPE: return datetime(*DATETIME_STRUCT.unpack(data))
+        if ext_type == DATE_EXT_TYPE: return date(*DATE_STRUCT.unpack(data))
+        return msgpack.ExtType(ext_type, data)
+
+
+
+CODECS: dict[str, Codec] = {JSON: JsonCodec()}
+if msgpack: CODECS[MSGPACK] = MsgpackCodec()
+
+
+# Most preferred first, msgpack is only offered when the msgpack package is installed
+def supported_codecs() -> list[str]:
+    return [MSGPACK, JSON] if msgpack else [JSON]
+
+
+def choose_codec(offered: list[str]) -> Codec:
+    for name in supported_codecs():
+        if name in offered: return CODECS[name]
+    return CODECS[JSON]
+
+
+# Every JSON command is an object, so frames can be decoded whichever codec the sender was using.
+# This matters while the handshake is in flight, when the two sides may not have switched yet
+def decode_command(data: Union[bytes, memoryview]) -> Any:
+    if data[:1] == b'{' or not msgpack: return CODECS[JSON].decode(data)
+    return CODECS[MSGPACK].decode(data)
@@ -0,0 +1,46 @@
+import threading
+
+
+# Bytes the server will still accept on each upload stream. Sending waits until the server has
+# given enough back, so a file can only have one window of data in flight ahead of the commands.
+# Streams that were opened without a window are not flow controlled
+class StreamCredits:
+    def __init__(self) -> None:
+        self.__credits: dict[int, int] = dict()
+        self.__condition = threading.Condition()
+
+
+    def open(self, stream_id: int, window: int) -> None:
+        with self.__condition:
+            self.__credits[stream_id] = window
+            self.__condition.notify_all()
+
+
+    def add(self, stream_id: int, increment: int) -> None:
+        with self.__condition:
+            if stream_id not in self.__credits: return
+            self.__credits[stream_id] += increment
+            self.__condition.notify_all()
+
+
+    # Returns False if no credit arrives in time or the stream is closed while waiting
+    def acquire(self, stream_id: int, size: int, timeout: float) -> bool:
+        with self.__condition:
+            if stream_id not in self.__credits: return True
+            has_credit = self.__condition.wait_for(lambda: self.__credits.get(stream_id, size) >= size, timeout)
+            if not has_credit or stream_id not in self.__credits: return False
+            self.__credits[stream_id] -= size
+            return True
+
+
+    def close(self, stream_id: int) -> None:
+        with self.__condition:
+            self.__credits.pop(stream_id, None)
+            self.__condition.notify_all()
+
+
+    # Every stream belongs to the connection, uploads still waiting give up when it is lost
+    def reset(self) -> None:
+        with self.__condition:
+            self.__credits.clear()
+            self.__condition.notify_all()
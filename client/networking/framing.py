@@ -0,0 +1,98 @@
+import errno
+import socket
+from typing import Iterator
+
+DEFAULT_BUFFER_SIZE = 65_536 # Bytes
+DEFAULT_MAX_FRAME_SIZE = 4_194_304 # Bytes
+
+
+class FrameSizeError(socket.error):
+    pass
+
+
+# Splits a length prefixed stream back into frames. Data is received straight into one
+# preallocated buffer and complete frames are handed out as memoryviews of it, so nothing is
+# concatenated per recv. Frames must be used before the next recv_into as the space is reused
+class FrameDecoder:
+    def __init__(self, header_size: int, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+
+        self.header_size = header_size
+        self.max_frame_size = max_frame_size
+        self.buffer_size = max(buffer_size, header_size)
+        self.__buffer = bytearray(self.buffer_size)
+        self.__view = memoryview(self.__buffer)
+
+        # Unread data sits between start and end, bytes needed is the size of the frame being waited on
+        self.__start = 0
+        self.__end = 0
+        self.__bytes_needed = header_size
+
+
+    def recv_into(self, connection: socket.socket) -> int:
+        received = connection.recv_into(self.get_buffer())
+        self.commit(received)
+        return received
+
+
+    def feed(self, data: bytes) -> None:
+        data_view = memoryview(data)
+        while data_view:
+            buffer = self.get_buffer()
+            size = min(len(buffer), len(data_view))
+            buffer[:size] = data_view[:size]
+            self.commit(size)
+            data_view = data_view[size:]
+
+
+    # Free space after the unread data, made large enough for the frame currently being received
+    def get_buffer(self) -> memoryview:
+        buffer_length = len(self.__buffer)
+        if buffer_length - self.__start < self.__bytes_needed or buffer_length - self.__end < buffer_length // 4:
+            self.__make_room()
+        return self.__view[self.__end:]
+
+
+    def commit(self, size: int) -> None:
+        self.__end += size
+
+
+    def frames(self) -> Iterator[memoryview]:
+        while self.__end - self.__start >= self.header_size:
+            header_end = self.__start + self.header_size
+            frame_length = int.from_bytes(self.__view[self.__start:header_end], byteorder='big')
+            if frame_length > self.max_frame_size:
+                raise FrameSizeError(errno.EMSGSIZE, f'frame of {frame_length} bytes is over the {self.max_frame_size} byte limit')
+
+            frame_end = header_end + frame_length
+            if frame_end > self.__end:
+                self.__bytes_needed = self.header_size + frame_length
+                return
+
+            self.__start = frame_end
+            self.__bytes_needed = self.header_size
+            yield self.__view[header_end:frame_end]
+
+        # Nothing is left over so the next recv can start from the front again, dropping
+        # any space that was only grown for one large frame
+        if self.__start == self.__end:
+            self.__start = self.__end = 0
+            if len(self.__buffer) > self.buffer_size:
+                self.__buffer = bytearray(self.buffer_size)
+                self.__view = memoryview(self.__buffer)
+
+
+    # Moves the partial frame to the front of the buffer, growing it when the frame cannot fit
+    # (or when feed has filled it with whole frames that have not been read yet)
+    def __make_room(self) -> None:
+        unread = self.__end - self.__start
+        buffer_length = max(self.__bytes_needed, len(self.__buffer))
+        if unread == len(self.__buffer): buffer_length = 2 * unread
+
+        if buffer_length > len(self.__buffer):
+            buffer = bytearray(buffer_length)
+            buffer[:unread] = self.__view[self.__start:self.__end]
+            self.__buffer, self.__view = buffer, memoryview(buffer)
+        elif self.__start:
+            self.__view[:unread] = self.__view[self.__start:self.__end]
+        self.__start, self.__end = 0, unread
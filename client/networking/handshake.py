@@ -0,0 +1,160 @@
+import base64
+import binascii
+from typing import Any, Union
+
+from networking.command_codec import JSON, choose_codec, supported_codecs
+from networking.compression import NO_COMPRESSION, choose_compression, supported_compressions
+from networking.crypto_utils import SESSION_KEY_SIZE
+
+# Version 1 clients send every frame encrypted with RSA and never send a hello
+LEGACY_PROTOCOL_VERSION = 1
+PROTOCOL_VERSION = 2
+
+RSA = 'rsa'
+AES_GCM = 'aes-gcm'
+TLS = 'tls'
+
+
+# A hello that cannot be read, the connection is closed instead of guessing what the client meant
+class HandshakeError(ValueError):
+    pass
+
+
+# What both sides of a connection agreed on, stored by the user and the client socket so
+# features can choose their fast path per connection
+class Capabilities:
+    def __init__(self, version: int = LEGACY_PROTOCOL_VERSION, codec: str = JSON, compression: str = NO_COMPRESSION,
+                 dictionary: str = '', batching: bool = False, max_frame_size: Union[int, None] = None,
+                 encryption: str = RSA, heartbeat: bool = False, file_transfer: bool = False,
+                 flow_control: bool = False, request_ids: bool = False, message_acks: bool = False) -> None:
+
+        self.version = version
+        self.codec = codec
+        self.compression = compression
+        self.dictionary = dictionary
+        self.batching = batching
+        self.max_frame_size = max_frame_size
+        self.encryption = encryption
+        self.heartbeat = heartbeat
+        self.file_transfer = file_transfer
+        self.flow_control = flow_control
+        self.request_ids = request_ids
+        self.message_acks = message_acks
+
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'codec': self.codec, 'compression': self.compression, 'dictionary': self.dictionary,
+            'batching': self.batching, 'max_frame_size': self.max_frame_size,
+            'encryption': self.encryption, 'heartbeat': self.heartbeat,
+            'file_transfer': self.file_transfer, 'flow_control': self.flow_control,
+            'request_ids': self.request_ids, 'message_acks': self.message_acks
+        }
+
+
+    @staticmethod
+    def from_dict(version: int, capabilities: dict[str, Any]) -> 'Capabilities':
+        return Capabilities(
+            version=version,
+            codec=capabilities.get('codec', JSON),
+            compression=capabilities.get('compression', NO_COMPRESSION),
+            dictionary=capabilities.get('dictionary', ''),
+            batching=capabilities.get('batching', False),
+            max_frame_size=capabilities.get('max_frame_size'),
+            encryption=capabilities.get('encryption', AES_GCM),
+            heartbeat=capabilities.get('heartbeat', False),
+            file_transfer=capabilities.get('file_transfer', False),
+            flow_control=capabilities.get('flow_control', False),
+            request_ids=capabilities.get('request_ids', False),
+            message_acks=capabilities.get('message_acks', False)
+        )
+
+
+    def __repr__(self) -> str:
+        return f'Capabilities(version={self.version}, {self.to_dict()})'
+
+
+
+# The first frame a client sends, encrypted with RSA (or sent as it is inside TLS, without a
+# session key). Everything the client supports is offered and the server picks from it
+def create_hello(session_key: str, max_frame_size: int, dictionary_id: str, binary_codec: bool = True,
+                 compression: bool = True, tls: bool = False) -> dict[str, Any]:
+    return {
+        'version': PROTOCOL_VERSION,
+        'session_key': session_key,
+        'capabilities': {
+            'codecs': supported_codecs() if binary_codec else [JSON],
+            'compression': supported_compressions() if compression else [NO_COMPRESSION],
+            'dictionary': dictionary_id,
+            'batching': True,
+            'max_frame_size': max_frame_size,
+            'encryption': [TLS] if tls else [AES_GCM],
+            'heartbeat': True,
+            'file_transfer': True,
+            'flow_control': True,
+            'request_ids': True,
+            'message_acks': True
+        }
+    }
+
+
+def is_hello(command: dict[str, Any]) -> bool:
+    return 'session_key' in command
+
+
+# The AES key the client sealed into its hello. TLS hellos do not carry one
+def read_session_key(hello: dict[str, Any]) -> bytes:
+    try: session_key = base64.b64decode(hello['session_key'], validate=True)
+    except (TypeError, binascii.Error) as err: raise HandshakeError(f'session key is not base64: {err}')
+    if len(session_key) != SESSION_KEY_SIZE // 8: raise HandshakeError(f'session key is {len(session_key)} bytes')
+    return session_key
+
+
+# Picks the best option both sides support for every capability. The dictionary is only
+# used if both sides have exactly the same one. Encryption depends on how the client connected
+def negotiate(hello: dict[str, Any], max_frame_size: int, dictionary_id: str, tls: bool = False) -> Capabilities:
+    version, offered = hello.get('version', PROTOCOL_VERSION), hello.get('capabilities', {})
+    if not is_integer(version) or version <= LEGACY_PROTOCOL_VERSION: raise HandshakeError(f'unsupported version: {version!r}')
+    if not isinstance(offered, dict): raise HandshakeError('capabilities are not an object')
+    for name in ('codecs', 'compression'):
+        if not is_string_list(offered.get(name, [])): raise HandshakeError(f'{name} are not a list of names')
+    if not isinstance(offered.get('dictionary', ''), str): raise HandshakeError('dictionary is not a string')
+    peer_max_frame_size = offered.get('max_frame_size')
+    if peer_max_frame_size is not None and (not is_integer(peer_max_frame_size) or peer_max_frame_size < 0):
+        raise HandshakeError(f'max frame size is not a size: {peer_max_frame_size!r}')
+
+    compression = choose_compression(offered.get('compression', []))
+    peer_max_frame_size = peer_max_frame_size or max_frame_size
+
+    return Capabilities(
+        version=min(version, PROTOCOL_VERSION),
+        codec=choose_codec(offered.get('codecs', [JSON])).name,
+        compression=compression,
+        dictionary=dictionary_id if compression != NO_COMPRESSION and offered.get('dictionary') == dictionary_id else '',
+        batching=bool(offered.get('batching')),
+        max_frame_size=min(max_frame_size, peer_max_frame_size),
+        encryption=TLS if tls else AES_GCM,
+        heartbeat=bool(offered.get('heartbeat')),
+        file_transfer=bool(offered.get('file_transfer')),
+        flow_control=bool(offered.get('flow_control')),
+        request_ids=bool(offered.get('request_ids')),
+        message_acks=bool(offered.get('message_acks'))
+    )
+
+
+# The server's first session frame
+def create_hello_reply(capabilities: Capabilities) -> dict[str, Any]:
+    return {'version': capabilities.version, 'capabilities': capabilities.to_dict()}
+
+
+def read_hello_reply(reply: dict[str, Any]) -> Capabilities:
+    return Capabilities.from_dict(reply.get('version', PROTOCOL_VERSION), reply.get('capabilities', {}))
+
+
+# Booleans are ints in Python but not in the protocol
+def is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_string_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
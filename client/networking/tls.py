@@ -0,0 +1,69 @@
+import datetime
+import os
+import ssl
+from typing import Optional
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+DEFAULT_TLS_CERTIFICATE_PATH = 'networking/server_certificate.pem'
+TLS_HANDSHAKE_TIMEOUT = 10 # Seconds
+CERTIFICATE_LIFETIME = 3650 # Days
+
+
+# A certificate for the server's existing RSA key, so TLS can be turned on without a CA. Clients
+# that are not given a CA check the key in it against the server public key they already have
+def create_certificate(private_key: rsa.RSAPrivateKey, common_name: str) -> bytes:
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=CERTIFICATE_LIFETIME))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(common_name)]), critical=False)
+        .sign(private_key, hashes.SHA256())
+    )
+    return certificate.public_bytes(serialization.Encoding.PEM)
+
+
+# TLS 1.3 only. Session tickets are on by default, so a client coming back after a network
+# blip resumes its session instead of doing a full handshake
+def create_server_context(private_key_path: str, certificate_path: str = DEFAULT_TLS_CERTIFICATE_PATH,
+                          common_name: str = 'localhost') -> ssl.SSLContext:
+
+    if not os.path.exists(certificate_path):
+        with open(private_key_path, 'rb') as key_file:
+            private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+        with open(certificate_path, 'wb') as certificate_file:
+            certificate_file.write(create_certificate(private_key, common_name))
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    context.load_cert_chain(certificate_path, private_key_path)
+    return context
+
+
+# With a CA the server's certificate and host name are checked the usual way. Without one the
+# certificate is only accepted once check_pinned_key has matched its key after the handshake
+def create_client_context(ca_path: Optional[str] = None) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    if ca_path:
+        context.load_verify_locations(ca_path)
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def check_pinned_key(connection: ssl.SSLSocket, public_key: rsa.RSAPublicKey) -> bool:
+    certificate = connection.getpeercert(binary_form=True)
+    if not certificate: return False
+    peer_key = x509.load_der_x509_certificate(certificate).public_key()
+    key_format = (serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return peer_key.public_bytes(*key_format) == public_key.public_bytes(*key_format)
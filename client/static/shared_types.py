@@ -1,40 +1,54 @@
-from enum import Enum
-from typing import Any, TypedDict, Union
-
-
-class MessageDetails(TypedDict):
-    first_name: str
-    last_name: str
-    date_sent: str
-    body: str
-
-
-class UserDetails(TypedDict):
-    first_name: str
-    last_name: str
-    email: str
-    tutor_group: str
-    password: str
-    option_one: str
-    option_two: str
-    option_three: str
-    option_four: str
-    points: int
-
-
-class QuestionDetails(TypedDict):
-    title: str
-    subject: str
-    description: str
-    expires_date: str
-    second_year_content: bool
-
-
-class QuestionStatistics(TypedDict):
-    recipient_ammount: int
-    recipient_awnsers: int
-
-
-class SocketCommand(TypedDict):
-    command_name: str 
-    arguments: dict[str, Any]
\ No newline at end of file
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, TypedDict, Union
+
+
+class MessageDetails(TypedDict):
+    first_name: str
+    last_name: str
+    date_sent: Union[str, datetime]
+    body: str
+    reply_id: int
+
+
+class UserDetails(TypedDict):
+    first_name: str
+    last_name: str
+    email: str
+    tutor_group: str
+    password: str
+    option_one: str
+    option_two: str
+    option_three: str
+    option_four: str
+    points: int
+
+
+class QuestionDetails(TypedDict):
+    title: str
+    subject: str
+    description: str
+    expires_date: Union[str, date]
+    second_year_content: bool
+
+
+class QuestionStatistics(TypedDict):
+    recipient_ammount: int
+    recipient_awnsers: int
+
+
+class FileDetails(TypedDict):
+    file_name: str
+    file_size: int
+    file_hash: str
+    file_id: int
+
+
+class BaseSocketCommand(TypedDict):
+    command_name: str 
+    arguments: dict[str, Any]
+
+
+# Requests the sender wants to match to their response carry a request id, which the response echoes
+class SocketCommand(BaseSocketCommand, total=False):
+    request_id: int
\ No newline at end of file
@@ -0,0 +1,123 @@
+# Trains the compression dictionary shared by the server and client from encoded command frames.
+# Commands are built with the server's own OutboundCommands, filled in with the subjects and tutor
+# groups from the client's settings, and encoded with every codec a connection can agree on, so
+# the dictionary holds the same bytes the compressor sees. Frames recorded from a running server
+# (one JSON command per line) are used instead when given. Run from the repository root:
+#     python scripts/train_dictionary.py [recorded.jsonl ...]
+import argparse
+import json
+import os
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT, 'server')
+DICTIONARY_PATHS = (
+    os.path.join(ROOT, 'server', 'networking', 'compression_dictionary.bin'),
+    os.path.join(ROOT, 'client', 'networking', 'compression_dictionary.bin')
+)
+DEFAULT_SESSIONS = 200
+TRAINING_SEED = 0
+
+sys.path.insert(0, SERVER_PATH)
+from networking.command_codec import CODECS
+from networking.compression import DEFAULT_DICTIONARY_SIZE, get_dictionary_id, save_dictionary, train_dictionary
+from static.commands import OutboundCommands
+from static.shared_types import UserStates
+
+FIRST_NAMES = ['George', 'Amelia', 'Oliver', 'Isla', 'Harry', 'Ava', 'Noah', 'Mia', 'Leo', 'Freya']
+LAST_NAMES = ['Taylor', 'Jones', 'Smith', 'Brown', 'Williams', 'Wilson', 'Evans', 'Khan', 'Patel', 'Walker']
+TITLES = ['Help with homework', 'Stuck on a past paper question', 'Can someone check my essay plan',
+          'Revision notes for the mock', 'Question about the coursework deadline']
+DESCRIPTIONS = ['Can someone explain this topic, I missed the lesson on it',
+                'I have tried the mark scheme but still do not understand how they got the answer',
+                'Does anyone have notes on this from last year, the textbook chapter is not very clear']
+BODIES = ['thanks that helps', 'have you looked at the revision guide?', 'I can send my notes later',
+          'which page is that on?', 'the answer should be in the second half of the chapter', 'ok']
+FILE_NAMES = ['worksheet.pdf', 'notes.docx', 'past_paper_2023.pdf', 'diagram.png', 'essay_plan.txt']
+
+
+def load_client_settings() -> dict[str, Any]:
+    with open(os.path.join(ROOT, 'client', 'app_settings.json')) as settings_file:
+        return json.load(settings_file)
+
+
+# The commands a user is sent over one session: the batches that load the dashboard when they
+# log in, followed by the chat traffic while they are online
+def sample_session(rng: random.Random, subjects: list[str], tutor_groups: list[str]) -> list[dict]:
+    def name() -> tuple[str, str]: return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    def question() -> dict:
+        return {
+            'title': rng.choice(TITLES), 'subject': rng.choice(subjects), 'description': rng.choice(DESCRIPTIONS),
+            'expires_date': date(2024, 5, 1) + timedelta(days=rng.randrange(60)), 'second_year_content': rng.random() < 0.5
+        }
+    def statistics() -> dict: return {'recipient_ammount': rng.randrange(40), 'recipient_awnsers': rng.randrange(5)}
+    def message() -> dict:
+        return {
+            **dict(zip(('first_name', 'last_name'), name())), 'body': rng.choice(BODIES), 'reply_id': rng.randrange(1, 100_000),
+            'date_sent': datetime(2024, 5, 1, 9) + timedelta(seconds=rng.randrange(5_000_000))
+        }
+    def file_details() -> dict: return {'file_name': rng.choice(FILE_NAMES), 'file_size': rng.randrange(1, 16_777_216), 'file_hash': rng.randbytes(32).hex()}
+
+    first_name, last_name = name()
+    user_details = {
+        'first_name': first_name, 'last_name': last_name, 'email': f'{first_name}.{last_name}@school.org'.lower(),
+        'password': '', 'tutor_group': rng.choice(tutor_groups), 'option_one': rng.choice(subjects),
+        'option_two': rng.choice(subjects), 'option_three': rng.choice(subjects), 'option_four': rng.choice(subjects),
+        'points': rng.randrange(500)
+    }
+    chat_ids = [rng.randrange(1, 10_000) for _ in range(rng.randrange(1, 6))]
+    dashboard = [OutboundCommands.add_pending_question(rng.randrange(1, 10_000), question(), statistics()) for _ in range(rng.randrange(4))]
+    dashboard += [OutboundCommands.add_incoming_question(rng.randrange(1, 10_000), rng.randrange(1, 1_000), *name(), question()) for _ in range(rng.randrange(6))]
+    dashboard += [OutboundCommands.create_new_chat(chat_id, rng.randrange(1, 1_000), *name(), question(), rng.random() < 0.5) for chat_id in chat_ids]
+    dashboard += [OutboundCommands.create_chat_reply(rng.choice(chat_ids), message()) for _ in range(rng.randrange(20))]
+    dashboard += [OutboundCommands.create_chat_file(rng.choice(chat_ids), file_details()) for _ in range(rng.randrange(3))]
+
+    commands = [OutboundCommands.login_response(), OutboundCommands.load_user_details(rng.randrange(1, 1_000), user_details, UserStates.ONLINE.value)]
+    commands.append(OutboundCommands.batch(dashboard))
+    for _ in range(rng.randrange(10)):
+        chat_id = rng.choice(chat_ids)
+        commands.append(OutboundCommands.create_chat_reply(chat_id, message()))
+        commands.append(OutboundCommands.message_ack(chat_id, uuid.UUID(int=rng.getrandbits(128)).hex, rng.randrange(1, 100_000)))
+    commands.append(OutboundCommands.create_manual_user(rng.randrange(1, 1_000), *name(), rng.choice([state.value for state in UserStates])))
+    commands.append(OutboundCommands.update_question_statistics(rng.randrange(1, 10_000), statistics()))
+    return commands
+
+
+def sample_commands(sessions: int = DEFAULT_SESSIONS, seed: int = TRAINING_SEED) -> list[dict]:
+    settings, rng = load_client_settings(), random.Random(seed)
+    return [command for _ in range(sessions) for command in sample_session(rng, settings['options'], settings['tutor_groups'])]
+
+
+def load_recorded_commands(filenames: list[str]) -> list[dict]:
+    commands = []
+    for filename in filenames:
+        with open(filename) as recorded_file:
+            commands += [json.loads(line) for line in recorded_file if line.strip()]
+    return commands
+
+
+# JSON frames go first, so msgpack frames (the codec preferred when both sides have it) end up
+# nearer the end of the dictionary when they are as common
+def encode_frames(commands: list[dict]) -> list[bytes]:
+    return [codec.encode(command) for codec in CODECS.values() for command in commands]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('recorded', nargs='*', help='files of recorded commands, one JSON command per line')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument('--size', type=int, default=DEFAULT_DICTIONARY_SIZE)
+    args = parser.parse_args()
+
+    commands = load_recorded_commands(args.recorded) if args.recorded else sample_commands(args.sessions)
+    dictionary = train_dictionary(encode_frames(commands), args.size)
+    for filename in DICTIONARY_PATHS: save_dictionary(dictionary, filename)
+    print(f'{len(dictionary)} byte dictionary {get_dictionary_id(dictionary)} from {len(commands)} commands ({", ".join(CODECS)})')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,108 @@
-import json
-import logging
-from typing import Any
-
-from _server import Server
-
-
-def load_json(filename: str) -> dict[str, Any]:
-    with open(filename, "r") as file:
-        contents = file.read()
-        return json.loads(contents)
-
-
-def main() -> None:
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s %(levelname)s %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    settings = load_json("C:/Users/George Taylor/Documents/StudyChat/server/settings.json")
-    Server(server_settings=settings['server'], socket_settings=settings['socket'], 
-           database_connector_settings=settings['database_connector'], mail_settings=settings['mail'])
-
-
-if __name__ == "__main__":
-    main()
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from typing import Any, Optional
+
+from _server import Server
+from networking.broker import Broker
+from services.resume_tokens import DEFAULT_RESUME_SECRET_PATH, load_secret
+
+MIN_WORKER_LIFETIME = 10 # Seconds, a worker that exits sooner is restarted after the respawn delay
+RESPAWN_DELAY = 5 # Seconds
+
+
+def load_json(filename: str) -> dict[str, Any]:
+    with open(filename, "r") as file:
+        contents = file.read()
+        return json.loads(contents)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s %(levelname)s %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    settings = load_json("C:/Users/George Taylor/Documents/StudyChat/server/settings.json")
+    workers = settings['socket'].get('workers', 1)
+
+    # Every worker and every restart has to sign resume tokens with the same secret, so unless one is
+    # set it is read from its file (made on the first start) before forking
+    if 'resume_secret' not in settings['server']:
+        settings['server']['resume_secret'] = load_secret(settings['server'].get('resume_secret_path', DEFAULT_RESUME_SECRET_PATH))
+    if workers > 1 and hasattr(os, 'fork'): start_workers(settings, workers)
+    else: start_server(settings)
+
+
+def start_server(settings: dict[str, Any], worker_id: Optional[int] = None) -> None:
+    Server(server_settings=settings['server'], socket_settings=settings['socket'], 
+           database_connector_settings=settings['database_connector'], mail_settings=settings['mail'],
+           worker_id=worker_id)
+
+
+# Forks a worker per core, each with its own listening socket on the same port (SO_REUSEPORT),
+# its own database connection and its own GIL. The broker is forked first into a process of its
+# own, so the parent never starts a thread and every fork (restarts included) is made from a
+# process with only one. The parent replaces any worker that exits with a new one under the same
+# id, and restarts the workers along with the broker as they only link to it when they start.
+# Anything that keeps exiting straight away is only restarted every few seconds. Stopping the
+# parent stops the workers and the broker too
+def start_workers(settings: dict[str, Any], workers: int) -> None:
+    broker = Broker(settings['socket'].get('broker_path'))
+    settings['socket']['broker_path'] = broker.path
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+
+    started: dict[int, tuple[Optional[int], float]] = dict()
+    try:
+        started[fork_broker(broker)] = (None, time.monotonic())
+        for worker_id in range(workers): started[fork_worker(broker, settings, worker_id)] = (worker_id, time.monotonic())
+        while True:
+            pid, status = os.wait()
+            if pid not in started: continue
+            worker_id, start_time = started.pop(pid)
+            name = 'the broker' if worker_id is None else f'worker {worker_id}'
+            logging.warning(f'{name} exited with status {os.waitstatus_to_exitcode(status)}, starting it again')
+            if time.monotonic() - start_time < MIN_WORKER_LIFETIME: time.sleep(RESPAWN_DELAY)
+            if worker_id is not None:
+                started[fork_worker(broker, settings, worker_id)] = (worker_id, time.monotonic())
+                continue
+            for worker_pid in started: os.kill(worker_pid, signal.SIGTERM)
+            started[fork_broker(broker)] = (None, time.monotonic())
+    finally:
+        for pid in started: os.kill(pid, signal.SIGTERM)
+        broker.remove()
+
+
+# The broker accepts on the socket the parent made, which a restarted broker carries on with
+def fork_broker(broker: Broker) -> int:
+    pid = os.fork()
+    if pid: return pid
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        broker.serve_forever()
+    except Exception:
+        logging.exception('broker stopped')
+    finally:
+        os._exit(1)
+
+
+# The worker never returns into the parent's loop, however its server stops
+def fork_worker(broker: Broker, settings: dict[str, Any], worker_id: int) -> int:
+    pid = os.fork()
+    if pid: return pid
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        broker.close()
+        start_server(settings, worker_id)
+    except Exception:
+        logging.exception(f'worker {worker_id} stopped')
+    finally:
+        os._exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,683 +1,1148 @@
-import base64
-import logging
-from datetime import datetime
-from typing import Any, Optional, Union
-
-from database import chats, database_connector, questions, users_table
-from networking.server_socket import ServerSocket, User
-from services.mail import EmailManager
-from static import utils
-from static.commands import InboundCommands, OutboundCommands
-from static.shared_types import (
-    MessageDetails,
-    QuestionDetails,
-    QuestionStatistics,
-    SocketCommand,
-    UserDetails,
-)
-
-SPACE = " "
-EMPTY = ""
-FORMAT = '%Y-%m-%d'
-MESSAGE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
-USER_STATUS_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
-SPECIAL_CHARACTERS = "!@#$%^&*()-+?_=,<>/"
-
-
-# Prevent boiler plate code above most server methods
-def session_active(func):
-    def wrapper(_, user: User, *args, **kwargs):
-        if user.session_active: 
-            return func(_, user, *args, **kwargs)
-        else: return
-    return wrapper
-
-
-class Server:
-    def __init__(self, server_settings: dict[str, Any], socket_settings: dict[str, Any],
-                 database_connector_settings: dict[str, Any], mail_settings: dict[str, Any]) -> None:
-        
-        # Initiate attributes
-        self.settings = server_settings
-        self.file_buffers: dict[int, dict[str, bytes]] = dict()
-
-        # Create the map for the clients commands to their respective methods
-        self.command_map = {
-            InboundCommands.Register.value: self.handle_register_request,
-            InboundCommands.Verify.value: self.handle_verify_request,
-            InboundCommands.Login.value: self.handle_login_request,
-            InboundCommands.AskQuestion.value: self.handle_question_request,
-            InboundCommands.ViewUserProfile.value: self.handle_view_profile_request,
-            InboundCommands.CreateNewChatRequest.value: self.handle_create_chat_request,
-            InboundCommands.SendMessageRequest.value: self.handle_message_request,
-            InboundCommands.DeletePendingQuestionRequest.value: self.handle_delete_pending_question_request,
-            InboundCommands.SendFileRequest.value: self.handle_send_file_request,
-            InboundCommands.SearchForUser.value: self.handle_search_for_user_request,
-            InboundCommands.EndChatAsPublisher.value: self.handle_end_chat_as_publisher_request,
-            InboundCommands.EndChatAsRecipient.value: self.handle_end_chat_as_recipient_request,
-            InboundCommands.DeleteIncomingQuestionRequest.value: self.handle_delete_incoming_question_request
-        }
-
-        # Create the email manager used for sending verification emails
-        self.email_manager = EmailManager(
-            smtp_port=mail_settings['smtp_port'], 
-            smtp_server=mail_settings['smtp_server'], 
-            sender_email=mail_settings['sender_email'],
-            password=mail_settings['password'], 
-            code_pool_size=mail_settings['code_pool_size'],
-            valid_domain=mail_settings['valid_domain']
-        )
-
-        # Create the connection to the mysql database
-        database_connector.DatabaseConnector.init_cursor(
-            settings=database_connector_settings, 
-            cursor_commit=True
-        )
-
-        # Create the server socket to allow connections and data transfer between clients
-        self.server_socket = ServerSocket(
-            server_private_key_path=socket_settings['server_private_key_path'], 
-            client_public_key_path=socket_settings['client_public_key_path'],
-            port=socket_settings['port'], 
-            format=socket_settings['format'], 
-            backlog=socket_settings['backlog'], 
-            header_size=socket_settings['header_size'], 
-            recv_callback=self.recv_command,
-            user_disconnect_callback=self.handle_user_on_disconnect
-        )
-
-
-    def recv_command(self, user: User, command: SocketCommand) -> None:
-        command_name, arguments = command.get("command_name"), command.get("arguments")
-        if command_name and InboundCommands.has_command(command_name):
-            try:
-                self.command_map[command_name](user, **arguments)
-            except (KeyError, TypeError) as err:
-                print(err)
-
-
-    @session_active
-    def handle_send_file_request(self, user: User, chat_id: int, contents: str, file_name: str, file_size: int, end: bool) -> None:
-        if not chats.check_user_in_chat(chat_id, user.user_id): return
-        user_file_buffer = self.file_buffers[user.user_id]
-        users_in_chat = chats.get_users_in_chat(chat_id)
-
-        for user_in_chat in users_in_chat:
-            for online_user in self.server_socket.user_connections.values():
-                if online_user.user_id != user_in_chat[0]: continue
-                command = OutboundCommands.load_file(chat_id, file_name, contents, file_size, end)
-                online_user.send_command(command)
-
-        if end:
-            del user_file_buffer[file_name]
-        else:
-            base64_decoded = base64.b64decode(contents)
-            if not user_file_buffer.get(file_name):
-                user_file_buffer[file_name] = b""
-            user_file_buffer[file_name] += base64_decoded
-
-
-    @session_active
-    def handle_delete_pending_question_request(self, user: User, question_id: int) -> None:
-        # The user cannot delete a question that they have not created
-        if not questions.check_user_published_question(question_id, user.user_id): return
-
-        # Delete incoming questions for users with this question
-        users_with_incoming_question = questions.get_question_recipients(question_id)
-        for user_with_incoming_question in users_with_incoming_question:
-            for online_user in self.server_socket.user_connections.values():
-                if online_user.user_id != user_with_incoming_question[0]: continue
-                delete_incoming_question = OutboundCommands.delete_incoming_question(question_id)
-                online_user.send_command(delete_incoming_question)
-
-
-        # Delete chats for users with this question
-        users_with_question_chat = chats.get_users_from_question(question_id)
-        for user_with_question_chat in users_with_question_chat:
-            for online_user in self.server_socket.user_connections.values():
-                if online_user.user_id != user_with_question_chat[0]: continue
-                delete_question_chat = OutboundCommands.delete_question_chat(user_with_question_chat[1])
-                online_user.send_command(delete_question_chat)
-
-
-        # Delete pending question for the publisher + clean up database
-        delete_pending_question = OutboundCommands.delete_pending_question(question_id)
-        user.send_command(delete_pending_question)
-        chats.delete_question_chats(question_id)
-        questions.delete_question(question_id)
-
-    
-    @session_active
-    def handle_delete_incoming_question_request(self, user: User, question_id: int) -> None:
-        if not questions.check_user_has_question(question_id, user.user_id): return
-        
-        # only need to delete question from requesters inbox
-        questions.delete_question_from_inbox(question_id)
-        command = OutboundCommands.delete_incoming_question(question_id)
-        user.send_command(command)
-
-        publisher_id_result = questions.get_question_publisher(question_id)
-        question_recipients = questions.get_question_recipients(question_id)
-        question_awnsers = questions.get_question_awnsers(question_id)
-        statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
-                                          'recipient_awnsers': question_awnsers[0]}  
-        
-        # update statistics for person who made it
-        update_command = OutboundCommands.update_question_statistics(question_id, statistics)
-        for online_user in self.server_socket.user_connections.values():
-            if online_user.user_id == publisher_id_result[0]: 
-                online_user.send_command(update_command) 
-
-
-    @session_active
-    def handle_end_chat_as_recipient_request(self, user: User, chat_id: int) -> None:
-        delete_chat = OutboundCommands.delete_question_chat(chat_id)
-        if not chats.check_user_in_chat(chat_id, user.user_id): return
-        elif chats.check_user_published_question(chat_id, user.user_id): return
-        
-        recipient_id = int()
-        users_in_chat = chats.get_users_in_chat(chat_id)
-        for user_id in users_in_chat:
-            if not user_id[0] == user.user_id:
-                recipient_id = user_id[0]
-        
-        for online_user in self.server_socket.user_connections.values():
-            if online_user.user_id == recipient_id: 
-                online_user.send_command(delete_chat)
-
-        # tell the recipient to finally delete the chat        
-        user.send_command(delete_chat)
-        chats.delete_chat(chat_id)
-        
-
-    @session_active
-    def handle_end_chat_as_publisher_request(self, user: User, chat_id: int, rating: str) -> None:
-        delete_chat = OutboundCommands.delete_question_chat(chat_id)
-        if not rating.isnumeric(): 
-            user.send_command(OutboundCommands.display_rating_error(
-                chat_id=chat_id, reason='Your rating must be a number')
-            )
-            return
-        elif int(rating) > 5 or int(rating) < 0:
-            user.send_command(OutboundCommands.display_rating_error(
-                chat_id=chat_id, reason='Rating must be between 0 and 5')
-            )
-            return
-        elif not chats.check_user_in_chat(chat_id, user.user_id):
-            user.send_command(OutboundCommands.display_rating_error(
-                chat_id=chat_id, reason='You are no longer part of this chat')
-            )
-            return
-        elif not chats.check_user_published_question(chat_id, user.user_id):
-            user.send_command(OutboundCommands.display_rating_error(
-                chat_id=chat_id, reason='You did not publish this question')
-            )
-            return
-        
-        recipient_id = int()
-        users_in_chat = chats.get_users_in_chat(chat_id)
-        for user_id in users_in_chat:
-            if not user_id[0] == user.user_id:
-                recipient_id = user_id[0]
-
-        for online_user in self.server_socket.user_connections.values():
-            if online_user.user_id == recipient_id: 
-                online_user.send_command(delete_chat)
-
-        user.send_command(delete_chat)
-        chats.delete_chat(chat_id)
-        print(recipient_id)
-        users_table.increment_users_points(recipient_id, int(rating))
-
-
-    @session_active
-    def handle_message_request(self, user: User, chat_id: int, body: str) -> None:
-        # sanity checks first
-        valid_user_in_chat = chats.check_user_in_chat(chat_id, user.user_id)
-        if not valid_user_in_chat or body == EMPTY: return
-        elif len(body) > self.settings['message_max_length']: return 
-
-        chats.add_reply_to_chat(chat_id, user.user_id, body)
-        users_in_chat = chats.get_users_in_chat(chat_id)
-        date_now = datetime.now().strftime(MESSAGE_DATE_FORMAT)
-
-        for user_in_chat in users_in_chat:
-            for online_user in self.server_socket.user_connections.values():
-                if online_user.user_id != user_in_chat[0]: continue
-                command = OutboundCommands.create_chat_reply(chat_id, {
-                    'first_name': user.user_details['first_name'],
-                    'last_name': user.user_details['last_name'],
-                    'date_sent': date_now, 'body': body
-                })
-                online_user.send_command(command)
-                
-
-    @session_active
-    def load_user_messages(self, user: User) -> None:
-        chat_ids = chats.get_users_chat_ids(user.user_id)
-        for chat_id in chat_ids:
-            messages = chats.get_chat_replies(chat_id[0])
-            for message in messages:
-                message_details: MessageDetails = {
-                    'first_name': message[0], 'last_name': message[1],
-                    'date_sent': message[2].strftime("%Y-%m-%d %H:%M:%S"), 
-                    'body': message[3]
-                }
-                user.send_command(
-                    OutboundCommands.create_chat_reply(
-                        chat_id[0], message_details
-                    )
-                )
-
-
-    @session_active
-    def load_user_chats(self, user: User) -> None:
-        chat_details_list = chats.load_user_chats(user.user_id)
-        if chat_details_list:
-            for chat_details in chat_details_list:
-                user_id = chat_details[0]
-                first_name = chat_details[1]
-                last_name = chat_details[2]
-                chat_id = chat_details[3]
-
-                question = chats.get_chat_question(chat_id)
-                has_published = questions.check_user_published_question(
-                    question[0], user.user_id
-                )
-                question_details: QuestionDetails = {
-                    'title': question[1],
-                    'subject': question[2],
-                    'description': question[3],
-                    'expires_date': question[4].strftime(FORMAT),
-                    'second_year_content': question[5]
-                }
-
-                user.send_command(
-                    OutboundCommands.create_new_chat(
-                        chat_id, user_id, first_name, 
-                        last_name, question_details, has_published
-                    )
-                )
-
-
-    @session_active
-    def handle_create_chat_request(self, user: User, user_id: int, question_id: int) -> None:
-        # 1. check if the user is valid to have a conversation with (has asked a question to them)
-        # 2. insert their values into the converstaions table
-        requester_has_question = questions.check_user_has_question(question_id, user.user_id)
-        if not requester_has_question: return
-
-        # get all the details for the question and chats
-        chat_id = chats.create_new_chat(user_one=user.user_id, user_two=user_id, question_id=question_id)
-        first_name, last_name = users_table.get_user_full_name(user_id)
-        question = questions.get_question(question_id)
-        questions.remove_incoming_question(question_id, user.user_id)
-
-        question_details: QuestionDetails = {
-            'title': question[2],
-            'subject': question[3],
-            'description': question[4],
-            'expires_date': question[5].strftime(FORMAT),
-            'second_year_content': question[6]
-        }
-        
-        question_recipients = questions.get_question_recipients(question_id)
-        question_awnsers = questions.get_question_awnsers(question_id)
-        statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
-                                          'recipient_awnsers': question_awnsers[0]}  
-        
-
-        for online_user in self.server_socket.user_connections.values():
-            if not online_user.user_id == user_id: continue
-            online_user.send_command(
-                OutboundCommands.create_new_chat(
-                    chat_id, user.user_id, 
-                    user.user_details['first_name'], 
-                    user.user_details['last_name'], 
-                    question_details, True
-                )
-            )
-
-            # Tell the user to update the info regarding their pending question
-            online_user.send_command(
-                OutboundCommands.update_question_statistics(
-                    question_id=question_id, question_statistics=statistics
-                )
-            )
-
-        # Tell the user to create a new chat
-        user.send_command(
-            OutboundCommands.create_new_chat(
-                chat_id, user_id, first_name, 
-                last_name, question_details, False
-            )
-        )
-        user.send_command(
-            OutboundCommands.delete_incoming_question(
-                question_id=question_id
-            )
-        )
-
-
-    @session_active
-    def handle_view_profile_request(self, user: User, user_id: int) -> None:
-        user_profile = users_table.get_user(user_id)
-        if not user_profile: return
-        user.send_command(
-            OutboundCommands.create_profile_viewer(
-                user_profile[0], user_profile[1]
-            )
-        )
-
-
-    @session_active
-    def handle_search_for_user_request(self, user: User, input: str) -> None:
-        relavent_users = questions.get_users_from_input(input)
-        for relavent_user in relavent_users:
-            user.send_command(OutboundCommands.create_manual_user(
-                user_id=relavent_user[0], first_name=relavent_user[1],
-                last_name=relavent_user[2], user_status=relavent_user[3]
-            ))
-
-
-    @session_active
-    def handle_question_request(self, user: User, manual_recipients: list[int], question_details: QuestionDetails) -> None:
-        empty_feilds = utils.check_for_empty(question_details)
-        if empty_feilds: 
-            user.send_command(OutboundCommands.ask_question_response(
-                accepted=False, reason='No empty fields allowed')
-            )
-            return
-        elif not utils.validate_date(question_details['expires_date']):
-            user.send_command(OutboundCommands.ask_question_response(
-                accepted=False, reason='Date should be in format YYYY-MM-DD')
-            )
-            return   
-        
-        question_id: int = int()
-        statistics: Optional[QuestionStatistics] = None
-
-        # Logic for asking the queston
-        if manual_recipients:
-            question_id = questions.create_question_manual(
-                user_ids=manual_recipients, publisher_id=user.user_id,
-                details=question_details
-            )
-
-            question_recipients = questions.get_question_recipients(question_id)
-            question_awnsers = questions.get_question_awnsers(question_id)
-            statistics = {'recipient_ammount': len(question_recipients), 
-                          'recipient_awnsers': question_awnsers[0]} 
-
-            for user_affected in manual_recipients:
-                if user_affected == user.user_id: continue
-                for online_user in self.server_socket.user_connections.values():
-                    if user_affected != online_user.user_id: continue
-                    online_user.send_command(
-                        OutboundCommands.add_incoming_question(
-                            question_id=question_id,
-                            publisher_id=user.user_id,
-                            first_name=user.user_details['first_name'],
-                            last_name=user.user_details['last_name'],
-                            details=question_details
-                        )
-                    )
-        else: 
-            users_affected, question_id_result = questions.create_question_automatic(
-                publisher_id=user.user_id, details=question_details
-            )
-
-            question_id = question_id_result[0] 
-            question_recipients = questions.get_question_recipients(question_id)
-            question_awnsers = questions.get_question_awnsers(question_id)
-            statistics = {'recipient_ammount': len(question_recipients), 
-                          'recipient_awnsers': question_awnsers[0]} 
-            
-            # send question commands to the users effected
-            for user_affected in users_affected:
-                # prevent sending question to the user who asked it
-                if user_affected[0] == user.user_id: continue
-                for online_user in self.server_socket.user_connections.values():
-                    if user_affected[0] != online_user.user_id: continue
-                    online_user.send_command(
-                        OutboundCommands.add_incoming_question(
-                            question_id=question_id,
-                            publisher_id=user.user_id,
-                            first_name=user.user_details['first_name'],
-                            last_name=user.user_details['last_name'],
-                            details=question_details
-                        )
-                    )
-
-        user.send_command(OutboundCommands.ask_question_response())
-        user.send_command(OutboundCommands.add_pending_question(
-            question_id=question_id,
-            details=question_details, 
-            statistics=statistics)
-        )
-
-
-    @session_active
-    def suggest_question_recipients(self, user: User) -> None:
-        suggested_users = questions.get_suggested_users(user.user_id)
-        for suggested_user in suggested_users:
-            user.send_command(OutboundCommands.create_manual_user(
-                user_id=suggested_user[0], first_name=suggested_user[1],
-                last_name=suggested_user[2], user_status=suggested_user[3]
-            ))
-
-
-    @session_active
-    def load_pending_questions(self, user: User) -> None:
-        pending_questions = questions.get_pending_questions(user.user_id)
-        if not pending_questions: self.__debug(user.address, 'No pending questions'); return 
-        # send all the pending questions back to the user
-        for question in pending_questions:
-            question_details: QuestionDetails = {
-                'title': question[2],
-                'subject': question[3],
-                'description': question[4],
-                'expires_date': question[5].strftime(FORMAT),
-                'second_year_content': question[6]
-            }
-            question_recipients = questions.get_question_recipients(question[0])
-            question_awnsers = questions.get_question_awnsers(question[0])
-            statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
-                                              'recipient_awnsers': question_awnsers[0]} 
-            
-            user.send_command(
-                OutboundCommands.add_pending_question(
-                    question_id=question[0],
-                    details=question_details,
-                    statistics=statistics
-                )
-            )
-
-
-    @session_active
-    def load_incoming_questions(self, user: User) -> None:
-        incoming_questions = questions.get_incoming_questions(user.user_id)
-        if not incoming_questions: self.__debug(user.address, 'No incoming questions'); return 
-        # send all the pending questions back to the user
-        for question in incoming_questions:
-            question_details: QuestionDetails = {
-                'title': question[2],
-                'subject': question[3],
-                'description': question[4],
-                'expires_date': question[5].strftime(FORMAT),
-                'second_year_content': question[6]
-            }
-            publisher_full_name = users_table.get_user_full_name(question[1])
-            user.send_command(
-                OutboundCommands.add_incoming_question(
-                    question_id=question[0],
-                    publisher_id=question[1],
-                    first_name=publisher_full_name[0],
-                    last_name=publisher_full_name[1],
-                    details=question_details
-                )
-            )
-
-
-    def handle_user_on_disconnect(self, user: User) -> None:
-        date_now = datetime.now().strftime(USER_STATUS_DATE_FORMAT)
-        users_table.update_user_status(user.user_id, f'Last seen {date_now}')
-
-    
-    def handle_user_on_start(self, user: User, new_user: bool) -> None:
-        user.send_command(
-            OutboundCommands.load_user_details(
-                user.user_id, user.user_details, user.user_status
-            )
-        )
-        users_table.update_user_status(user.user_id, 'Online')
-        self.file_buffers[user.user_id] = {}
-
-        # Check if user is new
-        if not new_user:
-            self.load_pending_questions(user)
-            self.load_user_chats(user)
-            self.load_user_messages(user)
-        else:
-            # Give the user some questions if there is any
-            questions.generate_questions(user.user_id)
-
-        self.load_incoming_questions(user)
-        self.suggest_question_recipients(user)
-
-
-    def handle_login_request(self, user: User, email: str, password: str) -> None:
-        # sanity checks for login
-        if email == EMPTY or password == EMPTY:
-            user.send_command(OutboundCommands.login_response(
-                accepted=False, reason='Entry feilds cannot be empty')
-            )
-            return
-        elif SPACE in email or SPACE in password:
-            user.send_command(OutboundCommands.login_response(
-                accepted=False, reason='Entry feilds cannot have spaces')
-            )
-            return
-        elif not users_table.check_email_exists(email):
-            user.send_command(OutboundCommands.login_response(
-                accepted=False, reason='That email does not exist')
-            )
-            return
-        elif not users_table.login_user(email, password):
-            user.send_command(OutboundCommands.login_response(
-                accepted=False, reason="That password does not match")
-            )
-            return
-        else:
-            # User has logged on
-            user_id_result = users_table.get_user_id(email)
-            user_profile = users_table.get_user(user_id_result[0])
-            if not user_profile: return
-
-            user.activate_user(user_id_result[0], user_profile[0])
-            user.send_command(OutboundCommands.login_response())
-            self.handle_user_on_start(user=user, new_user=False)
-            self.__debug(user.address, 'User has logged in')
-
-
-    def handle_verify_request(self, user: User, code: str) -> None:
-        if not code.isdigit():
-            user.send_command(OutboundCommands.verify_response(
-                accepted=False, reason='Codes must be a four digit value')
-            )
-            return
-        elif SPACE in code or code == EMPTY:
-            user.send_command(OutboundCommands.verify_response(
-                accepted=False, reason='Codes cannot be empty or contain spaces')
-            )
-            return
-        elif not self.email_manager.check_verification_code(user.address, code):
-            user.send_command(OutboundCommands.verify_response(
-                accepted=False, reason='That code is invalid')
-            )
-            return
-        else:
-            # User has verified successfully
-            if not user.cached_user_details: return
-            users_table.register_user(user.cached_user_details)
-            user_id_result = users_table.get_user_id(user.cached_user_details['email'])
-            user.activate_user(user_id_result[0], user.cached_user_details)
-
-            # send commands back to the client
-            user.send_command(OutboundCommands.verify_response())
-            self.handle_user_on_start(user=user, new_user=True)
-            self.__debug(user.address, 'User has now been verified')
-
-
-    def handle_register_request(self, user: User, user_details: UserDetails) -> None:
-        # First check if there is any whitespace in the entrys apart from the#
-        user_options_list = [
-            user_details['option_one'], 
-            user_details['option_two'],
-            user_details['option_three'], 
-            user_details['option_four']
-        ]
-        whitespace = utils.check_for_whitespace(items=user_details)
-        empty = utils.check_for_empty(items=user_details)
-
-        if whitespace or empty: user.send_command(
-            OutboundCommands.register_response(
-                accepted=False, reason='No whitespace or empty fields allowed')
-            ); return
-
-        if len(user_details['first_name']) > 25:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That first name is too large (max 25 characters)')
-            )
-            return 
-        elif len(user_details['last_name']) > 25:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That last name is too large (max 25 characters)')
-            )
-            return 
-        elif not user_details["tutor_group"] in self.settings['tutor_groups']:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That tutor group is invalid')
-            )
-            return 
-        elif not self.email_manager.validate_email(user_details["email"]):
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That email is invalid')
-            )
-            return 
-        elif users_table.check_email_exists(user_details["email"]):
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That email is already in use')
-            )
-            return 
-        elif len(user_details['password']) < 8:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='That password is too short (min 8 characters)')
-            )
-            return
-        elif [x for x in user_options_list if x not in self.settings['options']]:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='An option provided is invalid')
-            )
-            return 
-        elif len([x for x in user_options_list if x == 'None']) > 3:
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='You must have at least one option')
-            )
-            return     
-        elif utils.check_for_duplicates(user_options_list, exception='None'):
-            user.send_command(OutboundCommands.register_response(
-                accepted=False, reason='You cannot study the same option multiple times')
-            )
-            return 
-    
-        # passed registration checks
-        user.cache_user_details(user_details)
-        code = self.email_manager.init_verification_code(user.address)
-        self.email_manager.send_verification_email(user_details["email"], str(code))
-        user.send_command((OutboundCommands.register_response()))
-        self.__debug(user.address, f'Verification code sent ({code})')
-
-
-    def __debug(self, user_address: tuple, message: str) -> None:
-        logging.debug(f"[server] handling user [{user_address}]: {message}")
+import base64
+import binascii
+import logging
+import mmap
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Optional, Union
+
+from database import chats, database_connector, questions, users_table
+from networking.async_server_socket import AsyncServerSocket
+from networking.binary_frames import DEFAULT_FILE_CHUNK_SIZE, DEFAULT_STREAM_WINDOW
+from networking.broker import BrokerClient
+from networking.compression import DEFAULT_COMPRESSION_THRESHOLD
+from networking.connection_sweeper import DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_IDLE_TIMEOUT
+from networking.crypto_pool import DEFAULT_CRYPTO_BATCH_SIZE, DEFAULT_CRYPTO_WORKERS
+from networking.fanout import Fanout
+from networking.framing import DEFAULT_MAX_FRAME_SIZE
+from networking.send_queue import (
+    DEFAULT_BLOCK_TIMEOUT,
+    DEFAULT_COALESCE_DELAY,
+    DEFAULT_OUTPUT_BUDGET,
+    DEFAULT_SEND_QUEUE_SIZE,
+    DEFAULT_SLOW_CONSUMER_POLICY,
+)
+from networking.server_socket import ServerSocket, User
+from networking.tls import DEFAULT_TLS_CERTIFICATE_PATH
+from services.blob_store import DEFAULT_BLOB_STORE_PATH, BlobStore, is_file_hash
+from services.dispatcher import DEFAULT_DISPATCH_WORKERS, DEFAULT_MAX_PENDING_COMMANDS, Dispatcher
+from services.file_transfers import (
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_MAX_UPLOAD_BYTES,
+    DEFAULT_MAX_USER_UPLOAD_BYTES,
+    DEFAULT_SPOOL_SIZE,
+    DEFAULT_TRANSFER_TIMEOUT,
+    FileTransfer,
+    FileTransfers,
+)
+from services.mail import EmailManager
+from services.message_ids import DEFAULT_MAX_MESSAGE_IDS, RecentMessageIds
+from services.rate_limiter import DEFAULT_MAX_BUCKETS, RateLimiter, get_rate_limit_key
+from services.resume_tokens import DEFAULT_RESUME_TOKEN_TTL, ResumeTokens
+from static import utils
+from static.commands import InboundCommands, OutboundCommands, current_request_id, with_request_id
+from static.shared_types import (
+    FileDetails,
+    MessageDetails,
+    QuestionDetails,
+    QuestionStatistics,
+    SocketCommand,
+    UserDetails,
+)
+
+SPACE = " "
+EMPTY = ""
+USER_STATUS_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+SPECIAL_CHARACTERS = "!@#$%^&*()-+?_=,<>/"
+DEFAULT_BATCH_SIZE = 250 # Commands per batch frame
+LEGACY_FILE_CHUNK_SIZE = 200 # Bytes per load-file command for clients without binary frames
+DEFAULT_MAX_LEGACY_FILE_SIZE = 65_536 # Bytes, larger files are not pushed to clients without binary frames
+MAX_CLIENT_MESSAGE_ID_LENGTH = 32
+FILE_CHUNK = 'file-chunk' # Name file data is dispatched under
+DISCONNECT = 'disconnect'
+DEFAULT_DOWNLOAD_WORKERS = 4 # Threads streaming downloads when handlers run on the dispatcher
+
+
+# Prevent boiler plate code above most server methods
+def session_active(func):
+    def wrapper(_, user: User, *args, **kwargs):
+        if user.session_active: 
+            return func(_, user, *args, **kwargs)
+        else: return
+    return wrapper
+
+
+class Server:
+    def __init__(self, server_settings: dict[str, Any], socket_settings: dict[str, Any],
+                 database_connector_settings: dict[str, Any], mail_settings: dict[str, Any],
+                 worker_id: Optional[int] = None) -> None:
+        
+        # Initiate attributes
+        self.settings = server_settings
+        self.blob_store = BlobStore(server_settings.get('blob_store_path', DEFAULT_BLOB_STORE_PATH))
+        self.file_transfers = FileTransfers(
+            timeout=server_settings.get('file_transfer_timeout', DEFAULT_TRANSFER_TIMEOUT),
+            spool_size=server_settings.get('upload_spool_size', DEFAULT_SPOOL_SIZE),
+            max_user_bytes=server_settings.get('max_user_upload_bytes', DEFAULT_MAX_USER_UPLOAD_BYTES),
+            max_bytes=server_settings.get('max_upload_bytes', DEFAULT_MAX_UPLOAD_BYTES),
+            temp_path=self.blob_store.temp_path
+        )
+
+        # Messages sent again after a reconnect are acknowledged without being stored twice
+        self.recent_message_ids = RecentMessageIds(server_settings.get('max_recent_message_ids', DEFAULT_MAX_MESSAGE_IDS))
+
+        # Create the map for the clients commands to their respective methods
+        self.command_map = {
+            InboundCommands.Register.value: self.handle_register_request,
+            InboundCommands.Verify.value: self.handle_verify_request,
+            InboundCommands.Login.value: self.handle_login_request,
+            InboundCommands.AskQuestion.value: self.handle_question_request,
+            InboundCommands.ViewUserProfile.value: self.handle_view_profile_request,
+            InboundCommands.CreateNewChatRequest.value: self.handle_create_chat_request,
+            InboundCommands.SendMessageRequest.value: self.handle_message_request,
+            InboundCommands.DeletePendingQuestionRequest.value: self.handle_delete_pending_question_request,
+            InboundCommands.SendFileRequest.value: self.handle_send_file_request,
+            InboundCommands.SearchForUser.value: self.handle_search_for_user_request,
+            InboundCommands.EndChatAsPublisher.value: self.handle_end_chat_as_publisher_request,
+            InboundCommands.EndChatAsRecipient.value: self.handle_end_chat_as_recipient_request,
+            InboundCommands.DeleteIncomingQuestionRequest.value: self.handle_delete_incoming_question_request,
+            InboundCommands.Resume.value: self.handle_resume_request,
+            InboundCommands.FileBegin.value: self.handle_file_begin_request,
+            InboundCommands.FileEnd.value: self.handle_file_end_request,
+            InboundCommands.FileDownloadRequest.value: self.handle_file_download_request,
+            InboundCommands.AckReplies.value: self.handle_ack_replies_request,
+            InboundCommands.SignOut.value: self.handle_sign_out_request
+        }
+
+        # Create the email manager used for sending verification emails
+        self.email_manager = EmailManager(
+            smtp_port=mail_settings['smtp_port'], 
+            smtp_server=mail_settings['smtp_server'], 
+            sender_email=mail_settings['sender_email'],
+            password=mail_settings['password'], 
+            code_pool_size=mail_settings['code_pool_size'],
+            valid_domain=mail_settings['valid_domain']
+        )
+
+        # Create the connection to the mysql database
+        database_connector.DatabaseConnector.init_cursor(
+            settings=database_connector_settings, 
+            cursor_commit=True
+        )
+
+        # Handlers run on a fixed pool of workers so a slow one never stops a connection being read.
+        # Each worker opens its own database connection so they can query at the same time
+        self.dispatcher: Optional[Dispatcher] = None
+        self.download_pool: Optional[ThreadPoolExecutor] = None
+        dispatch_workers = server_settings.get('dispatch_workers', DEFAULT_DISPATCH_WORKERS)
+        if dispatch_workers:
+            self.dispatcher = Dispatcher(
+                workers=dispatch_workers,
+                max_pending=server_settings.get('max_pending_commands', DEFAULT_MAX_PENDING_COMMANDS),
+                initializer=database_connector.DatabaseConnector.init_thread_cursor
+            )
+            self.download_pool = ThreadPoolExecutor(
+                max_workers=server_settings.get('download_workers', DEFAULT_DOWNLOAD_WORKERS),
+                thread_name_prefix='download'
+            )
+
+        # Limits how often each kind of command can be sent, per user or per address before login
+        self.rate_limiter = RateLimiter(
+            limits=server_settings.get('rate_limits', {}),
+            command_classes=server_settings.get('rate_limit_classes', {}),
+            max_buckets=server_settings.get('rate_limit_max_buckets', DEFAULT_MAX_BUCKETS)
+        )
+
+        # Signs the tokens clients use to resume their session after reconnecting
+        self.resume_tokens = ResumeTokens(
+            secret=server_settings['resume_secret'],
+            ttl=server_settings.get('resume_token_ttl', DEFAULT_RESUME_TOKEN_TTL)
+        )
+
+        # When running as one of several worker processes, users connected to the other
+        # workers are reached through the broker in the parent process
+        self.broker: Optional[BrokerClient] = None
+        if worker_id is not None:
+            self.broker = BrokerClient(
+                path=socket_settings['broker_path'],
+                worker_id=worker_id, deliver_callback=self.deliver_to_users
+            )
+            self.broker.start()
+
+        # Create the server socket to allow connections and data transfer between clients,
+        # the asyncio backend serves every connection from one event loop instead of a thread each
+        socket_backend = AsyncServerSocket if socket_settings.get('backend') == 'asyncio' else ServerSocket
+        self.server_socket = socket_backend(
+            server_private_key_path=socket_settings['server_private_key_path'], 
+            client_public_key_path=socket_settings['client_public_key_path'],
+            port=socket_settings['port'], 
+            format=socket_settings['format'], 
+            backlog=socket_settings['backlog'], 
+            header_size=socket_settings['header_size'], 
+            recv_callback=self.recv_command,
+            binary_callback=self.recv_file_chunk,
+            user_disconnect_callback=self.recv_user_disconnect,
+            max_frame_size=socket_settings.get('max_frame_size', DEFAULT_MAX_FRAME_SIZE),
+            send_queue_size=socket_settings.get('send_queue_size', DEFAULT_SEND_QUEUE_SIZE),
+            coalesce_delay=socket_settings.get('coalesce_delay', DEFAULT_COALESCE_DELAY),
+            compression_threshold=socket_settings.get('compression_threshold', DEFAULT_COMPRESSION_THRESHOLD),
+            reuse_port=worker_id is not None,
+            heartbeat_interval=socket_settings.get('heartbeat_interval', DEFAULT_HEARTBEAT_INTERVAL),
+            idle_timeout=socket_settings.get('idle_timeout', DEFAULT_IDLE_TIMEOUT),
+            output_budget=socket_settings.get('output_budget', DEFAULT_OUTPUT_BUDGET),
+            slow_consumer_policy=socket_settings.get('slow_consumer_policy', DEFAULT_SLOW_CONSUMER_POLICY),
+            block_timeout=socket_settings.get('block_timeout', DEFAULT_BLOCK_TIMEOUT),
+            crypto_workers=socket_settings.get('crypto_workers', DEFAULT_CRYPTO_WORKERS),
+            crypto_batch_size=socket_settings.get('crypto_batch_size', DEFAULT_CRYPTO_BATCH_SIZE),
+            tls=socket_settings.get('tls', False),
+            tls_certificate_path=socket_settings.get('tls_certificate_path', DEFAULT_TLS_CERTIFICATE_PATH),
+            tls_private_key_path=socket_settings.get('tls_private_key_path')
+        )
+        self.server_socket.serve_forever()
+
+
+    def recv_command(self, user: User, command: SocketCommand) -> None:
+        command_name = command.get("command_name")
+        if not command_name or not InboundCommands.has_command(command_name): return
+        self.dispatch(user, command_name, self.run_command, user, command)
+
+
+    # File data has to stay in order with the file-begin that opened its transfer. Over TLS the
+    # chunk points into the connection's read buffer, which is reused once this returns
+    def recv_file_chunk(self, user: User, transfer_id: int, offset: int, data: memoryview) -> None:
+        if self.dispatcher and not isinstance(data.obj, bytes): data = memoryview(bytes(data))
+        self.dispatch(user, FILE_CHUNK, self.handle_file_chunk, user, transfer_id, offset, data)
+
+
+    # Runs after the commands the connection sent before it closed. The asyncio backend calls
+    # this from its event loop, so it never waits for room
+    def recv_user_disconnect(self, user: User) -> None:
+        self.dispatch(user, DISCONNECT, self.handle_user_on_disconnect, user, block=False)
+
+
+    # Commands are sharded by user once logged in and by address before that
+    def dispatch(self, user: User, name: str, function: Any, *args: Any, block: bool = True) -> None:
+        if not self.dispatcher: function(*args); return
+        key = user.user_id if user.session_active else user.address
+        self.dispatcher.submit(user, key, name, function, *args, block=block)
+
+
+    def run_command(self, user: User, command: SocketCommand) -> None:
+        command_name, arguments = command.get("command_name"), command.get("arguments")
+        if command_name and InboundCommands.has_command(command_name):
+            request_id = current_request_id.set(command.get("request_id"))
+            try:
+                retry_after = self.rate_limiter.acquire(command_name, get_rate_limit_key(user))
+                if retry_after:
+                    user.send_command(OutboundCommands.rate_limited(command_name, round(retry_after, 2)))
+                    return
+                self.command_map[command_name](user, **arguments)
+            except (KeyError, TypeError, ValueError, AttributeError) as err:
+                print(err)
+            finally:
+                current_request_id.reset(request_id)
+
+
+    # Sends many commands as a few batch frames instead of a frame each, for clients that can read them.
+    # When the batches are the response to a request the last one carries its id, and an empty
+    # batch is sent if there is nothing else so the request is always answered
+    def send_batch(self, user: User, commands: list[SocketCommand], response: bool = False) -> None:
+        if not user.capabilities.batching:
+            for command in commands: user.send_command(command)
+            return
+        batch_size = self.settings.get('batch_size', DEFAULT_BATCH_SIZE)
+        for index in range(0, len(commands), batch_size):
+            batch = OutboundCommands.batch(commands[index:index+batch_size])
+            user.send_command(with_request_id(batch) if response and index + batch_size >= len(commands) else batch)
+        if response and not commands: user.send_command(with_request_id(OutboundCommands.batch([])))
+
+
+    # Sends a command to every device the user is logged in on, if they are online
+    # The file hash points at a blob that older clients are sent in full, as they cannot download
+    # files when they are opened. Workers share the blob store, so only the hash goes through the broker
+    def send_to_user(self, user_id: int, command: SocketCommand, file_hash: Optional[str] = None) -> None:
+        self.send_to_users([user_id], command, file_hash)
+
+
+    # The same command for many users is encoded once and every connection is sent the same frame,
+    # see Fanout for what still has to be done per connection. Users on other workers are published
+    # in one message, which each of those workers delivers through a fanout of its own
+    def send_to_users(self, user_ids: Iterable[int], command: SocketCommand, file_hash: Optional[str] = None) -> None:
+        fanout = Fanout(command)
+        remote_user_ids = []
+        for user_id in user_ids:
+            self.deliver_to_user(user_id, fanout, file_hash)
+            if self.broker and self.broker.is_online(user_id): remote_user_ids.append(user_id)
+        if remote_user_ids: self.broker.publish(remote_user_ids, command, file_hash)
+
+
+    # Commands published by the other workers for users connected to this one
+    def deliver_to_users(self, user_ids: Iterable[int], command: SocketCommand, file_hash: Optional[str] = None) -> None:
+        fanout = Fanout(command)
+        for user_id in user_ids: self.deliver_to_user(user_id, fanout, file_hash)
+
+
+    # Only the devices connected to this process
+    def deliver_to_user(self, user_id: int, command: Union[SocketCommand, Fanout], file_hash: Optional[str] = None) -> None:
+        legacy_users = []
+        for online_user in self.server_socket.connections.get_user_connections(user_id):
+            if file_hash and not online_user.capabilities.file_transfer: legacy_users.append(online_user)
+            else: online_user.send_command(command)
+
+        if not legacy_users: return
+        arguments = command.command['arguments'] if isinstance(command, Fanout) else command['arguments']
+        if arguments['file_details']['file_size'] > self.settings.get('max_legacy_file_size', DEFAULT_MAX_LEGACY_FILE_SIZE):
+            for legacy_user in legacy_users: self.send_legacy_file_notice(legacy_user, arguments)
+            return
+        with self.blob_store.map(file_hash) as contents:
+            for legacy_user in legacy_users: self.send_legacy_file(legacy_user, arguments, contents)
+
+
+    # Every chunk costs an RSA operation and a frame in the client's send queue, so large files
+    # would take thousands of each and push the client over its output budget. Old clients are
+    # told in the chat instead, through the only command they have that shows a message there
+    def send_legacy_file_notice(self, user: User, arguments: dict[str, Any]) -> None:
+        reason = f"{arguments['file_details']['file_name']} is too large for this version of StudyChat, update to open it"
+        user.send_command(OutboundCommands.display_rating_error(arguments['chat_id'], reason))
+
+
+    def send_legacy_file(self, user: User, arguments: dict[str, Any], contents: Union[bytes, mmap.mmap]) -> None:
+        chat_id, file_name = arguments['chat_id'], arguments['file_details']['file_name']
+        for offset in range(0, len(contents), LEGACY_FILE_CHUNK_SIZE):
+            chunk = base64.b64encode(contents[offset:offset+LEGACY_FILE_CHUNK_SIZE]).decode()
+            user.send_command(OutboundCommands.load_file(chat_id, file_name, chunk, len(contents), False))
+        user.send_command(OutboundCommands.load_file(chat_id, file_name, EMPTY, len(contents), True))
+
+
+    def is_user_online(self, user_id: int) -> bool:
+        if self.server_socket.connections.is_online(user_id): return True
+        return bool(self.broker and self.broker.is_online(user_id))
+
+
+    # How far behind this process's clients are as a whole, and how often the slow consumer policy has fired
+    def get_send_metrics(self) -> dict[str, int]:
+        return {**self.server_socket.queue_metrics.snapshot(), **self.server_socket.backpressure_counters.snapshot()}
+
+
+    # Old clients send base64 chunks without a hash, so their upload is found by its name and
+    # hashed as it arrives. Once it is complete it is stored and announced like any other upload
+    @session_active
+    def handle_send_file_request(self, user: User, chat_id: int, contents: str, file_name: str, file_size: int, end: bool) -> None:
+        if not chats.check_user_in_chat(chat_id, user.user_id): return
+        if not 0 < file_size <= self.settings.get('max_file_size', DEFAULT_MAX_FILE_SIZE): return
+        transfer = self.file_transfers.begin(user.user_id, chat_id, file_name, file_size, EMPTY)
+        if not transfer: self.__debug(user.address, f'Upload of {file_name} refused, the upload quota is full'); return
+
+        if not end:
+            try: data = base64.b64decode(contents, validate=True)
+            except binascii.Error: data = None
+            if data is None or not transfer.write(transfer.received, data):
+                self.file_transfers.cancel(transfer)
+                self.__debug(user.address, f'Upload of {file_name} abandoned, a chunk did not fit')
+            return
+
+        if transfer.received < transfer.file_size:
+            self.file_transfers.cancel(transfer)
+            self.__debug(user.address, f'Upload of {file_name} abandoned, it ended early'); return
+        if self.file_transfers.finish(transfer): self.complete_upload(user, transfer, transfer.hexdigest)
+
+
+    # Checked once for the whole file, the chunks that follow are only matched to the transfer.
+    # If the same file was already partly uploaded the client is told to carry on from there
+    @session_active
+    def handle_file_begin_request(self, user: User, chat_id: int, file_name: str, file_size: int, file_hash: str) -> None:
+        max_file_size = self.settings.get('max_file_size', DEFAULT_MAX_FILE_SIZE)
+        reason = EMPTY
+        if not chats.check_user_in_chat(chat_id, user.user_id): reason = 'You are not in that chat'
+        elif not file_name or SPACE in file_name or os.path.basename(file_name) != file_name: reason = 'That file name is not allowed'
+        elif not 0 < file_size <= max_file_size: reason = f'Files must be under {max_file_size // 1_048_576} MB'
+        elif not isinstance(file_hash, str) or not is_file_hash(file_hash.lower()): reason = 'That file hash is not valid'
+
+        if reason:
+            user.send_command(OutboundCommands.file_begin_response(chat_id, file_hash, accepted=False, reason=reason))
+            return
+
+        transfer = self.file_transfers.begin(user.user_id, chat_id, file_name, file_size, file_hash.lower())
+        if not transfer:
+            reason = 'Too many files are uploading, try again later'
+            user.send_command(OutboundCommands.file_begin_response(chat_id, file_hash, accepted=False, reason=reason))
+            return
+        # A fresh window is given every time, the client starts counting again from this response
+        window = self.settings.get('stream_window', DEFAULT_STREAM_WINDOW) if user.capabilities.flow_control else 0
+        transfer.unacknowledged = 0
+        user.send_command(OutboundCommands.file_begin_response(
+            chat_id, file_hash, transfer.transfer_id, transfer.received, window=window
+        ))
+
+
+    # Called by the socket for every binary frame, chunks that do not follow on are ignored
+    # and the client finds out where to restart from by beginning the transfer again
+    def handle_file_chunk(self, user: User, transfer_id: int, offset: int, data: memoryview) -> None:
+        if not user.session_active: return
+        transfer = self.file_transfers.get(transfer_id, user.user_id)
+        if not transfer: return
+        if not transfer.write(offset, data): self.__debug(user.address, f'Chunk at {offset} ignored, expected {transfer.received}'); return
+        if not user.capabilities.flow_control: return
+
+        increment = transfer.release_window(self.settings.get('stream_window', DEFAULT_STREAM_WINDOW))
+        if increment: user.send_command(OutboundCommands.file_window(transfer_id, increment))
+
+
+    @session_active
+    def handle_file_end_request(self, user: User, transfer_id: int) -> None:
+        transfer = self.file_transfers.get(transfer_id, user.user_id)
+        if not transfer or transfer.received < transfer.file_size or not self.file_transfers.finish(transfer): return
+        self.complete_upload(user, transfer, transfer.file_hash)
+
+
+    # Only the details of a finished upload go to the chat. Clients download it when it is opened
+    # and old clients are sent it in full, see deliver_to_user
+    def complete_upload(self, user: User, transfer: FileTransfer, file_hash: str) -> None:
+        try:
+            if not transfer.is_complete(): self.__debug(user.address, 'File did not match its hash'); return
+            file_id = self.store_file(user, transfer.chat_id, transfer.file_name, file_hash, transfer.file_size, transfer.read_contents())
+        finally:
+            transfer.close()
+
+        file_details: FileDetails = {
+            'file_name': transfer.file_name, 'file_size': transfer.file_size, 'file_hash': file_hash, 'file_id': file_id
+        }
+        command = OutboundCommands.create_chat_file(transfer.chat_id, file_details)
+        self.send_to_users([user_in_chat[0] for user_in_chat in chats.get_users_in_chat(transfer.chat_id)], command, file_hash)
+
+
+    # Sends the bytes from offset up to offset + length (or the end of the file when the length is
+    # zero), so an interrupted download only has to ask for what it is missing. The request is
+    # checked in order with the user's other commands. Streaming waits on the client for as long
+    # as the download takes, so with the dispatcher it runs on a download thread instead of holding
+    # up the user's worker. Its frames go in the bulk lane, which commands overtake anyway
+    @session_active
+    def handle_file_download_request(self, user: User, chat_id: int, file_hash: str, offset: int = 0, length: int = 0) -> None:
+        if not user.capabilities.file_transfer or not chats.check_user_in_chat(chat_id, user.user_id): return
+        chat_file = chats.get_chat_file(chat_id, file_hash)
+        if not chat_file: return
+
+        file_name, file_size = chat_file
+        offset = min(max(offset, 0), file_size)
+        end = min(offset + length, file_size) if length > 0 else file_size
+        if self.download_pool: self.download_pool.submit(self.stream_file, user, chat_id, file_name, file_size, file_hash, offset, end)
+        else: self.stream_file(user, chat_id, file_name, file_size, file_hash, offset, end)
+
+
+    def stream_file(self, user: User, chat_id: int, file_name: str, file_size: int, file_hash: str, offset: int, end: int) -> None:
+        chunk_size = self.settings.get('file_chunk_size', DEFAULT_FILE_CHUNK_SIZE)
+        transfer_id = secrets.randbits(32)
+
+        try:
+            # Chunks are views of the map, slicing it would copy each one
+            with self.blob_store.map(file_hash) as contents, memoryview(contents) as view:
+                user.send_command(OutboundCommands.file_begin(transfer_id, chat_id, file_name, file_size, file_hash, offset))
+                for chunk_offset in range(offset, end, chunk_size):
+                    if not user.send_binary(transfer_id, chunk_offset, view[chunk_offset:min(chunk_offset + chunk_size, end)]): return
+        except FileNotFoundError:
+            self.__debug(user.address, f'File {file_hash} is missing from the blob store'); return
+        user.send_command(OutboundCommands.file_end(transfer_id))
+
+
+    # Identical files are only written to disk once, every chat they are sent to gets its own row
+    def store_file(self, user: User, chat_id: int, file_name: str, file_hash: str, file_size: int, contents: BinaryIO) -> int:
+        with self.blob_store.lock(file_hash):
+            if not self.blob_store.put(file_hash, contents): self.__debug(user.address, f'File {file_hash} is already stored')
+            return chats.add_file_to_chat(chat_id, user.user_id, file_name, file_hash, file_size, datetime.now().replace(microsecond=0))
+
+
+    # Blobs are only removed once no chat refers to them any more. The check and the delete are
+    # made under the blob's lock, so a chat the same file is being stored in cannot lose it
+    def release_files(self, file_hashes: list[tuple]) -> None:
+        for file_hash in file_hashes:
+            with self.blob_store.lock(file_hash[0]):
+                if not chats.check_file_referenced(file_hash[0]): self.blob_store.delete(file_hash[0])
+
+
+    @session_active
+    def handle_delete_pending_question_request(self, user: User, question_id: int) -> None:
+        # The user cannot delete a question that they have not created
+        if not questions.check_user_published_question(question_id, user.user_id): return
+
+        # Delete incoming questions for users with this question
+        users_with_incoming_question = questions.get_question_recipients(question_id)
+        delete_incoming_question = OutboundCommands.delete_incoming_question(question_id)
+        self.send_to_users([user_with_incoming_question[0] for user_with_incoming_question in users_with_incoming_question],
+                           delete_incoming_question)
+
+
+        # Delete chats for users with this question
+        users_with_question_chat = chats.get_users_from_question(question_id)
+        for user_with_question_chat in users_with_question_chat:
+            delete_question_chat = OutboundCommands.delete_question_chat(user_with_question_chat[1])
+            self.send_to_user(user_with_question_chat[0], delete_question_chat)
+
+
+        # Delete pending question for the publisher + clean up database
+        delete_pending_question = OutboundCommands.delete_pending_question(question_id)
+        user.send_command(delete_pending_question)
+        file_hashes = chats.get_question_chat_file_hashes(question_id)
+        chats.delete_question_chats(question_id)
+        questions.delete_question(question_id)
+        self.release_files(file_hashes)
+
+    
+    @session_active
+    def handle_delete_incoming_question_request(self, user: User, question_id: int) -> None:
+        if not questions.check_user_has_question(question_id, user.user_id): return
+        
+        # only need to delete question from requesters inbox
+        questions.delete_question_from_inbox(question_id)
+        command = OutboundCommands.delete_incoming_question(question_id)
+        user.send_command(command)
+
+        publisher_id_result = questions.get_question_publisher(question_id)
+        question_recipients = questions.get_question_recipients(question_id)
+        question_awnsers = questions.get_question_awnsers(question_id)
+        statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
+                                          'recipient_awnsers': question_awnsers[0]}  
+        
+        # update statistics for person who made it
+        update_command = OutboundCommands.update_question_statistics(question_id, statistics)
+        self.send_to_user(publisher_id_result[0], update_command)
+
+
+    @session_active
+    def handle_end_chat_as_recipient_request(self, user: User, chat_id: int) -> None:
+        delete_chat = OutboundCommands.delete_question_chat(chat_id)
+        if not chats.check_user_in_chat(chat_id, user.user_id): return
+        elif chats.check_user_published_question(chat_id, user.user_id): return
+        
+        recipient_id = int()
+        users_in_chat = chats.get_users_in_chat(chat_id)
+        for user_id in users_in_chat:
+            if not user_id[0] == user.user_id:
+                recipient_id = user_id[0]
+        
+        self.send_to_user(recipient_id, delete_chat)
+
+        # tell the recipient to finally delete the chat        
+        user.send_command(delete_chat)
+        file_hashes = chats.get_chat_file_hashes(chat_id)
+        chats.delete_chat(chat_id)
+        self.release_files(file_hashes)
+        
+
+    @session_active
+    def handle_end_chat_as_publisher_request(self, user: User, chat_id: int, rating: str) -> None:
+        delete_chat = OutboundCommands.delete_question_chat(chat_id)
+        if not rating.isnumeric(): 
+            user.send_command(OutboundCommands.display_rating_error(
+                chat_id=chat_id, reason='Your rating must be a number')
+            )
+            return
+        elif int(rating) > 5 or int(rating) < 0:
+            user.send_command(OutboundCommands.display_rating_error(
+                chat_id=chat_id, reason='Rating must be between 0 and 5')
+            )
+            return
+        elif not chats.check_user_in_chat(chat_id, user.user_id):
+            user.send_command(OutboundCommands.display_rating_error(
+                chat_id=chat_id, reason='You are no longer part of this chat')
+            )
+            return
+        elif not chats.check_user_published_question(chat_id, user.user_id):
+            user.send_command(OutboundCommands.display_rating_error(
+                chat_id=chat_id, reason='You did not publish this question')
+            )
+            return
+        
+        recipient_id = int()
+        users_in_chat = chats.get_users_in_chat(chat_id)
+        for user_id in users_in_chat:
+            if not user_id[0] == user.user_id:
+                recipient_id = user_id[0]
+
+        self.send_to_user(recipient_id, delete_chat)
+        user.send_command(delete_chat)
+        file_hashes = chats.get_chat_file_hashes(chat_id)
+        chats.delete_chat(chat_id)
+        self.release_files(file_hashes)
+        print(recipient_id)
+        users_table.increment_users_points(recipient_id, int(rating))
+
+
+    # Newer clients tag every message with an id and keep sending it until it is acknowledged, so
+    # a message can arrive more than once but is only stored and passed on the first time
+    @session_active
+    def handle_message_request(self, user: User, chat_id: int, body: str, client_message_id: Optional[str] = None) -> None:
+        if client_message_id is not None:
+            if not isinstance(client_message_id, str) or not 0 < len(client_message_id) <= MAX_CLIENT_MESSAGE_ID_LENGTH: return
+            reply_id = self.recent_message_ids.get(user.user_id, client_message_id)
+            if reply_id is not None: user.send_command(OutboundCommands.message_ack(chat_id, client_message_id, reply_id)); return
+
+        # sanity checks first
+        valid_user_in_chat = chats.check_user_in_chat(chat_id, user.user_id)
+        if not valid_user_in_chat or body == EMPTY or len(body) > self.settings['message_max_length']:
+            if client_message_id: user.send_command(OutboundCommands.message_ack(chat_id, client_message_id, 0))
+            return
+
+        # Nothing is added if the id was already stored, by this worker before it was evicted from
+        # the recent ids or by another worker
+        reply_id = chats.add_reply_to_chat(chat_id, user.user_id, body, client_message_id)
+        if not reply_id:
+            if not client_message_id: return
+            reply_id = chats.get_reply_id_for_client_message(user.user_id, client_message_id)
+            if reply_id: self.recent_message_ids.add(user.user_id, client_message_id, reply_id)
+            user.send_command(OutboundCommands.message_ack(chat_id, client_message_id, reply_id))
+            return
+
+        users_in_chat = chats.get_users_in_chat(chat_id)
+        date_now = datetime.now().replace(microsecond=0)
+
+        command = OutboundCommands.create_chat_reply(chat_id, {
+            'first_name': user.user_details['first_name'],
+            'last_name': user.user_details['last_name'],
+            'date_sent': date_now, 'body': body, 'reply_id': reply_id
+        })
+        self.send_to_users([user_in_chat[0] for user_in_chat in users_in_chat], command)
+        if client_message_id:
+            self.recent_message_ids.add(user.user_id, client_message_id, reply_id)
+            user.send_command(OutboundCommands.message_ack(chat_id, client_message_id, reply_id))
+
+
+    # Cursors are the newest reply id the client has shown in each chat. They are sent every so
+    # often rather than for every reply
+    @session_active
+    def handle_ack_replies_request(self, user: User, cursors: dict[str, int]) -> None:
+        chat_ids = {chat_id[0] for chat_id in chats.get_users_chat_ids(user.user_id)}
+        for chat_id, reply_id in cursors.items():
+            if int(chat_id) in chat_ids: chats.update_delivered_reply_id(int(chat_id), user.user_id, int(reply_id))
+                
+
+    @session_active
+    def load_user_messages(self, user: User, chat_cursors: dict[int, int] = {}, file_cursors: dict[int, int] = {}) -> list[SocketCommand]:
+        commands = []
+        chat_ids = chats.get_users_chat_ids(user.user_id)
+        for chat_id in chat_ids:
+            messages = chats.get_chat_replies(chat_id[0], chat_cursors.get(chat_id[0], 0))
+            for message in messages:
+                message_details: MessageDetails = {
+                    'first_name': message[0], 'last_name': message[1],
+                    'date_sent': message[2], 
+                    'body': message[3], 'reply_id': message[4]
+                }
+                commands.append(
+                    OutboundCommands.create_chat_reply(
+                        chat_id[0], message_details
+                    )
+                )
+            for chat_file in chats.get_chat_files(chat_id[0], file_cursors.get(chat_id[0], 0)):
+                file_details: FileDetails = {
+                    'file_name': chat_file[0], 'file_size': chat_file[1], 'file_hash': chat_file[2], 'file_id': chat_file[3]
+                }
+                commands.append(OutboundCommands.create_chat_file(chat_id[0], file_details))
+        return commands
+
+
+    @session_active
+    def load_user_chats(self, user: User, known_chat_ids: set[int] = set()) -> list[SocketCommand]:
+        commands = []
+        chat_details_list = chats.load_user_chats(user.user_id)
+        if chat_details_list:
+            for chat_details in chat_details_list:
+                user_id = chat_details[0]
+                first_name = chat_details[1]
+                last_name = chat_details[2]
+                chat_id = chat_details[3]
+                if chat_id in known_chat_ids: continue
+
+                question = chats.get_chat_question(chat_id)
+                has_published = questions.check_user_published_question(
+                    question[0], user.user_id
+                )
+                question_details: QuestionDetails = {
+                    'title': question[1],
+                    'subject': question[2],
+                    'description': question[3],
+                    'expires_date': question[4],
+                    'second_year_content': question[5]
+                }
+
+                commands.append(
+                    OutboundCommands.create_new_chat(
+                        chat_id, user_id, first_name, 
+                        last_name, question_details, has_published
+                    )
+                )
+        return commands
+
+
+    @session_active
+    def handle_create_chat_request(self, user: User, user_id: int, question_id: int) -> None:
+        # 1. check if the user is valid to have a conversation with (has asked a question to them)
+        # 2. insert their values into the converstaions table
+        requester_has_question = questions.check_user_has_question(question_id, user.user_id)
+        if not requester_has_question: return
+
+        # get all the details for the question and chats
+        chat_id = chats.create_new_chat(user_one=user.user_id, user_two=user_id, question_id=question_id)
+        first_name, last_name = users_table.get_user_full_name(user_id)
+        question = questions.get_question(question_id)
+        questions.remove_incoming_question(question_id, user.user_id)
+
+        question_details: QuestionDetails = {
+            'title': question[2],
+            'subject': question[3],
+            'description': question[4],
+            'expires_date': question[5],
+            'second_year_content': question[6]
+        }
+        
+        question_recipients = questions.get_question_recipients(question_id)
+        question_awnsers = questions.get_question_awnsers(question_id)
+        statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
+                                          'recipient_awnsers': question_awnsers[0]}  
+        
+
+        self.send_to_user(user_id, 
+            OutboundCommands.create_new_chat(
+                chat_id, user.user_id, 
+                user.user_details['first_name'], 
+                user.user_details['last_name'], 
+                question_details, True
+            )
+        )
+
+        # Tell the user to update the info regarding their pending question
+        self.send_to_user(user_id,
+            OutboundCommands.update_question_statistics(
+                question_id=question_id, question_statistics=statistics
+            )
+        )
+
+        # Tell the user to create a new chat
+        user.send_command(
+            OutboundCommands.create_new_chat(
+                chat_id, user_id, first_name, 
+                last_name, question_details, False
+            )
+        )
+        user.send_command(
+            OutboundCommands.delete_incoming_question(
+                question_id=question_id
+            )
+        )
+
+
+    @session_active
+    def handle_view_profile_request(self, user: User, user_id: int) -> None:
+        user_profile = users_table.get_user(user_id)
+        if not user_profile: return
+        user.send_command(
+            OutboundCommands.create_profile_viewer(
+                user_profile[0], user_profile[1]
+            )
+        )
+
+
+    @session_active
+    def handle_search_for_user_request(self, user: User, input: str) -> None:
+        relavent_users = questions.get_users_from_input(input)
+        self.send_batch(user, [
+            OutboundCommands.create_manual_user(
+                user_id=relavent_user[0], first_name=relavent_user[1],
+                last_name=relavent_user[2], user_status=relavent_user[3]
+            ) for relavent_user in relavent_users
+        ], response=True)
+
+
+    @session_active
+    def handle_question_request(self, user: User, manual_recipients: list[int], question_details: QuestionDetails) -> None:
+        empty_feilds = utils.check_for_empty(question_details)
+        if empty_feilds: 
+            user.send_command(OutboundCommands.ask_question_response(
+                accepted=False, reason='No empty fields allowed')
+            )
+            return
+        elif not utils.validate_date(question_details['expires_date']):
+            user.send_command(OutboundCommands.ask_question_response(
+                accepted=False, reason='Date should be in format YYYY-MM-DD')
+            )
+            return   
+        
+        question_id: int = int()
+        statistics: Optional[QuestionStatistics] = None
+
+        # Logic for asking the queston
+        if manual_recipients:
+            question_id = questions.create_question_manual(
+                user_ids=manual_recipients, publisher_id=user.user_id,
+                details=question_details
+            )
+
+            question_recipients = questions.get_question_recipients(question_id)
+            question_awnsers = questions.get_question_awnsers(question_id)
+            statistics = {'recipient_ammount': len(question_recipients), 
+                          'recipient_awnsers': question_awnsers[0]} 
+
+            incoming_question = OutboundCommands.add_incoming_question(
+                question_id=question_id,
+                publisher_id=user.user_id,
+                first_name=user.user_details['first_name'],
+                last_name=user.user_details['last_name'],
+                details=question_details
+            )
+            self.send_to_users([user_affected for user_affected in manual_recipients if user_affected != user.user_id], incoming_question)
+        else: 
+            users_affected, question_id_result = questions.create_question_automatic(
+                publisher_id=user.user_id, details=question_details
+            )
+
+            question_id = question_id_result[0] 
+            question_recipients = questions.get_question_recipients(question_id)
+            question_awnsers = questions.get_question_awnsers(question_id)
+            statistics = {'recipient_ammount': len(question_recipients), 
+                          'recipient_awnsers': question_awnsers[0]} 
+            
+            # send question commands to the users effected
+            incoming_question = OutboundCommands.add_incoming_question(
+                question_id=question_id,
+                publisher_id=user.user_id,
+                first_name=user.user_details['first_name'],
+                last_name=user.user_details['last_name'],
+                details=question_details
+            )
+            # prevent sending question to the user who asked it
+            self.send_to_users([user_affected[0] for user_affected in users_affected if user_affected[0] != user.user_id], incoming_question)
+
+        user.send_command(OutboundCommands.ask_question_response())
+        user.send_command(OutboundCommands.add_pending_question(
+            question_id=question_id,
+            details=question_details, 
+            statistics=statistics)
+        )
+
+
+    @session_active
+    def suggest_question_recipients(self, user: User) -> list[SocketCommand]:
+        suggested_users = questions.get_suggested_users(user.user_id)
+        return [
+            OutboundCommands.create_manual_user(
+                user_id=suggested_user[0], first_name=suggested_user[1],
+                last_name=suggested_user[2], user_status=suggested_user[3]
+            ) for suggested_user in suggested_users
+        ]
+
+
+    @session_active
+    def load_pending_questions(self, user: User, after_question_id: int = 0) -> list[SocketCommand]:
+        commands = []
+        pending_questions = questions.get_pending_questions(user.user_id)
+        if not pending_questions: self.__debug(user.address, 'No pending questions'); return commands
+        # send all the pending questions back to the user
+        for question in pending_questions:
+            question_details: QuestionDetails = {
+                'title': question[2],
+                'subject': question[3],
+                'description': question[4],
+                'expires_date': question[5],
+                'second_year_content': question[6]
+            }
+            question_recipients = questions.get_question_recipients(question[0])
+            question_awnsers = questions.get_question_awnsers(question[0])
+            statistics: QuestionStatistics = {'recipient_ammount': len(question_recipients), 
+                                              'recipient_awnsers': question_awnsers[0]} 
+
+            # A resuming client already has the question, only its statistics can have changed
+            if question[0] <= after_question_id:
+                commands.append(OutboundCommands.update_question_statistics(question[0], statistics))
+                continue
+
+            commands.append(
+                OutboundCommands.add_pending_question(
+                    question_id=question[0],
+                    details=question_details,
+                    statistics=statistics
+                )
+            )
+        return commands
+
+
+    @session_active
+    def load_incoming_questions(self, user: User, after_question_id: int = 0) -> list[SocketCommand]:
+        commands = []
+        incoming_questions = questions.get_incoming_questions(user.user_id, after_question_id)
+        if not incoming_questions: self.__debug(user.address, 'No incoming questions'); return commands
+        # send all the pending questions back to the user
+        for question in incoming_questions:
+            question_details: QuestionDetails = {
+                'title': question[2],
+                'subject': question[3],
+                'description': question[4],
+                'expires_date': question[5],
+                'second_year_content': question[6]
+            }
+            publisher_full_name = users_table.get_user_full_name(question[1])
+            commands.append(
+                OutboundCommands.add_incoming_question(
+                    question_id=question[0],
+                    publisher_id=question[1],
+                    first_name=publisher_full_name[0],
+                    last_name=publisher_full_name[1],
+                    details=question_details
+                )
+            )
+        return commands
+
+
+    def handle_user_on_disconnect(self, user: User) -> None:
+        if user.session_active: self.release_user(user.user_id)
+
+
+    # Called when a connection stops being logged in as the user, because it closed or logged in
+    # as someone else. Only mark the user as last seen once their final device has gone
+    def release_user(self, user_id: int) -> None:
+        if self.broker: self.broker.unbind(user_id)
+        if self.is_user_online(user_id): return
+        self.file_transfers.suspend(user_id)
+        date_now = datetime.now().strftime(USER_STATUS_DATE_FORMAT)
+        users_table.update_user_status(user_id, f'Last seen {date_now}')
+
+    
+    def handle_user_on_start(self, user: User, new_user: bool, cursors: Optional[dict[str, Any]] = None) -> None:
+        previous_user_id = self.server_socket.connections.bind(user)
+        if previous_user_id != user.user_id:
+            if self.broker: self.broker.bind(user.user_id)
+            if previous_user_id is not None: self.release_user(previous_user_id)
+        user.send_command(
+            OutboundCommands.load_user_details(
+                user.user_id, user.user_details, user.user_status
+            )
+        )
+        generation = users_table.get_session_generation(user.user_id)
+        user.send_command(OutboundCommands.session_token(self.resume_tokens.issue(user.user_id, generation)))
+        users_table.update_user_status(user.user_id, 'Online')
+
+        # A resumed session only needs what has changed since the client's cursors
+        if cursors is not None:
+            self.send_batch(user, self.load_session_changes(user, cursors))
+            return
+
+        # Everything the user needs is sent in order as batches, chats have to come before their messages
+        commands: list[SocketCommand] = []
+
+        # Check if user is new
+        if not new_user:
+            commands += self.load_pending_questions(user)
+            commands += self.load_user_chats(user)
+            commands += self.load_user_messages(user)
+        else:
+            # Give the user some questions if there is any
+            questions.generate_questions(user.user_id)
+
+        commands += self.load_incoming_questions(user)
+        commands += self.suggest_question_recipients(user)
+        self.send_batch(user, commands)
+
+
+    # Cursors are the newest ids the client has seen: the last reply id and the last file id in
+    # each of its chats and the last pending and incoming question ids. Replies the user has not
+    # acknowledged yet are sent again, the client drops the ones it already has by their reply id.
+    # The client also lists the questions it is showing, so the ones deleted while it was away
+    # (by the user on another device, or by their publisher) are taken off it
+    @session_active
+    def load_session_changes(self, user: User, cursors: dict[str, Any]) -> list[SocketCommand]:
+        delivered_reply_ids = chats.get_delivered_reply_ids(user.user_id)
+        chat_cursors = {
+            int(chat_id): min(reply_id, delivered_reply_ids.get(int(chat_id), reply_id))
+            for chat_id, reply_id in cursors.get('chats', {}).items()
+        }
+        file_cursors = {int(chat_id): int(file_id) for chat_id, file_id in cursors.get('chat_files', {}).items()}
+        chat_ids = {chat_id[0] for chat_id in chats.get_users_chat_ids(user.user_id)}
+
+        commands = [
+            OutboundCommands.delete_question_chat(chat_id) 
+            for chat_id in chat_cursors if chat_id not in chat_ids
+        ]
+        pending_question_ids = questions.get_pending_question_ids(user.user_id)
+        commands += [
+            OutboundCommands.delete_pending_question(question_id)
+            for question_id in cursors.get('pending_question_ids', []) if question_id not in pending_question_ids
+        ]
+        incoming_question_ids = questions.get_incoming_question_ids(user.user_id)
+        commands += [
+            OutboundCommands.delete_incoming_question(question_id)
+            for question_id in cursors.get('incoming_question_ids', []) if question_id not in incoming_question_ids
+        ]
+        commands += self.load_pending_questions(user, cursors.get('pending_question_id', 0))
+        commands += self.load_user_chats(user, set(chat_cursors))
+        commands += self.load_user_messages(user, chat_cursors, file_cursors)
+        commands += self.load_incoming_questions(user, cursors.get('incoming_question_id', 0))
+        return commands
+
+
+    # Tokens issued before the user last signed out or logged in are refused
+    def handle_resume_request(self, user: User, token: str, cursors: dict[str, Any]) -> None:
+        if user.session_active: return
+        verified = self.resume_tokens.verify(token)
+        user_id, generation = verified if verified else (None, None)
+        if user_id is not None and generation != users_table.get_session_generation(user_id): user_id = None
+        user_profile = users_table.get_user(user_id) if user_id is not None else []
+        if not user_profile:
+            user.send_command(OutboundCommands.resume_response(
+                accepted=False, reason='Your session has expired, please log in again')
+            )
+            return
+
+        user.activate_user(user_id, user_profile[0])
+        user.send_command(OutboundCommands.resume_response())
+        self.handle_user_on_start(user=user, new_user=False, cursors=cursors)
+        self.__debug(user.address, 'User has resumed their session')
+
+
+    def handle_login_request(self, user: User, email: str, password: str) -> None:
+        # sanity checks for login
+        if email == EMPTY or password == EMPTY:
+            user.send_command(OutboundCommands.login_response(
+                accepted=False, reason='Entry feilds cannot be empty')
+            )
+            return
+        elif SPACE in email or SPACE in password:
+            user.send_command(OutboundCommands.login_response(
+                accepted=False, reason='Entry feilds cannot have spaces')
+            )
+            return
+        elif not users_table.check_email_exists(email):
+            user.send_command(OutboundCommands.login_response(
+                accepted=False, reason='That email does not exist')
+            )
+            return
+        elif not users_table.login_user(email, password):
+            user.send_command(OutboundCommands.login_response(
+                accepted=False, reason="That password does not match")
+            )
+            return
+        else:
+            # User has logged on
+            user_id_result = users_table.get_user_id(email)
+            user_profile = users_table.get_user(user_id_result[0])
+            if not user_profile: return
+
+            # A fresh login revokes the resume tokens handed out before it
+            users_table.increment_session_generation(user_id_result[0])
+            user.activate_user(user_id_result[0], user_profile[0])
+            user.send_command(OutboundCommands.login_response())
+            self.handle_user_on_start(user=user, new_user=False)
+            self.__debug(user.address, 'User has logged in')
+
+
+    # The connection stays open for the user to log in again. Their resume tokens are revoked,
+    # so a copy of one kept by the client cannot bring the session back
+    @session_active
+    def handle_sign_out_request(self, user: User) -> None:
+        users_table.increment_session_generation(user.user_id)
+        user_id = self.server_socket.connections.unbind(user)
+        user.deactivate_user()
+        if user_id is not None: self.release_user(user_id)
+        self.__debug(user.address, 'User has signed out')
+
+
+    def handle_verify_request(self, user: User, code: str) -> None:
+        if not code.isdigit():
+            user.send_command(OutboundCommands.verify_response(
+                accepted=False, reason='Codes must be a four digit value')
+            )
+            return
+        elif SPACE in code or code == EMPTY:
+            user.send_command(OutboundCommands.verify_response(
+                accepted=False, reason='Codes cannot be empty or contain spaces')
+            )
+            return
+        elif not self.email_manager.check_verification_code(user.address, code):
+            user.send_command(OutboundCommands.verify_response(
+                accepted=False, reason='That code is invalid')
+            )
+            return
+        else:
+            # User has verified successfully
+            if not user.cached_user_details: return
+            users_table.register_user(user.cached_user_details)
+            user_id_result = users_table.get_user_id(user.cached_user_details['email'])
+            user.activate_user(user_id_result[0], user.cached_user_details)
+
+            # send commands back to the client
+            user.send_command(OutboundCommands.verify_response())
+            self.handle_user_on_start(user=user, new_user=True)
+            self.__debug(user.address, 'User has now been verified')
+
+
+    def handle_register_request(self, user: User, user_details: UserDetails) -> None:
+        # First check if there is any whitespace in the entrys apart from the#
+        user_options_list = [
+            user_details['option_one'], 
+            user_details['option_two'],
+            user_details['option_three'], 
+            user_details['option_four']
+        ]
+        whitespace = utils.check_for_whitespace(items=user_details)
+        empty = utils.check_for_empty(items=user_details)
+
+        if whitespace or empty: user.send_command(
+            OutboundCommands.register_response(
+                accepted=False, reason='No whitespace or empty fields allowed')
+            ); return
+
+        if len(user_details['first_name']) > 25:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That first name is too large (max 25 characters)')
+            )
+            return 
+        elif len(user_details['last_name']) > 25:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That last name is too large (max 25 characters)')
+            )
+            return 
+        elif not user_details["tutor_group"] in self.settings['tutor_groups']:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That tutor group is invalid')
+            )
+            return 
+        elif not self.email_manager.validate_email(user_details["email"]):
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That email is invalid')
+            )
+            return 
+        elif users_table.check_email_exists(user_details["email"]):
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That email is already in use')
+            )
+            return 
+        elif len(user_details['password']) < 8:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='That password is too short (min 8 characters)')
+            )
+            return
+        elif [x for x in user_options_list if x not in self.settings['options']]:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='An option provided is invalid')
+            )
+            return 
+        elif len([x for x in user_options_list if x == 'None']) > 3:
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='You must have at least one option')
+            )
+            return     
+        elif utils.check_for_duplicates(user_options_list, exception='None'):
+            user.send_command(OutboundCommands.register_response(
+                accepted=False, reason='You cannot study the same option multiple times')
+            )
+            return 
+    
+        # passed registration checks
+        user.cache_user_details(user_details)
+        code = self.email_manager.init_verification_code(user.address)
+        self.email_manager.send_verification_email(user_details["email"], str(code))
+        user.send_command((OutboundCommands.register_response()))
+        self.__debug(user.address, f'Verification code sent ({code})')
+
+
+    def __debug(self, user_address: tuple, message: str) -> None:
+        logging.debug(f"[server] handling user [{user_address}]: {message}")
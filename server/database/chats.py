@@ -1,117 +1,182 @@
-from typing import Any, Union
-
-from database.database_connector import DatabaseConnector as Cursor
-from static.shared_types import UserDetails
-
-
-def create_new_chat(user_one: int, user_two: int, question_id: int):
-    query_one = "INSERT INTO chats (created_at, question_id) VALUES(current_date(), %s);"
-    query_two = "INSERT INTO chat_users (chat_id, user_id) VALUES (LAST_INSERT_ID(), %s), (LAST_INSERT_ID(), %s);"
-    query_three = "SELECT LAST_INSERT_ID() as chat_id"
-    Cursor.query(query_one, [question_id])
-    Cursor.query(query_two, [user_one, user_two])
-    rows = Cursor.select_one(query_three, [])
-    return rows[0] if rows else None
-
-
-def load_user_chats(user_id: int) -> list[tuple]:
-    query = """
-    SELECT DISTINCT users.user_id, users.first_name, users.last_name, chat_users.chat_id
-    FROM users JOIN chat_users ON users.user_id = chat_users.user_id
-    WHERE chat_users.chat_id IN (SELECT chat_id FROM chat_users WHERE user_id = %s)
-    AND users.user_id != %s;
-    """
-    rows = Cursor.select_all(query, [user_id, user_id])
-    return rows if rows else []
-
-
-def get_chat_question(chat_id) -> tuple:
-    query = """
-    SELECT q.question_id, q.title, q.subject, q.description, q.expires_date, q.second_year_content
-    FROM questions q WHERE q.question_id = ( SELECT question_id FROM chats WHERE chats.chat_id = %s)
-    """
-    row = Cursor.select_one(query, [chat_id])
-    return row if row else ()
-
-
-def get_users_chat_ids(user_id: int) -> list[tuple]:
-    query = "SELECT chat_id FROM chat_users WHERE user_id = %s"
-    rows = Cursor.select_all(query, [user_id])
-    return rows if rows else []
-
-
-def get_chat_replies(chat_id: int) -> list[tuple]:
-    query = """
-    SELECT users.first_name, users.last_name, chat_replies.created_at, chat_replies.message
-    FROM chat_replies JOIN users ON chat_replies.author_id = users.user_id
-    WHERE chat_replies.chat_id = %s ORDER BY chat_replies.created_at ASC;
-    """
-    rows = Cursor.select_all(query, [chat_id])
-    return rows if rows else []
-
-
-def check_user_in_chat(chat_id: int, user_id: int) -> bool:
-    query = "SELECT * FROM chat_users WHERE chat_id = %s AND user_id = %s"
-    row = Cursor.select_one(query, [chat_id, user_id])
-    return True if row else False
-
-
-def add_reply_to_chat(chat_id: int, user_id: int, message: str):
-    query = """
-    INSERT INTO chat_replies (chat_id, author_id, message)
-    SELECT %s, %s, %s FROM dual WHERE EXISTS (SELECT 1 FROM chat_users WHERE chat_id = %s AND user_id = %s);
-    """
-    Cursor.query(query, [chat_id, user_id, message, chat_id, user_id])
-
-
-def add_file_to_chat(chat_id: int, user_id: int, name: str, contents: str, file_size: int, created_at: str):
-    query = """
-    INSERT INTO chat_files (chat_id, publisher_id, file_name, file_contents, file_size, created_at)
-    SELECT %s, %s, %s, %s, %s, %s FROM dual WHERE EXISTS (SELECT 1 FROM chat_users WHERE chat_id = %s AND user_id = %s);
-    """
-    Cursor.query(query, [chat_id, user_id, name, contents, file_size, created_at, chat_id, user_id])
-
-
-def get_users_in_chat(chat_id: int) -> list[tuple]:
-    query = "SELECT user_id FROM chat_users WHERE chat_id = %s"
-    rows = Cursor.select_all(query, [chat_id])
-    return rows if rows else []
-
-
-def get_users_from_question(question_id: int) -> list:
-    query = """
-    SELECT DISTINCT chat_users.user_id, chats.chat_id FROM chat_users
-    JOIN chats ON chat_users.chat_id = chats.chat_id WHERE chats.question_id = %s;
-    """
-    rows = Cursor.select_all(query, [question_id])
-    return rows if rows else []
-
-
-def delete_question_chats(question_id: int) -> None:
-    query_one = "DELETE chat_replies FROM chat_replies JOIN chats ON chat_replies.chat_id = chats.chat_id WHERE chats.question_id = %s;"
-    query_two = "DELETE chat_users FROM chat_users JOIN chats ON chat_users.chat_id = chats.chat_id WHERE chats.question_id = %s;"
-    query_three = "DELETE FROM chats WHERE question_id = %s;"
-    Cursor.query(query_one, [question_id])
-    Cursor.query(query_two, [question_id])
-    Cursor.query(query_three, [question_id])
-
-
-def delete_chat(chat_id: int) -> None:
-    query_one = "DELETE FROM chat_replies WHERE chat_replies.chat_id = %s;"
-    query_two = "DELETE FROM chat_users WHERE chat_users.chat_id = %s;"
-    query_three = "DELETE FROM chats WHERE chats.chat_id = %s;"
-    Cursor.query(query_one, [chat_id])
-    Cursor.query(query_two, [chat_id])
-    Cursor.query(query_three, [chat_id])
-
-
-def check_user_published_question(chat_id: int, user_id: int) -> bool:
-    query = """
-    SELECT COUNT(*) AS is_question_publisher FROM questions
-    WHERE questions.publisher_id = %s AND questions.question_id = (
-        SELECT chats.question_id FROM chats WHERE chats.chat_id = %s
-    );
-    """
-    row = Cursor.select_one(query, [user_id, chat_id])
-    return True if row and row[0] == 1 else False
-
+from datetime import datetime
+from typing import Any, Union
+
+from database.database_connector import DatabaseConnector as Cursor
+from static.shared_types import UserDetails
+
+
+def create_new_chat(user_one: int, user_two: int, question_id: int):
+    query_one = "INSERT INTO chats (created_at, question_id) VALUES(current_date(), %s);"
+    query_two = "INSERT INTO chat_users (chat_id, user_id) VALUES (LAST_INSERT_ID(), %s), (LAST_INSERT_ID(), %s);"
+    query_three = "SELECT LAST_INSERT_ID() as chat_id"
+    Cursor.query(query_one, [question_id])
+    Cursor.query(query_two, [user_one, user_two])
+    rows = Cursor.select_one(query_three, [])
+    return rows[0] if rows else None
+
+
+def load_user_chats(user_id: int) -> list[tuple]:
+    query = """
+    SELECT DISTINCT users.user_id, users.first_name, users.last_name, chat_users.chat_id
+    FROM users JOIN chat_users ON users.user_id = chat_users.user_id
+    WHERE chat_users.chat_id IN (SELECT chat_id FROM chat_users WHERE user_id = %s)
+    AND users.user_id != %s;
+    """
+    rows = Cursor.select_all(query, [user_id, user_id])
+    return rows if rows else []
+
+
+def get_chat_question(chat_id) -> tuple:
+    query = """
+    SELECT q.question_id, q.title, q.subject, q.description, q.expires_date, q.second_year_content
+    FROM questions q WHERE q.question_id = ( SELECT question_id FROM chats WHERE chats.chat_id = %s)
+    """
+    row = Cursor.select_one(query, [chat_id])
+    return row if row else ()
+
+
+def get_users_chat_ids(user_id: int) -> list[tuple]:
+    query = "SELECT chat_id FROM chat_users WHERE user_id = %s"
+    rows = Cursor.select_all(query, [user_id])
+    return rows if rows else []
+
+
+# Replies come back in reply id order, which is the order they were sent in. Only the
+# replies after a client's cursor are needed when it resumes a session
+def get_chat_replies(chat_id: int, after_reply_id: int = 0) -> list[tuple]:
+    query = """
+    SELECT users.first_name, users.last_name, chat_replies.created_at, chat_replies.message, chat_replies.reply_id
+    FROM chat_replies JOIN users ON chat_replies.author_id = users.user_id
+    WHERE chat_replies.chat_id = %s AND chat_replies.reply_id > %s ORDER BY chat_replies.reply_id ASC;
+    """
+    rows = Cursor.select_all(query, [chat_id, after_reply_id])
+    return rows if rows else []
+
+
+def check_user_in_chat(chat_id: int, user_id: int) -> bool:
+    query = "SELECT * FROM chat_users WHERE chat_id = %s AND user_id = %s"
+    row = Cursor.select_one(query, [chat_id, user_id])
+    return True if row else False
+
+
+# Returns zero if nothing was added, either because the user is not in the chat or because the
+# unique index already has a reply with the same client message id from this author. The
+# duplicate is skipped by the insert itself, the existing reply is found with the lookup below
+def add_reply_to_chat(chat_id: int, user_id: int, message: str, client_message_id: Union[str, None] = None) -> int:
+    query = """
+    INSERT IGNORE INTO chat_replies (chat_id, author_id, message, client_message_id)
+    SELECT %s, %s, %s, %s FROM dual WHERE EXISTS (SELECT 1 FROM chat_users WHERE chat_id = %s AND user_id = %s);
+    """
+    return Cursor.insert(query, [chat_id, user_id, message, client_message_id, chat_id, user_id])
+
+
+def get_reply_id_for_client_message(user_id: int, client_message_id: str) -> int:
+    query = "SELECT reply_id FROM chat_replies WHERE author_id = %s AND client_message_id = %s;"
+    row = Cursor.select_one(query, [user_id, client_message_id])
+    return row[0] if row else 0
+
+
+# Acknowledgements only ever move forward, and only for chats the user is in
+def update_delivered_reply_id(chat_id: int, user_id: int, reply_id: int) -> None:
+    query = """
+    UPDATE chat_users SET delivered_reply_id = GREATEST(delivered_reply_id, %s)
+    WHERE chat_id = %s AND user_id = %s;
+    """
+    Cursor.query(query, [reply_id, chat_id, user_id])
+
+
+def get_delivered_reply_ids(user_id: int) -> dict[int, int]:
+    query = "SELECT chat_id, delivered_reply_id FROM chat_users WHERE user_id = %s;"
+    rows = Cursor.select_all(query, [user_id])
+    return {row[0]: row[1] for row in rows} if rows else {}
+
+
+# The contents are kept in the blob store, the row only points at them by hash. Returns the new
+# file id, or zero if the user is not in the chat
+def add_file_to_chat(chat_id: int, user_id: int, name: str, file_hash: str, file_size: int, created_at: datetime) -> int:
+    query = """
+    INSERT INTO chat_files (chat_id, publisher_id, file_name, file_hash, file_size, created_at)
+    SELECT %s, %s, %s, %s, %s, %s FROM dual WHERE EXISTS (SELECT 1 FROM chat_users WHERE chat_id = %s AND user_id = %s);
+    """
+    return Cursor.insert(query, [chat_id, user_id, name, file_hash, file_size, created_at, chat_id, user_id])
+
+
+def get_chat_files(chat_id: int, after_file_id: int = 0) -> list[tuple]:
+    query = "SELECT file_name, file_size, file_hash, file_id FROM chat_files WHERE chat_id = %s AND file_id > %s ORDER BY file_id ASC;"
+    rows = Cursor.select_all(query, [chat_id, after_file_id])
+    return rows if rows else []
+
+
+def get_chat_file(chat_id: int, file_hash: str) -> Union[tuple, None]:
+    query = "SELECT file_name, file_size FROM chat_files WHERE chat_id = %s AND file_hash = %s LIMIT 1;"
+    return Cursor.select_one(query, [chat_id, file_hash])
+
+
+def check_file_referenced(file_hash: str) -> bool:
+    query = "SELECT COUNT(*) FROM chat_files WHERE file_hash = %s;"
+    row = Cursor.select_one(query, [file_hash])
+    return True if row and row[0] > 0 else False
+
+
+def get_question_chat_file_hashes(question_id: int) -> list[tuple]:
+    query = """
+    SELECT DISTINCT chat_files.file_hash FROM chat_files
+    JOIN chats ON chat_files.chat_id = chats.chat_id WHERE chats.question_id = %s;
+    """
+    rows = Cursor.select_all(query, [question_id])
+    return rows if rows else []
+
+
+def get_chat_file_hashes(chat_id: int) -> list[tuple]:
+    query = "SELECT DISTINCT file_hash FROM chat_files WHERE chat_id = %s;"
+    rows = Cursor.select_all(query, [chat_id])
+    return rows if rows else []
+
+
+def get_users_in_chat(chat_id: int) -> list[tuple]:
+    query = "SELECT user_id FROM chat_users WHERE chat_id = %s"
+    rows = Cursor.select_all(query, [chat_id])
+    return rows if rows else []
+
+
+def get_users_from_question(question_id: int) -> list:
+    query = """
+    SELECT DISTINCT chat_users.user_id, chats.chat_id FROM chat_users
+    JOIN chats ON chat_users.chat_id = chats.chat_id WHERE chats.question_id = %s;
+    """
+    rows = Cursor.select_all(query, [question_id])
+    return rows if rows else []
+
+
+def delete_question_chats(question_id: int) -> None:
+    query_one = "DELETE chat_replies FROM chat_replies JOIN chats ON chat_replies.chat_id = chats.chat_id WHERE chats.question_id = %s;"
+    query_two = "DELETE chat_users FROM chat_users JOIN chats ON chat_users.chat_id = chats.chat_id WHERE chats.question_id = %s;"
+    query_three = "DELETE chat_files FROM chat_files JOIN chats ON chat_files.chat_id = chats.chat_id WHERE chats.question_id = %s;"
+    query_four = "DELETE FROM chats WHERE question_id = %s;"
+    Cursor.query(query_one, [question_id])
+    Cursor.query(query_two, [question_id])
+    Cursor.query(query_three, [question_id])
+    Cursor.query(query_four, [question_id])
+
+
+def delete_chat(chat_id: int) -> None:
+    query_one = "DELETE FROM chat_replies WHERE chat_replies.chat_id = %s;"
+    query_two = "DELETE FROM chat_users WHERE chat_users.chat_id = %s;"
+    query_three = "DELETE FROM chat_files WHERE chat_files.chat_id = %s;"
+    query_four = "DELETE FROM chats WHERE chats.chat_id = %s;"
+    Cursor.query(query_one, [chat_id])
+    Cursor.query(query_two, [chat_id])
+    Cursor.query(query_three, [chat_id])
+    Cursor.query(query_four, [chat_id])
+
+
+def check_user_published_question(chat_id: int, user_id: int) -> bool:
+    query = """
+    SELECT COUNT(*) AS is_question_publisher FROM questions
+    WHERE questions.publisher_id = %s AND questions.question_id = (
+        SELECT chats.question_id FROM chats WHERE chats.chat_id = %s
+    );
+    """
+    row = Cursor.select_one(query, [user_id, chat_id])
+    return True if row and row[0] == 1 else False
+
@@ -1,54 +1,104 @@
-import logging
-from typing import Any, Optional
-
-import mysql.connector as connector
-from mysql.connector.types import RowType
-
-
-class DatabaseConnector:
-
-    @classmethod
-    def init_cursor(cls, settings: dict[str, Any], cursor_commit: bool = False) -> None:
-        cls.__cursor_commit = cursor_commit
-        try:
-            cls.__connection = connector.connect(**settings)
-            if cls.__connection.is_connected():
-                cls.__cursor = cls.__connection.cursor()
-                cls.__debug(f"connected to {settings['database']}")
-
-        except connector.Error as err:
-            cls.__debug(err)  
-
-
-    @classmethod
-    def query(cls, query: str, params: list = []) -> None:
-        if not cls.__connection.is_connected(): return
-        try:
-            cls.__cursor.execute(query, params, multi=False)
-            if cls.__cursor_commit:
-                cls.__connection.commit()
-        except connector.Error as err:
-            cls.__debug(err.msg)
-
-
-    @classmethod
-    def select_all(cls, query: str, params: list=[]) -> Optional[list[RowType]]:
-        if not cls.__connection.is_connected(): return []
-        cls.query(query, params)
-        if cls.__cursor.rowcount > 0: 
-            return cls.__cursor.fetchall() 
-        return []
-    
-
-    @classmethod
-    def select_one(cls, query: str, params: list=[]) -> RowType:
-        if not cls.__connection.is_connected(): return ()
-        cls.query(query, params)
-        result = cls.__cursor.fetchone()
-        return result if result else ()
-
-
-    @staticmethod
-    def __debug(message) -> None:
-        logging.debug(f'[database connector]: {message}')
-    
\ No newline at end of file
+import logging
+import threading
+from contextlib import nullcontext
+from typing import Any, Optional
+
+import mysql.connector as connector
+from mysql.connector.types import RowType
+
+
+# Threads that opened a connection of their own (the dispatcher's workers) query on it at the same
+# time as each other. Every other thread shares one connection and cursor, so running a query and
+# reading what it returned happen under one lock. LAST_INSERT_ID() is kept per connection, so the
+# queries that rely on it are only safe on a thread's own connection or under the lock
+class DatabaseConnector:
+    __lock = threading.RLock()
+    __local = threading.local()
+    __settings: dict[str, Any] = dict()
+    __connection: Any = None
+    __cursor: Any = None
+
+    @classmethod
+    def init_cursor(cls, settings: dict[str, Any], cursor_commit: bool = False) -> None:
+        cls.__settings = settings
+        cls.__cursor_commit = cursor_commit
+        cls.__connection, cls.__cursor = cls.__connect(settings)
+
+
+    # Gives the calling thread its own connection, used instead of the shared one from then on
+    @classmethod
+    def init_thread_cursor(cls) -> None:
+        cls.__local.connection, cls.__local.cursor = cls.__connect(cls.__settings)
+
+
+    # Returns the number of rows the query changed, or zero if it failed
+    @classmethod
+    def query(cls, query: str, params: list = []) -> int:
+        connection, cursor, lock = cls.__session()
+        with lock:
+            if not connection or not connection.is_connected(): return 0
+            try:
+                cursor.execute(query, params, multi=False)
+                if cls.__cursor_commit:
+                    connection.commit()
+                return max(cursor.rowcount, 0)
+            except connector.Error as err:
+                cls.__debug(err.msg)
+                return 0
+
+
+    # Returns the id given to the inserted row, or zero if nothing was inserted. It is read from
+    # the same execute, so an insert made by another thread in between can never be returned
+    @classmethod
+    def insert(cls, query: str, params: list = []) -> int:
+        _, cursor, lock = cls.__session()
+        with lock:
+            if not cls.query(query, params): return 0
+            return cursor.lastrowid or 0
+
+
+    @classmethod
+    def select_all(cls, query: str, params: list=[]) -> Optional[list[RowType]]:
+        connection, cursor, lock = cls.__session()
+        with lock:
+            if not connection or not connection.is_connected(): return []
+            cls.query(query, params)
+            if cursor.rowcount > 0:
+                return cursor.fetchall()
+            return []
+
+
+    @classmethod
+    def select_one(cls, query: str, params: list=[]) -> RowType:
+        connection, cursor, lock = cls.__session()
+        with lock:
+            if not connection or not connection.is_connected(): return ()
+            cls.query(query, params)
+            result = cursor.fetchone()
+            return result if result else ()
+
+
+    # The calling thread's own connection if it has one, otherwise the shared one and its lock
+    @classmethod
+    def __session(cls) -> tuple[Any, Any, Any]:
+        connection = getattr(cls.__local, 'connection', None)
+        if connection: return connection, cls.__local.cursor, nullcontext()
+        return cls.__connection, cls.__cursor, cls.__lock
+
+
+    @classmethod
+    def __connect(cls, settings: dict[str, Any]) -> tuple[Any, Any]:
+        try:
+            connection = connector.connect(**settings)
+            if connection.is_connected():
+                cls.__debug(f"connected to {settings['database']}")
+                return connection, connection.cursor()
+
+        except connector.Error as err:
+            cls.__debug(err)
+        return None, None
+
+
+    @staticmethod
+    def __debug(message) -> None:
+        logging.debug(f'[database connector]: {message}')
@@ -0,0 +1,29 @@
+-- Run once against an existing database before starting this version of the server.
+
+-- Monotonic ids for chat replies. Clients keep the last reply id they have seen for each
+-- chat and send it when they resume a session, so only newer replies are sent back
+ALTER TABLE chat_replies ADD COLUMN reply_id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT UNIQUE FIRST;
+CREATE INDEX chat_replies_chat_id_reply_id ON chat_replies (chat_id, reply_id);
+
+-- Attachment contents live in the blob store on disk, named by their SHA-256. Rows only keep
+-- the hash, so identical files sent to many chats are stored once
+ALTER TABLE chat_files DROP COLUMN file_contents, ADD COLUMN file_hash CHAR(64) NOT NULL AFTER file_name;
+CREATE INDEX chat_files_file_hash ON chat_files (file_hash);
+
+-- Clients tag each message with an id of their own so a message sent again after a dropped
+-- connection is only stored once. Old clients leave it NULL, which the unique index allows any
+-- number of times
+ALTER TABLE chat_replies ADD COLUMN client_message_id CHAR(32) NULL;
+CREATE UNIQUE INDEX chat_replies_author_id_client_message_id ON chat_replies (author_id, client_message_id);
+
+-- The newest reply each user has acknowledged in each of their chats
+ALTER TABLE chat_users ADD COLUMN delivered_reply_id BIGINT UNSIGNED NOT NULL DEFAULT 0;
+
+-- Monotonic ids for chat files, so a resuming client is only sent the files added to each chat
+-- after the newest one it has
+ALTER TABLE chat_files ADD COLUMN file_id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT UNIQUE FIRST;
+CREATE INDEX chat_files_chat_id_file_id ON chat_files (chat_id, file_id);
+
+-- Resume tokens are signed with the generation they were issued under. Signing out or logging
+-- in again moves it on, so every token issued before then stops being accepted
+ALTER TABLE users ADD COLUMN session_generation INT UNSIGNED NOT NULL DEFAULT 0;
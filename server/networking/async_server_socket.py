@@ -0,0 +1,241 @@
+import asyncio
+import errno
+import logging
+import socket
+import ssl
+import time
+from typing import Any, Optional, Union
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from networking.compression import DEFAULT_COMPRESSION_THRESHOLD, load_dictionary
+from networking.connection_registry import ConnectionRegistry
+from networking.connection_sweeper import DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_IDLE_TIMEOUT, ConnectionSweeper
+from networking.crypto_pool import DEFAULT_CRYPTO_BATCH_SIZE, DEFAULT_CRYPTO_WORKERS, CryptoPool
+from networking.crypto_utils import CryptoUtils, KeyType
+from networking.framing import DEFAULT_BUFFER_SIZE, DEFAULT_MAX_FRAME_SIZE, FrameDecoder
+from networking.handshake import HandshakeError
+from networking.send_queue import (
+    DEFAULT_BLOCK_TIMEOUT,
+    DEFAULT_COALESCE_DELAY,
+    DEFAULT_OUTPUT_BUDGET,
+    DEFAULT_SEND_QUEUE_SIZE,
+    DEFAULT_SLOW_CONSUMER_POLICY,
+    BackpressureCounters,
+    OutputBudget,
+    QueueMetrics,
+    AsyncSendQueue,
+)
+from networking.tls import DEFAULT_TLS_CERTIFICATE_PATH, TLS_HANDSHAKE_TIMEOUT, create_server_context
+from networking.server_socket import BaseUser
+from static.shared_types import SocketCommand
+
+# The stream reader already buffers what has arrived, so each connection's decoder starts small
+# and only grows while a large frame is read. Idle connections stay cheap
+DECODER_BUFFER_SIZE = 4_096 # Bytes
+
+
+# Drop in replacement for ServerSocket that serves every connection from one event loop
+# instead of starting a thread per user
+class AsyncServerSocket:
+    def __init__(self, server_private_key_path: str, client_public_key_path: str,
+                 port: int, format: str, backlog: int, header_size: int, recv_callback: Any,
+                 user_disconnect_callback: Any, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE, coalesce_delay: float = DEFAULT_COALESCE_DELAY,
+                 compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD, reuse_port: bool = False,
+                 heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 output_budget: int = DEFAULT_OUTPUT_BUDGET, slow_consumer_policy: str = DEFAULT_SLOW_CONSUMER_POLICY,
+                 block_timeout: float = DEFAULT_BLOCK_TIMEOUT, binary_callback: Any = None,
+                 crypto_workers: int = DEFAULT_CRYPTO_WORKERS, crypto_batch_size: int = DEFAULT_CRYPTO_BATCH_SIZE,
+                 tls: bool = False, tls_certificate_path: str = DEFAULT_TLS_CERTIFICATE_PATH,
+                 tls_private_key_path: Optional[str] = None) -> None:
+
+        # Initiate attributes
+        self.backlog = backlog
+        self.port = port
+        self.format = format
+        self.header_size = header_size
+        self.max_frame_size = max_frame_size
+        self.send_queue_size = send_queue_size
+        self.coalesce_delay = coalesce_delay
+        self.output_budget = output_budget
+        self.slow_consumer_policy = slow_consumer_policy
+        self.block_timeout = block_timeout
+        self.backpressure_counters = BackpressureCounters()
+        self.queue_metrics = QueueMetrics()
+        self.compression_threshold = compression_threshold
+        self.compression_dictionary = load_dictionary()
+        self.reuse_port = reuse_port
+
+        # Load the keys for encryption
+        self.__client_public_key: RSAPublicKey = CryptoUtils.load_key_from_file(client_public_key_path, KeyType.PUBLIC)
+        self.__server_private_key: RSAPrivateKey = CryptoUtils.load_key_from_file(server_private_key_path, KeyType.PRIVATE)
+        self.crypto_pool: Union[CryptoPool, None] = None
+        if crypto_workers: self.crypto_pool = CryptoPool(server_private_key_path, crypto_workers, crypto_batch_size)
+        self.__address = (socket.gethostname(), port)
+        self.tls_context: Union[ssl.SSLContext, None] = None
+        if tls:
+            self.tls_context = create_server_context(
+                tls_private_key_path or server_private_key_path, tls_certificate_path, self.__address[0]
+            )
+
+        self.recv_callback = recv_callback
+        self.binary_callback = binary_callback
+        self.user_disconnect_callback = user_disconnect_callback
+        self.connections = ConnectionRegistry()
+        self.sweeper = ConnectionSweeper(self.connections, heartbeat_interval, idle_timeout)
+        self.loop = asyncio.new_event_loop()
+        self.initiate_socket()
+
+
+    def initiate_socket(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.start_server())
+        except OSError as err:
+            self.__debug(err.strerror)
+            self.loop.close()
+            return
+        self.sweeper.start()
+
+
+    # The loop runs on the thread that created the socket and never returns. It has to, as once the
+    # main thread finishes the interpreter starts shutting down and the loop's executor is refused
+    def serve_forever(self) -> None:
+        if not self.loop.is_closed(): self.loop.run_forever()
+
+
+    async def start_server(self) -> None:
+        self.__server = await asyncio.start_server(
+            self.listen_for_connection, host=self.__address[0], port=self.port,
+            backlog=self.backlog, reuse_address=True, reuse_port=self.reuse_port, ssl=self.tls_context,
+            ssl_handshake_timeout=TLS_HANDSHAKE_TIMEOUT if self.tls_context else None
+        )
+        self.__debug(f"listening on port {self.port}")
+
+
+    async def listen_for_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        address = writer.get_extra_info('peername')
+        writer.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        user = AsyncUser(
+            address=address,
+            header_size=self.header_size,
+            max_frame_size=self.max_frame_size,
+            client_public_key=self.__client_public_key,
+            server_private_key=self.__server_private_key,
+            reader=reader, writer=writer, loop=self.loop,
+            budget=self.create_budget(),
+            coalesce_delay=self.coalesce_delay,
+            compression_threshold=self.compression_threshold,
+            compression_dictionary=self.compression_dictionary,
+            close_callback=self.close_connection,
+            recv_callback=self.recv_callback,
+            binary_callback=self.binary_callback,
+            crypto_pool=self.crypto_pool,
+            tls=bool(self.tls_context)
+        )
+        self.connections.add(user)
+        self.__debug(f"current connections: {len(self.connections)}")
+        await user.run()
+
+
+    # Each connection gets its own budget, the counters and metrics are shared so they cover the whole server
+    def create_budget(self) -> OutputBudget:
+        return OutputBudget(
+            self.send_queue_size, self.output_budget, self.slow_consumer_policy,
+            self.block_timeout, self.backpressure_counters, self.queue_metrics
+        )
+
+
+    def close_connection(self, address: tuple) -> None:
+        user = self.connections.get(address)
+        if not user: return
+        self.connections.remove(user)
+        self.user_disconnect_callback(user)
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[async server socket]: {message}")
+
+
+
+class AsyncUser(BaseUser):
+    def __init__(self, header_size: int, max_frame_size: int, address: tuple, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop, client_public_key: RSAPublicKey,
+                 server_private_key: RSAPrivateKey, budget: OutputBudget, coalesce_delay: float,
+                 close_callback: Any, recv_callback: Any, compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_dictionary: bytes = b'', binary_callback: Any = None,
+                 crypto_pool: Optional[CryptoPool] = None, tls: bool = False) -> None:
+
+        super().__init__(
+            header_size=header_size, max_frame_size=max_frame_size, address=address,
+            client_public_key=client_public_key, server_private_key=server_private_key,
+            close_callback=close_callback, recv_callback=recv_callback,
+            compression_threshold=compression_threshold, compression_dictionary=compression_dictionary,
+            binary_callback=binary_callback, crypto_pool=crypto_pool, tls=tls
+        )
+        self.reader = reader
+        self.writer = writer
+        self.loop = loop
+        self.frame_decoder = FrameDecoder(header_size, max_frame_size, DECODER_BUFFER_SIZE)
+        budget.overflow_callback = self.abort
+        self.send_queue = AsyncSendQueue(writer, loop, coalesce_delay=coalesce_delay, budget=budget)
+
+        # Commands and file data decoded from the last read, waiting to be handed to the server
+        self.__deliveries: list[tuple[Any, tuple]] = []
+
+
+    # Session frames are decrypted and decoded on the loop, as are the hello and heartbeats. Only
+    # what reaches the server's handlers, which block on the database, goes to the default executor,
+    # everything from one read in a single call. Awaiting it keeps this user's commands in order
+    # and stops the connection being read while they are handled
+    async def run(self) -> None:
+        self.send_queue_task = self.loop.create_task(self.send_queue.run())
+        while True:
+            try:
+                data = await self.reader.read(DEFAULT_BUFFER_SIZE)
+                if not data: raise ConnectionResetError(errno.ECONNRESET, 'connection closed by the client')
+                self.frame_decoder.feed(data)
+                for encrypted_command in self.frame_decoder.frames():
+                    await self.receive_frame(encrypted_command)
+
+                # The file data still points into the decoder's buffer, which is only reused by the next read
+                if self.__deliveries:
+                    deliveries, self.__deliveries = self.__deliveries, []
+                    await self.loop.run_in_executor(None, run_deliveries, deliveries)
+
+            except (OSError, HandshakeError) as err:
+                self.close_user()
+                self.debug(err)
+                break
+
+
+    # RSA for old clients and the hello is the only decryption that blocks. It runs in the
+    # crypto pool when there is one and otherwise in the default executor
+    async def receive_frame(self, encrypted_command: memoryview) -> None:
+        self.last_activity = time.monotonic()
+        if self.session_cipher or self.tls: decrypted_command = self.decrypt_command(encrypted_command)
+        elif self.crypto_pool: decrypted_command = (await self.crypto_pool.decrypt_async([bytes(encrypted_command)]))[0]
+        else:
+            decrypted_command = await self.loop.run_in_executor(
+                None, CryptoUtils.decrypt_data, bytes(encrypted_command), self.server_private_key
+            )
+        self.handle_frame(decrypted_command)
+
+
+    def deliver(self, callback: Any, *args: Any) -> None:
+        self.__deliveries.append((callback, args))
+
+
+    def abort(self) -> None:
+        self.loop.call_soon_threadsafe(self.writer.transport.abort)
+
+
+    def close_user(self) -> None:
+        self.send_queue.close()
+        self.writer.close()
+        self.close_callback(self.address)
+
+
+
+def run_deliveries(deliveries: list[tuple[Any, tuple]]) -> None:
+    for callback, args in deliveries: callback(*args)
@@ -0,0 +1,41 @@
+import hashlib
+import struct
+from typing import Union
+
+DEFAULT_FILE_CHUNK_SIZE = 65_536 # Bytes of file data per binary frame
+HASH_READ_SIZE = 1_048_576
+
+# Every transfer is its own stream, numbered by its transfer id, next to the stream of commands.
+# With flow control an upload may only have this many bytes in flight until the receiver grants
+# more, so a file can never fill the connection ahead of the commands
+DEFAULT_STREAM_WINDOW = 262_144 # Bytes
+
+# Session frames normally start with a compression flag byte (see compression.py). Binary frames
+# start with this flag instead, followed by the transfer id and the offset of the data in the file.
+# They carry raw file data, so there is no codec, no base64 and no compression to get through
+BINARY_FRAME_FLAG = 0x40
+BINARY_HEADER = struct.Struct('>BIQ')
+
+
+def is_binary_frame(data: Union[bytes, memoryview]) -> bool:
+    return len(data) >= BINARY_HEADER.size and data[0] == BINARY_FRAME_FLAG
+
+
+def pack_binary_frame(transfer_id: int, offset: int, data: Union[bytes, memoryview]) -> bytes:
+    return pack_binary_header(transfer_id, offset) + data
+
+
+def pack_binary_header(transfer_id: int, offset: int) -> bytes:
+    return BINARY_HEADER.pack(BINARY_FRAME_FLAG, transfer_id, offset)
+
+
+def unpack_binary_frame(data: Union[bytes, memoryview]) -> tuple[int, int, memoryview]:
+    _, transfer_id, offset = BINARY_HEADER.unpack_from(data)
+    return transfer_id, offset, memoryview(data)[BINARY_HEADER.size:]
+
+
+def hash_file(file_path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while data := file.read(HASH_READ_SIZE): file_hash.update(data)
+    return file_hash.hexdigest()
@@ -0,0 +1,250 @@
+import logging
+import os
+import pickle
+import queue
+import socket
+import tempfile
+import threading
+from collections import Counter
+from typing import Any, Optional, Union
+
+from networking.framing import FrameDecoder
+
+BROKER_SOCKET_NAME = 'broker.sock'
+BROKER_HEADER_SIZE = 4
+
+# Messages passed between the broker and the workers
+HELLO = 'hello'
+PRESENCE = 'presence'
+BIND = 'bind'
+UNBIND = 'unbind'
+PUBLISH = 'publish'
+
+
+# Runs in the parent process when the server is started with several workers. Each worker tells
+# the broker which users it has logged in, and the broker passes that on to the other workers so
+# they know when a command has to be published for a user that is connected somewhere else.
+# The socket is only reachable by the user running the server, so messages are pickled. Without
+# a path it is made in a new directory only that user can enter
+class Broker:
+    def __init__(self, path: Optional[str] = None, backlog: int = 64) -> None:
+        self.directory = None if path else tempfile.mkdtemp(prefix='studychat-')
+        self.path = path or os.path.join(self.directory, BROKER_SOCKET_NAME)
+        self.__lock = threading.Lock()
+        self.__workers: dict[int, 'WorkerConnection'] = dict()
+        self.__presence: dict[int, Counter] = dict()
+
+        if os.path.exists(self.path): os.unlink(self.path)
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Bound with no permissions for anyone else, instead of changing them once it already exists.
+        # The umask is the whole process's, this runs before the broker or the workers are forked
+        previous_umask = os.umask(0o177)
+        try: self.__socket.bind(self.path)
+        finally: os.umask(previous_umask)
+        self.__socket.listen(backlog)
+
+
+    def serve_forever(self) -> None:
+        self.__debug(f"listening on {self.path}")
+        while True:
+            connection, _ = self.__socket.accept()
+            threading.Thread(target=self.serve_worker, args=(WorkerConnection(connection),), daemon=True).start()
+
+
+    # Workers inherit the listening socket when they are forked and have no use for it
+    def close(self) -> None:
+        self.__socket.close()
+
+
+    # Only the parent removes the socket, once it has stopped
+    def remove(self) -> None:
+        self.__socket.close()
+        if os.path.exists(self.path): os.unlink(self.path)
+        if self.directory: os.rmdir(self.directory)
+
+
+    def serve_worker(self, worker: 'WorkerConnection') -> None:
+        frame_decoder = FrameDecoder(BROKER_HEADER_SIZE)
+        try:
+            while True:
+                if not frame_decoder.recv_into(worker.connection): raise socket.error
+                for frame in frame_decoder.frames():
+                    self.handle_message(worker, pickle.loads(frame))
+        except (socket.error, pickle.UnpicklingError) as err:
+            self.__debug(f"worker {worker.worker_id} disconnected: {err}")
+        self.remove_worker(worker)
+
+
+    # Presence changes are sent while the lock is held, so every worker is sent them in the order
+    # they were made. A new worker is sent the snapshot before any change that came after it
+    def handle_message(self, worker: 'WorkerConnection', message: tuple) -> None:
+        kind = message[0]
+        if kind == HELLO:
+            worker.worker_id = message[1]
+            with self.__lock:
+                self.__workers[worker.worker_id] = worker
+                worker.send((PRESENCE, {user_id: sum(workers.values()) for user_id, workers in self.__presence.items()}))
+
+        elif kind == BIND or kind == UNBIND:
+            user_id = message[1]
+            with self.__lock:
+                workers = self.__presence.setdefault(user_id, Counter())
+                workers[worker.worker_id] += 1 if kind == BIND else -1
+                if workers[worker.worker_id] <= 0: del workers[worker.worker_id]
+                if not workers: del self.__presence[user_id]
+                self.__broadcast((kind, user_id, 1), worker.worker_id)
+
+        # A command for many users comes in once, and each worker is sent it once with the
+        # users it has connected
+        elif kind == PUBLISH:
+            _, user_ids, command, file_hash = message
+            worker_user_ids: dict[int, list[int]] = dict()
+            with self.__lock:
+                for user_id in user_ids:
+                    for worker_id in self.__presence.get(user_id, ()):
+                        if worker_id != worker.worker_id: worker_user_ids.setdefault(worker_id, []).append(user_id)
+                targets = [(self.__workers[worker_id], ids) for worker_id, ids in worker_user_ids.items() if worker_id in self.__workers]
+            for target, ids in targets: target.send((PUBLISH, ids, command, file_hash))
+
+
+    # Every user the worker had logged in goes offline with it
+    def remove_worker(self, worker: 'WorkerConnection') -> None:
+        with self.__lock:
+            if self.__workers.get(worker.worker_id) is worker: del self.__workers[worker.worker_id]
+            for user_id, workers in list(self.__presence.items()):
+                if worker.worker_id not in workers: continue
+                count = workers.pop(worker.worker_id)
+                if not workers: del self.__presence[user_id]
+                self.__broadcast((UNBIND, user_id, count), worker.worker_id)
+        worker.close()
+
+
+    # Only queues the message on each worker's connection, so it can be called with the lock held
+    def __broadcast(self, message: tuple, sender_id: Union[int, None]) -> None:
+        for worker_id, worker in self.__workers.items():
+            if worker_id != sender_id: worker.send(message)
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[broker]: {message}")
+
+
+
+# Messages for a worker are written by a thread of their own, so queueing one never waits on a
+# worker that is slow to read them
+class WorkerConnection:
+    def __init__(self, connection: socket.socket) -> None:
+        self.connection = connection
+        self.worker_id: Union[int, None] = None
+        self.__messages: queue.SimpleQueue = queue.SimpleQueue()
+        threading.Thread(target=self.__write, daemon=True).start()
+
+
+    def send(self, message: tuple) -> None:
+        self.__messages.put(message)
+
+
+    def close(self) -> None:
+        self.__messages.put(None)
+        self.connection.close()
+
+
+    def __write(self) -> None:
+        while (message := self.__messages.get()) is not None:
+            try: send_message(self.connection, message)
+            except socket.error: return
+
+
+
+# A worker's link to the broker. Keeps a count of the connections every user has on the other
+# workers, so commands are only published for users that are actually connected elsewhere
+class BrokerClient(threading.Thread):
+    def __init__(self, path: str, worker_id: int, deliver_callback: Any) -> None:
+        super().__init__(daemon=True)
+        self.path = path
+        self.worker_id = worker_id
+        self.deliver_callback = deliver_callback
+        self.connected = False
+        self.__remote_users: Counter = Counter()
+        self.__send_lock = threading.Lock()
+        self.__deliveries: queue.SimpleQueue = queue.SimpleQueue()
+
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(path)
+        self.connected = True
+        self.__send((HELLO, worker_id))
+
+
+    def run(self) -> None:
+        threading.Thread(target=self.__deliver, daemon=True).start()
+        frame_decoder = FrameDecoder(BROKER_HEADER_SIZE)
+        try:
+            while True:
+                if not frame_decoder.recv_into(self.__socket): raise socket.error
+                for frame in frame_decoder.frames():
+                    self.handle_message(pickle.loads(frame))
+        except (socket.error, pickle.UnpicklingError) as err:
+            self.__debug(f"lost the broker, only local users can be reached: {err}")
+        self.connected = False
+        self.__remote_users.clear()
+        self.__socket.close()
+
+
+    # Published commands are delivered on another thread, as sending them can wait on slow clients
+    # and the presence changes behind them would be held up
+    def handle_message(self, message: tuple) -> None:
+        kind = message[0]
+        if kind == PRESENCE:
+            self.__remote_users = Counter(message[1])
+        elif kind == BIND:
+            self.__remote_users[message[1]] += message[2]
+        elif kind == UNBIND:
+            self.__remote_users[message[1]] -= message[2]
+            if self.__remote_users[message[1]] <= 0: del self.__remote_users[message[1]]
+        elif kind == PUBLISH:
+            self.__deliveries.put(message[1:])
+
+
+    def bind(self, user_id: int) -> None:
+        self.__send((BIND, user_id))
+
+
+    def unbind(self, user_id: int) -> None:
+        self.__send((UNBIND, user_id))
+
+
+    def publish(self, user_ids: list[int], command: Any, file_hash: Optional[str] = None) -> None:
+        self.__send((PUBLISH, user_ids, command, file_hash))
+
+
+    def is_online(self, user_id: int) -> bool:
+        return self.__remote_users.get(user_id, 0) > 0
+
+
+    def __deliver(self) -> None:
+        while True:
+            user_ids, command, file_hash = self.__deliveries.get()
+            try:
+                self.deliver_callback(user_ids, command, file_hash)
+            except Exception as err:
+                self.__debug(f"could not deliver {command.get('command_name')}: {err!r}")
+
+
+    def __send(self, message: tuple) -> None:
+        if not self.connected: return
+        try:
+            with self.__send_lock: send_message(self.__socket, message)
+        except socket.error as err:
+            self.__debug(err.strerror)
+            self.connected = False
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[broker client {self.worker_id}]: {message}")
+
+
+
+def send_message(connection: socket.socket, message: tuple) -> None:
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    connection.sendall(len(data).to_bytes(BROKER_HEADER_SIZE, byteorder='big') + data)
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), 'compression_dictionary.bin')
+DEFAULT_COMPRESSION_THRESHOLD = 256 # Bytes
+DEFAULT_DICTIONARY_SIZE = 16_384 # Bytes
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# First byte of every frame, says how the rest of the frame was compressed
+NO_COMPRESSION = 'none'
+ZLIB = 'zlib'
+ZSTD = 'zstd'
+ALGORITHM_FLAGS = {NO_COMPRESSION: 0, ZLIB: 1, ZSTD: 2}
+DICTIONARY_FLAG = 0x80
+
+
+class CompressionError(ValueError):
+    pass
+
+
+# Most preferred first, zstd is only offered when the zstandard package is installed
+def supported_compressions() -> list[str]:
+    return [ZSTD, ZLIB] if zstandard else [ZLIB]
+
+
+def choose_compression(offered: list[str]) -> str:
+    for algorithm in supported_compressions():
+        if algorithm in offered: return algorithm
+    return NO_COMPRESSION
+
+
+def load_dictionary(filename: str = DICTIONARY_PATH) -> bytes:
+    if not os.path.exists(filename): return b''
+    with open(filename, 'rb') as dictionary_file:
+        return dictionary_file.read()
+
+
+# Both sides only use the dictionary when they have the exact same one
+def get_dictionary_id(dictionary: bytes) -> str:
+    return hashlib.sha256(dictionary).hexdigest()[:16] if dictionary else ''
+
+
+# Builds a raw content dictionary (usable by zlib and zstd) from recorded command frames. The
+# most common frames are placed at the end, which is where zlib finds matches most cheaply
+def train_dictionary(samples: list[bytes], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    sample_counts = Counter(samples)
+    ordered_samples = sorted(sample_counts, key=lambda sample: sample_counts[sample])
+    return b''.join(ordered_samples)[-size:]
+
+
+def save_dictionary(dictionary: bytes, filename: str = DICTIONARY_PATH) -> None:
+    with open(filename, 'wb') as dictionary_file:
+        dictionary_file.write(dictionary)
+
+
+
+# Compresses frames with the algorithm agreed for a connection. Every frame starts with a flag
+# byte so it can be decompressed without knowing what was negotiated, and frames under the
+# threshold are sent as they are because compressing them costs more than it saves
+class Compressor:
+    def __init__(self, algorithm: str = NO_COMPRESSION, dictionary: bytes = b'',
+                 threshold: int = DEFAULT_COMPRESSION_THRESHOLD, max_size: Union[int, None] = None) -> None:
+
+        self.algorithm = algorithm
+        self.dictionary = dictionary
+        self.threshold = threshold
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+        self.__flag = ALGORITHM_FLAGS[algorithm] | (DICTIONARY_FLAG if dictionary else 0)
+
+        if zstandard:
+            zstd_dictionary = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT) if dictionary else None
+            self.__zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=zstd_dictionary)
+            self.__zstd_decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dictionary)
+
+
+    def compress(self, data: bytes) -> bytes:
+        if self.algorithm == NO_COMPRESSION or len(data) < self.threshold:
+            return bytes([ALGORITHM_FLAGS[NO_COMPRESSION]]) + data
+
+        if self.algorithm == ZLIB:
+            compressor = zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=self.dictionary) if self.dictionary \
+                else zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+            compressed_data = compressor.compress(data) + compressor.flush()
+        else:
+            # zstd compressors cannot be shared between threads at the same time
+            with self.__lock: compressed_data = self.__zstd_compressor.compress(data)
+
+        return bytes([self.__flag]) + compressed_data
+
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        flag, payload = data[0], data[1:]
+        algorithm = flag & ~DICTIONARY_FLAG
+        dictionary = self.dictionary if flag & DICTIONARY_FLAG else b''
+        max_size = self.max_size or 0
+
+        if algorithm == ALGORITHM_FLAGS[NO_COMPRESSION]:
+            return bytes(payload)
+
+        elif algorithm == ALGORITHM_FLAGS[ZLIB]:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=dictionary) if dictionary \
+                else zlib.decompressobj(-zlib.MAX_WBITS)
+            try:
+                decompressed_data = decompressor.decompress(payload, max_size)
+            except zlib.error as err:
+                raise CompressionError(str(err))
+            if decompressor.unconsumed_tail: raise CompressionError('frame decompresses past the size limit')
+            return decompressed_data
+
+        elif algorithm == ALGORITHM_FLAGS[ZSTD] and zstandard:
+            try:
+                content_size = zstandard.frame_content_size(payload)
+                if max_size and content_size > max_size: raise CompressionError('frame decompresses past the size limit')
+                with self.__lock:
+                    decompressor = self.__zstd_decompressor if dictionary else zstandard.ZstdDecompressor()
+                    return decompressor.decompress(payload, max_output_size=max_size)
+            except zstandard.ZstdError as err:
+                raise CompressionError(str(err))
+
+        raise CompressionError(f'unsupported compression flag {flag}')
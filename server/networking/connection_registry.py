@@ -0,0 +1,79 @@
+import threading
+from typing import Any, Iterable, Optional, Union
+
+NO_CONNECTIONS: frozenset = frozenset()
+
+
+# Online connections indexed by address and by user id (a user can be logged in on several devices).
+# Only writers take the lock. The address index is replaced rather than changed so iterating it
+# is always a snapshot, and the user id index maps to frozensets so lookups are a single dict get
+class ConnectionRegistry:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__connections: dict[tuple, Any] = dict()
+        self.__user_connections: dict[int, frozenset] = dict()
+        self.__bound_user_ids: dict[Any, int] = dict()
+
+
+    def add(self, connection: Any) -> None:
+        with self.__lock:
+            connections = self.__connections.copy()
+            connections[connection.address] = connection
+            self.__connections = connections
+
+
+    # Called once the connection has logged in so it can be found by user id. A connection that
+    # logs in again as someone else is moved off the user it was bound to. Returns that user id,
+    # or None if the connection was not bound before
+    def bind(self, connection: Any) -> Optional[int]:
+        with self.__lock:
+            previous_user_id = self.__bound_user_ids.get(connection)
+            if previous_user_id is not None: self.__unbind(connection, previous_user_id)
+            user_connections = self.__user_connections.get(connection.user_id, NO_CONNECTIONS)
+            self.__user_connections[connection.user_id] = user_connections | {connection}
+            self.__bound_user_ids[connection] = connection.user_id
+            return previous_user_id
+
+
+    # Called when the connection signs out but stays connected. Returns the user id it was bound to
+    def unbind(self, connection: Any) -> Optional[int]:
+        with self.__lock:
+            user_id = self.__bound_user_ids.pop(connection, None)
+            if user_id is not None: self.__unbind(connection, user_id)
+            return user_id
+
+
+    def remove(self, connection: Any) -> None:
+        with self.__lock:
+            connections = self.__connections.copy()
+            connections.pop(connection.address, None)
+            self.__connections = connections
+
+            user_id = self.__bound_user_ids.pop(connection, None)
+            if user_id is not None: self.__unbind(connection, user_id)
+
+
+    def __unbind(self, connection: Any, user_id: int) -> None:
+        user_connections = self.__user_connections.get(user_id, NO_CONNECTIONS) - {connection}
+        if user_connections: self.__user_connections[user_id] = user_connections
+        else: self.__user_connections.pop(user_id, None)
+
+
+    def get(self, address: tuple) -> Union[Any, None]:
+        return self.__connections.get(address)
+
+
+    def get_user_connections(self, user_id: int) -> frozenset:
+        return self.__user_connections.get(user_id, NO_CONNECTIONS)
+
+
+    def is_online(self, user_id: int) -> bool:
+        return user_id in self.__user_connections
+
+
+    def snapshot(self) -> Iterable[Any]:
+        return self.__connections.values()
+
+
+    def __len__(self) -> int:
+        return len(self.__connections)
@@ -0,0 +1,52 @@
+import logging
+import threading
+import time
+from typing import Any
+
+from networking.connection_registry import ConnectionRegistry
+
+DEFAULT_HEARTBEAT_INTERVAL = 15 # Seconds
+DEFAULT_IDLE_TIMEOUT = 45 # Seconds
+
+
+# Pings connections that have gone quiet and closes the ones that stay quiet past the idle
+# timeout. A half-open connection (a laptop lid closed mid session) never makes recv fail, so
+# without this it would keep its thread, its file buffers and its 'Online' status forever
+class ConnectionSweeper(threading.Thread):
+    def __init__(self, connections: ConnectionRegistry, heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+
+        super().__init__(daemon=True)
+        self.connections = connections
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.__stopped = threading.Event()
+
+
+    def run(self) -> None:
+        while not self.__stopped.wait(self.heartbeat_interval):
+            self.sweep()
+
+
+    def stop(self) -> None:
+        self.__stopped.set()
+
+
+    # Dead connections are found first and then closed in one pass. Old clients cannot answer
+    # pings, so their connections are left to TCP keepalive instead
+    def sweep(self) -> None:
+        now = time.monotonic()
+        idle_connections: list[Any] = []
+        for connection in self.connections.snapshot():
+            if not connection.heartbeat: continue
+            idle_time = now - connection.last_activity
+            if idle_time >= self.idle_timeout: idle_connections.append(connection)
+            elif idle_time >= self.heartbeat_interval: connection.send_ping()
+
+        for connection in idle_connections:
+            connection.abort()
+        if idle_connections: self.__debug(f"closed {len(idle_connections)} idle connections")
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[connection sweeper]: {message}")
@@ -0,0 +1,68 @@
+import asyncio
+import os
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import Optional, Union
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from networking.crypto_utils import CryptoUtils, KeyType
+
+DEFAULT_CRYPTO_WORKERS = 0 # Processes, none means RSA is done on the connection's own thread
+DEFAULT_CRYPTO_BATCH_SIZE = 8 # Frames sent to a process at a time
+
+# Loaded once by every process in the pool so the key is never pickled with each batch
+_private_key: Union[RSAPrivateKey, None] = None
+
+
+def _load_private_key(private_key_path: str) -> None:
+    global _private_key
+    _private_key = CryptoUtils.load_key_from_file(private_key_path, KeyType.PRIVATE)
+
+
+def _decrypt_batch(encrypted_frames: list[bytes]) -> list[Optional[bytes]]:
+    return [CryptoUtils.decrypt_data(encrypted_frame, _private_key) for encrypted_frame in encrypted_frames]
+
+
+
+# RSA decryption with a 4096 bit key holds the GIL, so on the connection threads it runs on one
+# core however many there are. The pool moves it into worker processes that each hold the private
+# key. A connection's frames are split into batches that run in parallel and come back in the
+# order they were sent, and the connection waits for them before reading on, so its commands
+# are still handled in order
+class CryptoPool:
+    def __init__(self, private_key_path: str, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_CRYPTO_BATCH_SIZE) -> None:
+
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(batch_size, 1)
+        self.__private_key: RSAPrivateKey = CryptoUtils.load_key_from_file(private_key_path, KeyType.PRIVATE)
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_load_private_key, initargs=(private_key_path,)
+        )
+
+
+    def submit(self, encrypted_frames: list[bytes]) -> list[Future]:
+        return [
+            self.__executor.submit(_decrypt_batch, encrypted_frames[index:index + self.batch_size])
+            for index in range(0, len(encrypted_frames), self.batch_size)
+        ]
+
+
+    # If a worker process dies the pool cannot be used again, so frames are decrypted here instead
+    def decrypt(self, encrypted_frames: list[bytes]) -> list[Optional[bytes]]:
+        try:
+            return [decrypted_frame for batch in self.submit(encrypted_frames) for decrypted_frame in batch.result()]
+        except BrokenExecutor:
+            return [CryptoUtils.decrypt_data(encrypted_frame, self.__private_key) for encrypted_frame in encrypted_frames]
+
+
+    # The same for the event loop, which waits on the batches without holding up a thread
+    async def decrypt_async(self, encrypted_frames: list[bytes]) -> list[Optional[bytes]]:
+        try:
+            batches = [await asyncio.wrap_future(batch) for batch in self.submit(encrypted_frames)]
+            return [decrypted_frame for batch in batches for decrypted_frame in batch]
+        except BrokenExecutor:
+            return await asyncio.get_running_loop().run_in_executor(None, self.decrypt, encrypted_frames)
+
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
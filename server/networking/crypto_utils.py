@@ -1,81 +1,160 @@
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.backends import default_backend
-from typing import Union, Any
-from enum import Enum
-
-
-class KeyType(Enum):
-    PRIVATE = 'private'
-    PUBLIC = 'public'
-
-
-class CryptoUtils:
-
-    @staticmethod
-    def generate_rsa_key_pair() -> tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
-        private_key = rsa.generate_private_key(
-            public_exponent=65537, key_size=4096, 
-            backend=default_backend()
-        )
-
-        public_key = private_key.public_key()
-        return private_key, public_key
-    
-
-    @staticmethod
-    def encrypt_data(data: bytes, public_key: rsa.RSAPublicKey) -> Union[bytes, None]:
-        try:
-            return public_key.encrypt(
-                data, padding.OAEP(
-                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                    algorithm=hashes.SHA256(), label=None)
-                )
-        except ValueError:
-            return None
-    
-
-    @staticmethod
-    def decrypt_data(encrypted_data: bytes, private_key: rsa.RSAPrivateKey) -> Union[bytes, None]:
-        try:
-            decrypted_data = private_key.decrypt(
-                encrypted_data, padding.OAEP(
-                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                    algorithm=hashes.SHA256(), label=None)
-            )
-            return decrypted_data
-        except ValueError:
-            return None
-
-
-    @staticmethod
-    def save_key_to_file(key, filename: str) -> None:
-        if isinstance(key, rsa.RSAPrivateKey):
-            key_bytes = key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption()
-            )
-        elif isinstance(key, rsa.RSAPublicKey):
-            key_bytes = key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
-        else:
-            raise ValueError("Unsupported key type")
-
-        with open(filename, 'wb') as key_file:
-            key_file.write(key_bytes)
-
-
-    @staticmethod
-    def load_key_from_file(filename: str, key_type: KeyType) -> Any:
-        with open(filename, 'rb') as key_file:
-            key_bytes = key_file.read()
-            if key_type == KeyType.PRIVATE:
-                return serialization.load_pem_private_key(
-                    key_bytes, password=None, backend=default_backend())
-            elif key_type == KeyType.PUBLIC:
-                return serialization.load_pem_public_key(
-                    key_bytes, backend=default_backend())
-            
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.backends import default_backend
+from typing import Union, Any
+from enum import Enum
+import itertools
+
+SESSION_KEY_SIZE = 256 # Bits
+NONCE_SIZE = 12 # Bytes, the stream a frame was sealed on followed by its counter
+STREAM_ID_SIZE = 4 # Bytes
+STREAMS = 2 # The server's interactive and bulk send lanes
+
+
+class KeyType(Enum):
+    PRIVATE = 'private'
+    PUBLIC = 'public'
+
+
+# Which end of the connection a session cipher belongs to, each one seals with its own key
+class Role(Enum):
+    CLIENT = 'client'
+    SERVER = 'server'
+
+
+class CryptoUtils:
+
+    @staticmethod
+    def generate_rsa_key_pair() -> tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
+        private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=4096, 
+            backend=default_backend()
+        )
+
+        public_key = private_key.public_key()
+        return private_key, public_key
+    
+
+    @staticmethod
+    def encrypt_data(data: bytes, public_key: rsa.RSAPublicKey) -> Union[bytes, None]:
+        try:
+            return public_key.encrypt(
+                data, padding.OAEP(
+                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                    algorithm=hashes.SHA256(), label=None)
+                )
+        except ValueError:
+            return None
+    
+
+    @staticmethod
+    def decrypt_data(encrypted_data: bytes, private_key: rsa.RSAPrivateKey) -> Union[bytes, None]:
+        try:
+            decrypted_data = private_key.decrypt(
+                encrypted_data, padding.OAEP(
+                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                    algorithm=hashes.SHA256(), label=None)
+            )
+            return decrypted_data
+        except ValueError:
+            return None
+
+
+    @staticmethod
+    def save_key_to_file(key, filename: str) -> None:
+        if isinstance(key, rsa.RSAPrivateKey):
+            key_bytes = key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+        elif isinstance(key, rsa.RSAPublicKey):
+            key_bytes = key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        else:
+            raise ValueError("Unsupported key type")
+
+        with open(filename, 'wb') as key_file:
+            key_file.write(key_bytes)
+
+
+    @staticmethod
+    def load_key_from_file(filename: str, key_type: KeyType) -> Any:
+        with open(filename, 'rb') as key_file:
+            key_bytes = key_file.read()
+            if key_type == KeyType.PRIVATE:
+                return serialization.load_pem_private_key(
+                    key_bytes, password=None, backend=default_backend())
+            elif key_type == KeyType.PUBLIC:
+                return serialization.load_pem_public_key(
+                    key_bytes, backend=default_backend())
+
+
+    @staticmethod
+    def generate_session_key() -> bytes:
+        return AESGCM.generate_key(bit_length=SESSION_KEY_SIZE)
+
+
+
+# Symmetric cipher for a single connection, the key is exchanged once with RSA and a key for each
+# direction is derived from it, so the two sides never seal under the same key and nonce. Frames
+# are sealed with AES-GCM under a counter nonce sent in front of the ciphertext. The server queues
+# commands and file data in separate lanes that are interleaved on the wire, so each lane counts
+# on its own stream and a frame whose counter is not past the last one on its stream is rejected
+class SessionCipher:
+    def __init__(self, session_key: bytes, role: Role) -> None:
+        self.session_key = session_key
+        self.role = role
+        peer = Role.SERVER if role == Role.CLIENT else Role.CLIENT
+        self.__send_aes = AESGCM(derive_key(session_key, role, peer))
+        self.__receive_aes = AESGCM(derive_key(session_key, peer, role))
+        self.__counters = [itertools.count(1) for _ in range(STREAMS)]
+        self.__last_counters = [0] * STREAMS
+
+
+    # Callers sealing frames on the same stream from more than one thread have to send them in
+    # the order they were sealed in, or the peer rejects the ones that arrive late
+    def encrypt(self, data: bytes, stream: int = 0) -> bytes:
+        nonce = stream.to_bytes(STREAM_ID_SIZE, byteorder='big') + next(self.__counters[stream]).to_bytes(NONCE_SIZE - STREAM_ID_SIZE, byteorder='big')
+        return nonce + self.__send_aes.encrypt(nonce, data, None)
+
+
+    # Only called by the thread reading the connection. A replayed or reordered frame is treated
+    # like one that failed to decrypt, the counter only moves on once the tag has been checked
+    def decrypt(self, encrypted_data: Union[bytes, memoryview]) -> Union[bytes, None]:
+        nonce = bytes(encrypted_data[:NONCE_SIZE])
+        stream = int.from_bytes(nonce[:STREAM_ID_SIZE], byteorder='big')
+        counter = int.from_bytes(nonce[STREAM_ID_SIZE:], byteorder='big')
+        if stream >= STREAMS or counter <= self.__last_counters[stream]: return None
+        try:
+            data = self.__receive_aes.decrypt(nonce, encrypted_data[NONCE_SIZE:], None)
+        except (InvalidTag, ValueError):
+            return None
+        self.__last_counters[stream] = counter
+        return data
+
+
+
+# The key for frames sent from one role to the other
+def derive_key(session_key: bytes, sender: Role, receiver: Role) -> bytes:
+    return HKDF(
+        algorithm=hashes.SHA256(), length=SESSION_KEY_SIZE // 8, salt=None,
+        info=f'studychat session {sender.value} to {receiver.value}'.encode(), backend=default_backend()
+    ).derive(session_key)
+
+
+
+# Session frames on a TLS connection, the record layer has already encrypted them so they are
+# passed through as they are
+class PlainCipher:
+    def encrypt(self, data: bytes, stream: int = 0) -> bytes:
+        return data
+
+
+    def decrypt(self, encrypted_data: Union[bytes, memoryview]) -> bytes:
+        return encrypted_data
@@ -0,0 +1,57 @@
+from typing import Optional
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from networking.command_codec import Codec
+from networking.compression import Compressor
+from networking.crypto_utils import CryptoUtils
+from static.shared_types import SocketCommand
+
+
+# A command going to many connections. Everything that does not depend on the connection is done
+# once and shared: the command is encoded once per codec and compressed once per compression
+# setting. Old clients all hold the one client key pair, so their RSA frame is sealed once too,
+# and TLS connections have no step of their own at all. Only session ciphers, which have a key
+# for each connection, still run per recipient. Shared frames are immutable bytes, so every
+# send queue is handed the same object
+class Fanout:
+    def __init__(self, command: SocketCommand) -> None:
+        self.command = command
+        self.command_name = command.get('command_name')
+        self.__encoded: dict[str, bytes] = dict()
+        self.__compressed: dict[tuple, bytes] = dict()
+        self.__frames: dict[tuple, Optional[bytes]] = dict()
+
+
+    def encode(self, codec: Codec) -> bytes:
+        encoded_command = self.__encoded.get(codec.name)
+        if encoded_command is None: encoded_command = self.__encoded[codec.name] = codec.encode(self.command)
+        return encoded_command
+
+
+    def compress(self, codec: Codec, compressor: Compressor) -> bytes:
+        key = (codec.name, compressor.algorithm, compressor.dictionary, compressor.threshold)
+        compressed_command = self.__compressed.get(key)
+        if compressed_command is None: compressed_command = self.__compressed[key] = compressor.compress(self.encode(codec))
+        return compressed_command
+
+
+    # Session frames on TLS connections, which are only compressed
+    def compressed_frame(self, codec: Codec, compressor: Compressor, header_size: int) -> bytes:
+        key = ('plain', codec.name, compressor.algorithm, compressor.dictionary, compressor.threshold, header_size)
+        if key not in self.__frames: self.__frames[key] = pack_frame(self.compress(codec, compressor), header_size)
+        return self.__frames[key]
+
+
+    # Frames for old clients. A server loads one client public key and every connection is given
+    # it, so the frame only depends on the codec. None if the command is too large for RSA
+    def sealed_frame(self, codec: Codec, public_key: RSAPublicKey, header_size: int) -> Optional[bytes]:
+        key = ('sealed', codec.name, header_size)
+        if key not in self.__frames:
+            encrypted_command = CryptoUtils.encrypt_data(self.encode(codec), public_key)
+            self.__frames[key] = pack_frame(encrypted_command, header_size) if encrypted_command else None
+        return self.__frames[key]
+
+
+
+def pack_frame(data: bytes, header_size: int) -> bytes:
+    return len(data).to_bytes(header_size, byteorder="big") + data
@@ -0,0 +1,498 @@
+import asyncio
+import logging
+import socket
+import ssl
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Union
+
+DEFAULT_SEND_QUEUE_SIZE = 1024 # Frames
+DEFAULT_COALESCE_DELAY = 0.001 # Seconds
+DEFAULT_OUTPUT_BUDGET = 4_194_304 # Bytes waiting to be sent per connection
+DEFAULT_BLOCK_TIMEOUT = 5 # Seconds
+COALESCE_MAX_BYTES = 262_144
+COALESCE_MAX_FRAMES = 512
+MAX_SEND_BUFFERS = 1024 # The usual IOV_MAX, the most buffers one sendmsg takes
+
+# Frames are queued in one of two lanes. Commands go in the interactive lane and are written
+# first, file data goes in the bulk lane. While both have frames waiting the bulk lane still gets
+# its share of every write, so a busy chat can slow a download down but never stall it
+INTERACTIVE = 0
+BULK = 1
+INTERACTIVE_WEIGHT = 4
+BULK_WEIGHT = 1
+BULK_SHARE = COALESCE_MAX_BYTES * BULK_WEIGHT // (INTERACTIVE_WEIGHT + BULK_WEIGHT)
+
+# What happens to a frame sent to a connection that is over its output budget. Block waits for
+# room and disconnects the client if none is made within the block timeout, drop throws away
+# frames that are not essential (and blocks for the rest), disconnect closes the connection
+BLOCK = 'block'
+DROP = 'drop'
+DISCONNECT = 'disconnect'
+DEFAULT_SLOW_CONSUMER_POLICY = DROP
+
+# Counter names
+BLOCKED = 'blocked'
+BLOCK_TIMEOUTS = 'block-timeouts'
+DROPPED = 'dropped'
+DISCONNECTED = 'disconnected'
+
+
+# A frame is one buffer, or the buffers it is made of when joining them would only copy the
+# data again. They are written with the other frames as they are
+Frame = Union[bytes, tuple[Union[bytes, memoryview], ...]]
+
+
+# How often each slow consumer policy has fired, shared by every connection on a server socket
+class BackpressureCounters:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__counts: Counter = Counter()
+
+
+    def increment(self, name: str) -> int:
+        with self.__lock:
+            self.__counts[name] += 1
+            return self.__counts[name]
+
+
+    def snapshot(self) -> dict[str, int]:
+        with self.__lock: return dict(self.__counts)
+
+
+
+# Frames and bytes waiting in every send queue on a server socket, so how far behind the clients
+# are as a whole can be read without walking each connection. Frames leave the depth once the
+# writer takes them and their bytes once they have been written, the same as on each queue
+class QueueMetrics:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__queue_depth = 0
+        self.__bytes_pending = 0
+        self.__peak_bytes_pending = 0
+
+
+    def add(self, frames: int, size: int) -> None:
+        with self.__lock:
+            self.__queue_depth += frames
+            self.__bytes_pending += size
+            self.__peak_bytes_pending = max(self.__peak_bytes_pending, self.__bytes_pending)
+
+
+    def snapshot(self) -> dict[str, int]:
+        with self.__lock:
+            return {
+                'queue-depth': self.__queue_depth, 'bytes-pending': self.__bytes_pending,
+                'peak-bytes-pending': self.__peak_bytes_pending
+            }
+
+
+
+# Limits shared by both queues, a connection has room while it is under its frame and byte budget.
+# A single frame larger than the whole budget is still let through once nothing else is waiting
+class OutputBudget:
+    def __init__(self, max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE, output_budget: int = DEFAULT_OUTPUT_BUDGET,
+                 policy: str = DEFAULT_SLOW_CONSUMER_POLICY, block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+                 counters: Union[BackpressureCounters, None] = None, metrics: Union[QueueMetrics, None] = None,
+                 overflow_callback: Any = None) -> None:
+
+        self.max_queue_size = max_queue_size
+        self.output_budget = output_budget
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.counters = counters or BackpressureCounters()
+        self.metrics = metrics or QueueMetrics()
+        self.overflow_callback = overflow_callback
+
+
+    # The bulk lane only gets its share of the budget, so a download waiting on a slow client
+    # leaves the rest free for commands instead of making them wait too
+    def has_room(self, queue_depth: int, bytes_pending: int, frame_size: int, bulk: bool = False) -> bool:
+        if queue_depth >= self.max_queue_size: return False
+        output_budget = self.output_budget * BULK_WEIGHT // (INTERACTIVE_WEIGHT + BULK_WEIGHT) if bulk else self.output_budget
+        return not bytes_pending or bytes_pending + frame_size <= output_budget
+
+
+    def count(self, name: str, address: tuple) -> None:
+        total = self.counters.increment(name)
+        logging.debug(f"[send queue {address}]: over its output budget, {name} (total {total})")
+
+
+    def disconnect(self, name: str, address: tuple) -> None:
+        self.count(name, address)
+        if self.overflow_callback: self.overflow_callback()
+
+
+
+# Outbound frames for one connection. Handlers only queue the encoded frame, a writer thread
+# then sends everything that has built up (waiting at most the coalesce delay for more) with a
+# single scatter/gather sendmsg, so a slow client no longer holds up the handler that is sending
+class SendQueue(threading.Thread):
+    def __init__(self, connection: socket.socket, address: tuple, max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+                 coalesce_delay: float = DEFAULT_COALESCE_DELAY, budget: Union[OutputBudget, None] = None) -> None:
+
+        super().__init__(daemon=True)
+        self.connection = connection
+        self.address = address
+        self.coalesce_delay = coalesce_delay
+        self.budget = budget or OutputBudget(max_queue_size)
+        self.closed = False
+        self.bytes_pending = 0
+        self.bulk_pending = 0
+        self.__lanes: tuple[deque, deque] = (deque(), deque())
+        self.__lock = threading.Lock()
+        self.__room = threading.Condition(self.__lock)
+        self.__ready = threading.Condition(self.__lock)
+
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.__lanes[INTERACTIVE]) + len(self.__lanes[BULK])
+
+
+    # Returns whether the frame was queued, a connection over its budget is dealt with by the policy.
+    # Without wait the frame is queued whatever the budget, for callers that made room first
+    def put(self, frame: Frame, essential: bool = True, bulk: bool = False, wait: bool = True) -> bool:
+        size = frame_size(frame)
+        with self.__lock:
+            if self.closed: return False
+            if wait and not self.__has_room(size, bulk):
+                if not self.__wait_for_room(size, essential, bulk): return False
+
+            self.bytes_pending += size
+            if bulk: self.bulk_pending += size
+            self.__lanes[BULK if bulk else INTERACTIVE].append(frame)
+            self.budget.metrics.add(1, size)
+            self.__ready.notify()
+            return True
+
+
+    # The policy applied before a frame is sealed, so a sender that has to wait does it without
+    # holding up anyone else. Returns whether the frame should be put
+    def wait_for_room(self, frame_size: int = 0, essential: bool = True, bulk: bool = False) -> bool:
+        with self.__lock:
+            if self.closed: return False
+            return self.__has_room(frame_size, bulk) or self.__wait_for_room(frame_size, essential, bulk)
+
+
+    def __has_room(self, frame_size: int, bulk: bool) -> bool:
+        if bulk: return self.budget.has_room(self.queue_depth, self.bulk_pending, frame_size, bulk=True)
+        return self.budget.has_room(self.queue_depth, self.bytes_pending, frame_size)
+
+
+    def __wait_for_room(self, frame_size: int, essential: bool, bulk: bool) -> bool:
+        if self.budget.policy == DISCONNECT:
+            self.budget.disconnect(DISCONNECTED, self.address); return False
+        if self.budget.policy == DROP and not essential:
+            self.budget.count(DROPPED, self.address); return False
+
+        self.budget.count(BLOCKED, self.address)
+        has_room = self.__room.wait_for(
+            lambda: self.closed or self.__has_room(frame_size, bulk),
+            timeout=self.budget.block_timeout
+        )
+        if self.closed: return False
+        if not has_room: self.budget.disconnect(BLOCK_TIMEOUTS, self.address)
+        return has_room
+
+
+    def close(self) -> None:
+        with self.__lock:
+            self.closed = True
+            self.__room.notify_all()
+            self.__ready.notify_all()
+
+
+    def run(self) -> None:
+        while not self.closed:
+            frames = self.__collect_frames()
+            if not frames: break
+
+            try:
+                send_frames(self.connection, frames)
+            except socket.error as err:
+                self.__debug(err.strerror)
+                self.closed = True
+                # Wakes the reading thread up so the connection is closed the usual way
+                try: self.connection.shutdown(socket.SHUT_RDWR)
+                except socket.error: pass
+
+            with self.__lock:
+                sent_size = sum(frame_size(frame) for frame in frames)
+                self.bytes_pending -= sent_size
+                self.budget.metrics.add(0, -sent_size)
+                self.__room.notify_all()
+
+        # Whatever was still queued when the connection failed is never sent
+        with self.__lock:
+            self.budget.metrics.add(-self.queue_depth, -self.bytes_pending)
+            self.__lanes[INTERACTIVE].clear()
+            self.__lanes[BULK].clear()
+            self.bytes_pending = self.bulk_pending = 0
+
+
+    # Frames queued before the connection was closed are still sent
+    def __collect_frames(self) -> list[Frame]:
+        with self.__lock:
+            self.__ready.wait_for(lambda: self.closed or self.queue_depth)
+            if not self.queue_depth: return []
+            coalesce = self.queue_depth == 1 and not self.closed
+
+        if coalesce and self.coalesce_delay: time.sleep(self.coalesce_delay)
+        with self.__lock:
+            frames, bulk_size = take_frames(*self.__lanes)
+            self.bulk_pending -= bulk_size
+            self.budget.metrics.add(-len(frames), 0)
+            if bulk_size: self.__room.notify_all()
+            return frames
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[send queue {self.address}]: {message}")
+
+
+
+# The same queue for the asyncio backend, drained by a task on the event loop instead of a thread
+class AsyncSendQueue:
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop, max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+                 coalesce_delay: float = DEFAULT_COALESCE_DELAY, budget: Union[OutputBudget, None] = None) -> None:
+
+        self.writer = writer
+        self.loop = loop
+        self.address = writer.get_extra_info('peername')
+        self.coalesce_delay = coalesce_delay
+        self.budget = budget or OutputBudget(max_queue_size)
+        self.closed = False
+        self.bytes_pending = 0
+        self.bulk_pending = 0
+        self.__lanes: tuple[deque, deque] = (deque(), deque())
+        # Frames put from the loop while the connection was over its budget, in the order they were put
+        self.__waiting: deque[tuple[Frame, bool]] = deque()
+        self.__ready = asyncio.Event()
+        self.__room = asyncio.Condition()
+
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.__lanes[INTERACTIVE]) + len(self.__lanes[BULK])
+
+
+    # Called from the executor threads that run the handlers, which wait while the connection is
+    # over its budget. Anything sent from the loop itself cannot wait, so it is queued straight
+    # away when there is room and otherwise goes behind the frames already waiting for it.
+    # Without wait a thread hands the frame to the loop and carries on, for callers that made room first
+    def put(self, frame: Frame, essential: bool = True, bulk: bool = False, wait: bool = True) -> bool:
+        if self.closed: return False
+        if in_event_loop(self.loop):
+            if wait: return self.__put_nowait(frame, essential, bulk)
+            self.__put_now(frame, bulk); return True
+        if not wait:
+            self.loop.call_soon_threadsafe(self.__put_now, frame, bulk); return True
+        future = asyncio.run_coroutine_threadsafe(self.__put(frame, essential, bulk), self.loop)
+        return future.result()
+
+
+    # The loop cannot wait, whatever it sends is left to put to deal with
+    def wait_for_room(self, frame_size: int = 0, essential: bool = True, bulk: bool = False) -> bool:
+        if self.closed: return False
+        if in_event_loop(self.loop): return True
+        future = asyncio.run_coroutine_threadsafe(self.__make_room(frame_size, essential, bulk), self.loop)
+        return future.result()
+
+
+    async def __put(self, frame: Frame, essential: bool, bulk: bool) -> bool:
+        if not await self.__make_room(frame_size(frame), essential, bulk): return False
+        self.__append(frame, bulk)
+        return True
+
+
+    async def __make_room(self, frame_size: int, essential: bool, bulk: bool) -> bool:
+        if self.closed: return False
+        if self.__waiting or not self.__has_room(frame_size, bulk):
+            return await self.__wait_for_room(frame_size, essential, bulk)
+        return True
+
+
+    def __put_now(self, frame: Frame, bulk: bool) -> None:
+        if self.closed: return
+        if self.__waiting: self.__waiting.append((frame, bulk))
+        else: self.__append(frame, bulk)
+
+
+    def __put_nowait(self, frame: Frame, essential: bool, bulk: bool) -> bool:
+        if not self.__waiting and self.__has_room(frame_size(frame), bulk):
+            self.__append(frame, bulk)
+            return True
+
+        if self.budget.policy == DISCONNECT:
+            self.budget.disconnect(DISCONNECTED, self.address); return False
+        if self.budget.policy == DROP and not essential:
+            self.budget.count(DROPPED, self.address); return False
+
+        self.__waiting.append((frame, bulk))
+        if len(self.__waiting) == 1:
+            self.budget.count(BLOCKED, self.address)
+            self.loop.create_task(self.__put_waiting())
+        return True
+
+
+    # Moves the frames put from the loop into their lanes one at a time as room is made
+    async def __put_waiting(self) -> None:
+        while self.__waiting and not self.closed:
+            frame, bulk = self.__waiting[0]
+            try:
+                async with self.__room:
+                    await asyncio.wait_for(self.__room.wait_for(
+                        lambda: self.closed or self.__has_room(frame_size(frame), bulk)
+                    ), self.budget.block_timeout)
+            except asyncio.TimeoutError:
+                self.budget.disconnect(BLOCK_TIMEOUTS, self.address)
+                break
+            if self.closed: break
+            self.__waiting.popleft()
+            self.__append(frame, bulk)
+
+        self.__waiting.clear()
+        await self.__notify_room()
+
+
+    def __append(self, frame: Frame, bulk: bool) -> None:
+        size = frame_size(frame)
+        self.bytes_pending += size
+        if bulk: self.bulk_pending += size
+        self.__lanes[BULK if bulk else INTERACTIVE].append(frame)
+        self.budget.metrics.add(1, size)
+        self.__ready.set()
+
+
+    def __has_room(self, frame_size: int, bulk: bool) -> bool:
+        if bulk: return self.budget.has_room(self.queue_depth, self.bulk_pending, frame_size, bulk=True)
+        return self.budget.has_room(self.queue_depth, self.bytes_pending, frame_size)
+
+
+    async def __wait_for_room(self, frame_size: int, essential: bool, bulk: bool) -> bool:
+        if self.budget.policy == DISCONNECT:
+            self.budget.disconnect(DISCONNECTED, self.address); return False
+        if self.budget.policy == DROP and not essential:
+            self.budget.count(DROPPED, self.address); return False
+
+        self.budget.count(BLOCKED, self.address)
+        try:
+            async with self.__room:
+                await asyncio.wait_for(self.__room.wait_for(
+                    lambda: self.closed or (not self.__waiting and self.__has_room(frame_size, bulk))
+                ), self.budget.block_timeout)
+        except asyncio.TimeoutError:
+            self.budget.disconnect(BLOCK_TIMEOUTS, self.address)
+            return False
+        return not self.closed
+
+
+    def close(self) -> None:
+        self.closed = True
+        self.loop.call_soon_threadsafe(self.__close)
+
+
+    def __close(self) -> None:
+        self.__ready.set()
+        self.loop.create_task(self.__notify_room())
+
+
+    async def __notify_room(self) -> None:
+        async with self.__room: self.__room.notify_all()
+
+
+    async def run(self) -> None:
+        while not self.closed:
+            frames = await self.__collect_frames()
+            if not frames: break
+
+            try:
+                self.writer.writelines(frame_buffers(frames))
+                await self.writer.drain()
+            except ConnectionError:
+                self.closed = True
+                self.writer.close()
+            sent_size = sum(frame_size(frame) for frame in frames)
+            self.bytes_pending -= sent_size
+            self.budget.metrics.add(0, -sent_size)
+            await self.__notify_room()
+
+        # Whatever was still queued when the connection failed is never sent
+        self.budget.metrics.add(-self.queue_depth, -self.bytes_pending)
+        self.__lanes[INTERACTIVE].clear()
+        self.__lanes[BULK].clear()
+        self.bytes_pending = self.bulk_pending = 0
+
+
+    async def __collect_frames(self) -> list[Frame]:
+        while not self.queue_depth:
+            if self.closed: return []
+            self.__ready.clear()
+            await self.__ready.wait()
+
+        if self.queue_depth == 1 and not self.closed and self.coalesce_delay:
+            await asyncio.sleep(self.coalesce_delay)
+        frames, bulk_size = take_frames(*self.__lanes)
+        self.bulk_pending -= bulk_size
+        self.budget.metrics.add(-len(frames), 0)
+        return frames
+
+
+
+# Interactive frames are taken first, leaving room for the bulk lane's share if it has anything
+# waiting. At least one frame is always taken, however large. Returns the frames and how many
+# of their bytes came from the bulk lane
+def take_frames(interactive: deque, bulk: deque) -> tuple[list[Frame], int]:
+    frames: list[Frame] = []
+    size = 0
+    reserved = BULK_SHARE if bulk else 0
+    while interactive and len(frames) < COALESCE_MAX_FRAMES and (not frames or size < COALESCE_MAX_BYTES - reserved):
+        frames.append(interactive.popleft())
+        size += frame_size(frames[-1])
+
+    interactive_size = size
+    while bulk and len(frames) < COALESCE_MAX_FRAMES and (not frames or size < COALESCE_MAX_BYTES):
+        frames.append(bulk.popleft())
+        size += frame_size(frames[-1])
+    return frames, size - interactive_size
+
+
+
+# Writes every frame with as few sendmsg calls as possible, carrying on after partial writes.
+# TLS sockets cannot scatter/gather, so their frames are joined into one record write
+def send_frames(connection: socket.socket, frames: list[Frame]) -> None:
+    if isinstance(connection, ssl.SSLSocket) or not hasattr(connection, 'sendmsg'):
+        connection.sendall(b''.join(frame_buffers(frames)))
+        return
+
+    buffers = [memoryview(buffer) for buffer in frame_buffers(frames)]
+    while buffers:
+        sent = connection.sendmsg(buffers[:MAX_SEND_BUFFERS])
+        sent_buffers = 0
+        while sent_buffers < len(buffers) and sent >= len(buffers[sent_buffers]):
+            sent -= len(buffers[sent_buffers])
+            sent_buffers += 1
+        buffers = buffers[sent_buffers:]
+        if buffers and sent: buffers[0] = buffers[0][sent:]
+
+
+def frame_size(frame: Frame) -> int:
+    if isinstance(frame, tuple): return sum(len(buffer) for buffer in frame)
+    return len(frame)
+
+
+def frame_buffers(frames: list[Frame]) -> list[Union[bytes, memoryview]]:
+    buffers: list[Union[bytes, memoryview]] = []
+    for frame in frames:
+        if isinstance(frame, tuple): buffers.extend(frame)
+        else: buffers.append(frame)
+    return buffers
+
+
+def in_event_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
@@ -1,156 +1,463 @@
-import json
-import logging
-import socket
-import threading
-from typing import Any, Union
-
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
-from networking.crypto_utils import CryptoUtils, KeyType
-from static.commands import *
-from static.shared_types import SocketCommand, UserDetails
-
-
-class ServerSocket:
-    def __init__(self, server_private_key_path: str, client_public_key_path: str, 
-                 port: int, format: str, backlog: int, header_size: int, recv_callback: Any,
-                 user_disconnect_callback: Any) -> None:
-        
-        # Initiate attributes
-        self.backlog = backlog
-        self.port = port
-        self.format = format
-        self.header_size = header_size
-
-        # Load the keys for encryption 
-        self.__client_public_key: RSAPublicKey = CryptoUtils.load_key_from_file(client_public_key_path, KeyType.PUBLIC)
-        self.__server_private_key: RSAPrivateKey = CryptoUtils.load_key_from_file(server_private_key_path, KeyType.PRIVATE)
-
-        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.__address = (socket.gethostname(), port)
-        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-
-        self.recv_callback = recv_callback
-        self.user_disconnect_callback = user_disconnect_callback
-        self.user_connections: dict[tuple, User] = dict()
-        self.initiate_socket()
-
-
-    def initiate_socket(self) -> None:
-        try:
-            self.__socket.bind(self.__address)
-            self.__socket.listen(self.backlog)
-            self.__debug(f"listening on port {self.port}")
-            threading.Thread(target=self.listen_for_connections).start()
-
-        except socket.error as err:
-            self.__debug(err.strerror)
-            self.__socket.close()
-
-
-    def listen_for_connections(self) -> None:
-        while True:
-            try:
-                connection, address = self.__socket.accept()
-                user = User(
-                    address=address,
-                    header_size=self.header_size,
-                    client_public_key=self.__client_public_key,
-                    server_private_key=self.__server_private_key,
-                    client_socket=connection,
-                    close_callback=self.close_connection,
-                    recv_callback=self.recv_callback,
-                )
-                user.start()
-                self.user_connections[address] = user
-                self.__debug(f"current connections: {threading.active_count()-2}")
-
-            except socket.error as err:
-                self.__debug(err.strerror)
-
-
-    def close_connection(self, address: tuple) -> None:
-        user = self.user_connections.get(address)
-        self.user_disconnect_callback(user)
-        self.user_connections.pop(address)
-
-
-    def __debug(self, message: str) -> None:
-        logging.debug(f"[server socket]: {message}")
-
-
-
-class User(threading.Thread):
-    def __init__(self, header_size: int, address: tuple, client_socket: socket.socket,
-        client_public_key: RSAPublicKey, server_private_key: RSAPrivateKey,
-        close_callback: Any, recv_callback: Any) -> None:
-
-        super().__init__()
-        # Keys for crypto utils
-        self.client_public_key = client_public_key
-        self.server_private_key = server_private_key
-        self.header_size = header_size
-        self.close_callback = close_callback
-        self.recv_callback = recv_callback
-        self.client_socket = client_socket
-        self.address = address
-
-        # User attributes
-        self.cached_user_details: Union[UserDetails, None] = None
-        self.session_active: bool = False
-        self.user_status: str = str()
-        self.user_id: int = int()
-    
-
-    def cache_user_details(self, user_details: UserDetails) -> None:
-        self.cached_user_details = user_details
-
-
-    def activate_user(self, user_id: int, user_details: UserDetails) -> None:
-        self.user_id = user_id
-        self.user_details = user_details
-        self.session_active = True
-        self.cached_user_details = None
-
-
-    def run(self) -> None:
-        while True:
-            try:
-                header = self.client_socket.recv(self.header_size)
-                if not header:
-                    raise (socket.error)
-                command_length = int.from_bytes(header, byteorder="big")
-                encrypted_command = self.client_socket.recv(command_length)
-                if encrypted_command: self.__receive_command(encrypted_command)
-
-            except socket.error as err:
-                self.close_user()
-                self.__debug(err.strerror)
-                break
-
-
-    def __receive_command(self, encrypted_command: bytes) -> None:
-        decrypted_command = CryptoUtils.decrypt_data(encrypted_command, self.server_private_key)
-        if not decrypted_command: self.__debug(f"could not decrypt: {decrypted_command}"); return
-
-        raw_command: SocketCommand = json.loads(decrypted_command.decode())
-        self.__debug(raw_command)
-        self.recv_callback(self, raw_command)
-
-
-    def send_command(self, command: SocketCommand) -> None:
-        json_command = json.dumps(command)
-        encrypted_command = CryptoUtils.encrypt_data(json_command.encode(), self.client_public_key)
-        if not encrypted_command: self.__debug(f"command too large: {encrypted_command}"); return
-
-        header = len(encrypted_command).to_bytes(self.header_size, byteorder="big")
-        self.client_socket.sendall(header + encrypted_command)
-
-
-    def close_user(self) -> None:
-        self.client_socket.close()
-        self.close_callback(self.address)
-
-
-    def __debug(self, message: Union[str, SocketCommand]) -> None:
-        logging.debug(f"[user {self.address}]: {message}")
-
+import logging
+import socket
+import ssl
+import threading
+import time
+from typing import Any, Iterable, Optional, Union
+
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from networking.binary_frames import is_binary_frame, pack_binary_frame, pack_binary_header, unpack_binary_frame
+from networking.command_codec import CODECS, JSON, Codec, CodecError, decode_command
+from networking.compression import DEFAULT_COMPRESSION_THRESHOLD, CompressionError, Compressor, get_dictionary_id, load_dictionary
+from networking.connection_registry import ConnectionRegistry
+from networking.connection_sweeper import DEFAULT_HEARTBEAT_INTERVAL, DEFAULT_IDLE_TIMEOUT, ConnectionSweeper
+from networking.crypto_pool import DEFAULT_CRYPTO_BATCH_SIZE, DEFAULT_CRYPTO_WORKERS, CryptoPool
+from networking.crypto_utils import CryptoUtils, KeyType, PlainCipher, Role, SessionCipher
+from networking.fanout import Fanout, pack_frame
+from networking.framing import DEFAULT_MAX_FRAME_SIZE, FrameDecoder
+from networking.handshake import Capabilities, HandshakeError, create_hello_reply, is_hello, negotiate, read_session_key
+from networking.send_queue import (
+    DEFAULT_BLOCK_TIMEOUT,
+    DEFAULT_COALESCE_DELAY,
+    DEFAULT_OUTPUT_BUDGET,
+    DEFAULT_SEND_QUEUE_SIZE,
+    DEFAULT_SLOW_CONSUMER_POLICY,
+    BULK,
+    INTERACTIVE,
+    BackpressureCounters,
+    OutputBudget,
+    QueueMetrics,
+    SendQueue,
+)
+from networking.tls import DEFAULT_TLS_CERTIFICATE_PATH, TLS_HANDSHAKE_TIMEOUT, create_server_context
+from static.commands import *
+from static.shared_types import SocketCommand, UserDetails
+
+
+class ServerSocket:
+    def __init__(self, server_private_key_path: str, client_public_key_path: str, 
+                 port: int, format: str, backlog: int, header_size: int, recv_callback: Any,
+                 user_disconnect_callback: Any, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+                 send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE, coalesce_delay: float = DEFAULT_COALESCE_DELAY,
+                 compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD, reuse_port: bool = False,
+                 heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 output_budget: int = DEFAULT_OUTPUT_BUDGET, slow_consumer_policy: str = DEFAULT_SLOW_CONSUMER_POLICY,
+                 block_timeout: float = DEFAULT_BLOCK_TIMEOUT, binary_callback: Any = None,
+                 crypto_workers: int = DEFAULT_CRYPTO_WORKERS, crypto_batch_size: int = DEFAULT_CRYPTO_BATCH_SIZE,
+                 tls: bool = False, tls_certificate_path: str = DEFAULT_TLS_CERTIFICATE_PATH,
+                 tls_private_key_path: Optional[str] = None) -> None:
+        
+        # Initiate attributes
+        self.backlog = backlog
+        self.port = port
+        self.format = format
+        self.header_size = header_size
+        self.max_frame_size = max_frame_size
+        self.send_queue_size = send_queue_size
+        self.coalesce_delay = coalesce_delay
+        self.output_budget = output_budget
+        self.slow_consumer_policy = slow_consumer_policy
+        self.block_timeout = block_timeout
+        self.backpressure_counters = BackpressureCounters()
+        self.queue_metrics = QueueMetrics()
+        self.compression_threshold = compression_threshold
+        self.compression_dictionary = load_dictionary()
+
+        # Load the keys for encryption 
+        self.__client_public_key: RSAPublicKey = CryptoUtils.load_key_from_file(client_public_key_path, KeyType.PUBLIC)
+        self.__server_private_key: RSAPrivateKey = CryptoUtils.load_key_from_file(server_private_key_path, KeyType.PRIVATE)
+
+        # RSA for every user is shared between worker processes instead of each user's thread
+        self.crypto_pool: Union[CryptoPool, None] = None
+        if crypto_workers: self.crypto_pool = CryptoPool(server_private_key_path, crypto_workers, crypto_batch_size)
+
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__address = (socket.gethostname(), port)
+
+        # Connections can be wrapped in TLS instead, the frames inside are then only framed and compressed.
+        # The server's RSA key is used unless a certificate from a CA comes with its own key
+        self.tls_context: Union[ssl.SSLContext, None] = None
+        if tls:
+            self.tls_context = create_server_context(
+                tls_private_key_path or server_private_key_path, tls_certificate_path, self.__address[0]
+            )
+
+        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        # Lets every worker process listen on the same port, the kernel shares new connections between them
+        if reuse_port: self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        self.recv_callback = recv_callback
+        self.binary_callback = binary_callback
+        self.user_disconnect_callback = user_disconnect_callback
+        self.connections = ConnectionRegistry()
+        self.sweeper = ConnectionSweeper(self.connections, heartbeat_interval, idle_timeout)
+        self.__listen_thread: Union[threading.Thread, None] = None
+        self.initiate_socket()
+
+
+    def initiate_socket(self) -> None:
+        try:
+            self.__socket.bind(self.__address)
+            self.__socket.listen(self.backlog)
+            self.__debug(f"listening on port {self.port}")
+            self.__listen_thread = threading.Thread(target=self.listen_for_connections)
+            self.__listen_thread.start()
+            self.sweeper.start()
+
+        except socket.error as err:
+            self.__debug(err.strerror)
+            self.__socket.close()
+
+
+    # Connections are accepted on their own thread, this only keeps the caller waiting the same
+    # way the asyncio backend does
+    def serve_forever(self) -> None:
+        if self.__listen_thread: self.__listen_thread.join()
+
+
+    def listen_for_connections(self) -> None:
+        while True:
+            try:
+                connection, address = self.__socket.accept()
+                connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+                # The send queue already coalesces frames, Nagle would only hold back the hello reply
+                # behind the TLS session tickets. The asyncio backend turns it off too
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.tls_context: connection = self.tls_context.wrap_socket(connection, server_side=True, do_handshake_on_connect=False)
+                user = User(
+                    address=address,
+                    header_size=self.header_size,
+                    max_frame_size=self.max_frame_size,
+                    client_public_key=self.__client_public_key,
+                    server_private_key=self.__server_private_key,
+                    client_socket=connection,
+                    budget=self.create_budget(),
+                    coalesce_delay=self.coalesce_delay,
+                    compression_threshold=self.compression_threshold,
+                    compression_dictionary=self.compression_dictionary,
+                    close_callback=self.close_connection,
+                    recv_callback=self.recv_callback,
+                    binary_callback=self.binary_callback,
+                    crypto_pool=self.crypto_pool,
+                    tls=bool(self.tls_context)
+                )
+                self.connections.add(user)
+                user.start()
+                self.__debug(f"current connections: {len(self.connections)}")
+
+            except socket.error as err:
+                self.__debug(err.strerror)
+
+
+    # Each connection gets its own budget, the counters and metrics are shared so they cover the whole server
+    def create_budget(self) -> OutputBudget:
+        return OutputBudget(
+            self.send_queue_size, self.output_budget, self.slow_consumer_policy,
+            self.block_timeout, self.backpressure_counters, self.queue_metrics
+        )
+
+
+    def close_connection(self, address: tuple) -> None:
+        user = self.connections.get(address)
+        if not user: return
+        self.connections.remove(user)
+        self.user_disconnect_callback(user)
+
+
+    def __debug(self, message: str) -> None:
+        logging.debug(f"[server socket]: {message}")
+
+
+
+# Session state and command encoding shared by the threaded and asyncio backends
+class BaseUser:
+    def __init__(self, header_size: int, max_frame_size: int, address: tuple, client_public_key: RSAPublicKey, 
+                 server_private_key: RSAPrivateKey, close_callback: Any, recv_callback: Any,
+                 compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD, compression_dictionary: bytes = b'',
+                 binary_callback: Any = None, crypto_pool: Optional[CryptoPool] = None, tls: bool = False) -> None:
+
+        # Keys for crypto utils
+        self.client_public_key = client_public_key
+        self.server_private_key = server_private_key
+        self.crypto_pool = crypto_pool
+        self.tls = tls
+        self.header_size = header_size
+        self.max_frame_size = max_frame_size
+        self.close_callback = close_callback
+        self.recv_callback = recv_callback
+        self.binary_callback = binary_callback
+        self.address = address
+
+        # Frames waiting to be written, set up by each backend. A frame is sealed and queued under
+        # its lane's lock, so frames reach the client in the order their nonces were counted in
+        self.send_queue: Union[SendQueue, Any] = None
+        self.send_locks = (threading.Lock(), threading.Lock())
+
+        # Set once the client has sent its session key, until then (or for old clients
+        # that never send one) every frame is encrypted with RSA. Over TLS the hello is sent as it
+        # is and the record layer encrypts everything
+        self.session_cipher: Union[SessionCipher, PlainCipher, None] = None
+
+        # Agreed in the hello that carries the session key, old clients keep the version 1 defaults.
+        # Session frames start with a compression flag byte
+        self.capabilities = Capabilities(max_frame_size=max_frame_size)
+        self.compression_threshold = compression_threshold
+        self.compression_dictionary = compression_dictionary
+        self.compressor = Compressor(max_size=max_frame_size)
+        self.codec: Codec = CODECS[JSON]
+        # A new client's hello is the first frame it sends, every frame after it is a session frame
+        self.first_frame = True
+
+        # Refreshed by every frame, connections that stay quiet are pinged and then closed by the sweeper
+        self.last_activity = time.monotonic()
+
+        # User attributes
+        self.cached_user_details: Union[UserDetails, None] = None
+        self.session_active: bool = False
+        self.user_status: str = str()
+        self.user_id: int = int()
+    
+
+    def cache_user_details(self, user_details: UserDetails) -> None:
+        self.cached_user_details = user_details
+
+
+    def activate_user(self, user_id: int, user_details: UserDetails) -> None:
+        self.user_id = user_id
+        self.user_details = user_details
+        self.session_active = True
+        self.cached_user_details = None
+
+
+    def deactivate_user(self) -> None:
+        self.user_id = int()
+        self.session_active = False
+
+
+    def receive_command(self, encrypted_command: Union[bytes, memoryview]) -> None:
+        self.last_activity = time.monotonic()
+        self.handle_frame(self.decrypt_command(encrypted_command))
+
+
+    # Old clients encrypt every frame with RSA, so with a crypto pool everything read at once is
+    # decrypted together. The first frame is decrypted on its own and the read is split there, so
+    # when it is a hello the frames read with it go to the session key instead of through RSA.
+    # A hello sent later only costs the rest of that read, which is then decrypted again
+    def receive_commands(self, encrypted_commands: Iterable[Union[bytes, memoryview]]) -> None:
+        if not self.crypto_pool or self.session_cipher or self.tls:
+            for encrypted_command in encrypted_commands: self.receive_command(encrypted_command)
+            return
+
+        encrypted_commands = [bytes(encrypted_command) for encrypted_command in encrypted_commands]
+        if not encrypted_commands: return
+        if self.first_frame:
+            self.first_frame = False
+            self.receive_command(encrypted_commands[0])
+            self.receive_commands(encrypted_commands[1:]); return
+
+        self.last_activity = time.monotonic()
+        for encrypted_command, decrypted_command in zip(encrypted_commands, self.crypto_pool.decrypt(encrypted_commands)):
+            if self.session_cipher: decrypted_command = self.session_cipher.decrypt(encrypted_command)
+            self.handle_frame(decrypted_command)
+
+
+    def decrypt_command(self, encrypted_command: Union[bytes, memoryview]) -> Union[bytes, None]:
+        if self.session_cipher: return self.session_cipher.decrypt(encrypted_command)
+        if self.tls: return bytes(encrypted_command)
+        if self.crypto_pool: return self.crypto_pool.decrypt([bytes(encrypted_command)])[0]
+        return CryptoUtils.decrypt_data(bytes(encrypted_command), self.server_private_key)
+
+
+    def handle_frame(self, decrypted_command: Union[bytes, None]) -> None:
+        if not decrypted_command: self.debug(f"could not decrypt: {decrypted_command}"); return
+
+        # File data skips the codec and the handlers, it goes straight to the transfer it belongs to
+        if self.session_cipher and is_binary_frame(decrypted_command):
+            if self.binary_callback: self.deliver(self.binary_callback, self, *unpack_binary_frame(decrypted_command))
+            return
+
+        if self.session_cipher:
+            try: decrypted_command = self.compressor.decompress(decrypted_command)
+            except CompressionError as err: self.debug(f"could not decompress: {err}"); return
+
+        try: raw_command: SocketCommand = decode_command(decrypted_command)
+        except CodecError as err: self.debug(f"could not decode: {err}"); return
+        if not isinstance(raw_command, dict): self.debug(f"command is not an object: {raw_command}"); return
+        if not self.session_cipher and is_hello(raw_command):
+            self.start_session(raw_command); return
+        if not self.session_cipher and self.tls: self.debug('command sent before the hello'); return
+
+        # Heartbeats are answered here and never reach the server's handlers
+        command_name = raw_command.get('command_name')
+        if command_name == InboundCommands.Ping.value: self.send_command(OutboundCommands.pong()); return
+        if command_name == InboundCommands.Pong.value: return
+
+        self.debug(raw_command)
+        self.deliver(self.recv_callback, self, raw_command)
+
+
+    # Hands a command or file data to the server. The threaded backend is already off the accept
+    # thread, so the callback runs here
+    def deliver(self, callback: Any, *args: Any) -> None:
+        callback(*args)
+
+
+    # The hello carries the session key and everything the client supports. What was agreed is
+    # sent back as the first session frame, which is still plain JSON so any client can read it.
+    # A hello that cannot be read raises HandshakeError, which the backends close the connection on
+    def start_session(self, hello: dict) -> None:
+        capabilities = negotiate(hello, self.max_frame_size, get_dictionary_id(self.compression_dictionary), self.tls)
+        if self.tls: self.session_cipher = PlainCipher()
+        else: self.session_cipher = SessionCipher(read_session_key(hello), Role.SERVER)
+        self.send_command(create_hello_reply(capabilities))
+
+        self.capabilities = capabilities
+        self.codec = CODECS[capabilities.codec]
+        self.compressor = Compressor(
+            capabilities.compression, self.compression_dictionary if capabilities.dictionary else b'',
+            self.compression_threshold, self.max_frame_size
+        )
+        self.debug(f'session started: {capabilities}')
+
+
+    def encode_command(self, command: SocketCommand, lane: int = INTERACTIVE) -> Union[bytes, None]:
+        encoded_command = self.codec.encode(command)
+        if self.session_cipher: encrypted_command = self.session_cipher.encrypt(self.compressor.compress(encoded_command), lane)
+        else: encrypted_command = CryptoUtils.encrypt_data(encoded_command, self.client_public_key)
+        if not encrypted_command: self.debug(f"command too large: {encrypted_command}"); return None
+        return self.check_frame(pack_frame(encrypted_command, self.header_size))
+
+
+    # Only the session cipher needs the connection's own key, everything before it is shared
+    # with the other recipients
+    def encode_fanout(self, fanout: Fanout, lane: int = INTERACTIVE) -> Union[bytes, None]:
+        if isinstance(self.session_cipher, SessionCipher):
+            encrypted_command = self.session_cipher.encrypt(fanout.compress(self.codec, self.compressor), lane)
+            return self.check_frame(pack_frame(encrypted_command, self.header_size))
+
+        if self.session_cipher: frame = fanout.compressed_frame(self.codec, self.compressor, self.header_size)
+        else: frame = fanout.sealed_frame(self.codec, self.client_public_key, self.header_size)
+        if not frame: self.debug(f"command too large: {fanout.command_name}"); return None
+        return self.check_frame(frame)
+
+
+    def check_frame(self, frame: bytes) -> Union[bytes, None]:
+        if self.capabilities.max_frame_size and len(frame) - self.header_size > self.capabilities.max_frame_size:
+            self.debug(f"command of {len(frame) - self.header_size} bytes is over the client's frame limit"); return None
+        return frame
+
+
+    # Commands that can be lost without harm are dropped first when the client falls behind. The
+    # commands that open and close a file stream are queued with its data so they stay in order.
+    # The slow consumer policy is applied before the lane is locked, so a sender waiting for room
+    # never holds up the others, and a droppable frame is thrown away instead of queueing for the lock
+    def send_command(self, command: Union[SocketCommand, Fanout]) -> None:
+        command_name = command.command_name if isinstance(command, Fanout) else command.get('command_name')
+        lane = BULK if command_name in BULK_COMMANDS else INTERACTIVE
+        essential = command_name not in DROPPABLE_COMMANDS
+        if not self.send_queue.wait_for_room(essential=essential, bulk=lane == BULK): return
+        with self.send_locks[lane]:
+            if isinstance(command, Fanout): frame = self.encode_fanout(command, lane)
+            else: frame = self.encode_command(command, lane)
+            if not frame: return
+            self.send_queue.put(frame, essential=essential, bulk=lane == BULK, wait=False)
+
+
+    # Raw file data for clients that agreed to file transfers, never dropped as the file would be corrupt.
+    # The data is only copied into the plaintext that is sealed, the frame is queued as its header and
+    # the sealed data. Over TLS nothing is sealed, so the data is queued as it is and written from there
+    def send_binary(self, transfer_id: int, offset: int, data: Union[bytes, memoryview]) -> bool:
+        if not self.session_cipher or not self.capabilities.file_transfer: return False
+        if not self.send_queue.wait_for_room(len(data), bulk=True): return False
+        with self.send_locks[BULK]:
+            if isinstance(self.session_cipher, SessionCipher):
+                encrypted_data = self.session_cipher.encrypt(pack_binary_frame(transfer_id, offset, data), BULK)
+                frame = (len(encrypted_data).to_bytes(self.header_size, byteorder="big"), encrypted_data)
+            else:
+                binary_header = pack_binary_header(transfer_id, offset)
+                frame = ((len(binary_header) + len(data)).to_bytes(self.header_size, byteorder="big"), binary_header, data)
+            return self.send_queue.put(frame, bulk=True, wait=False)
+
+
+    @property
+    def heartbeat(self) -> bool:
+        return self.capabilities.heartbeat
+
+
+    # Skipped while frames are still queued, a ping would only wait behind them (or block the
+    # sweeper if the queue is full because the peer has stopped reading)
+    def send_ping(self) -> None:
+        if not self.send_queue.queue_depth: self.send_command(OutboundCommands.ping())
+
+
+    # Called by the sweeper, wakes the connection's reader up so it closes the usual way
+    def abort(self) -> None:
+        raise NotImplementedError
+
+
+    def close_user(self) -> None:
+        raise NotImplementedError
+
+
+    def debug(self, message: Union[str, SocketCommand]) -> None:
+        logging.debug(f"[user {self.address}]: {message}")
+
+
+
+class User(BaseUser, threading.Thread):
+    def __init__(self, header_size: int, max_frame_size: int, address: tuple, client_socket: socket.socket,
+        client_public_key: RSAPublicKey, server_private_key: RSAPrivateKey, budget: OutputBudget,
+        coalesce_delay: float, close_callback: Any, recv_callback: Any,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD, compression_dictionary: bytes = b'',
+        binary_callback: Any = None, crypto_pool: Optional[CryptoPool] = None, tls: bool = False) -> None:
+
+        threading.Thread.__init__(self)
+        BaseUser.__init__(
+            self, header_size=header_size, max_frame_size=max_frame_size, address=address, 
+            client_public_key=client_public_key, server_private_key=server_private_key,
+            close_callback=close_callback, recv_callback=recv_callback,
+            compression_threshold=compression_threshold, compression_dictionary=compression_dictionary,
+            binary_callback=binary_callback, crypto_pool=crypto_pool, tls=tls
+        )
+        self.client_socket = client_socket
+        self.frame_decoder = FrameDecoder(header_size, max_frame_size)
+        budget.overflow_callback = self.abort
+        self.send_queue = SendQueue(client_socket, address, coalesce_delay=coalesce_delay, budget=budget)
+
+
+    def run(self) -> None:
+        self.send_queue.start()
+        try:
+            if self.tls: self.start_tls()
+            while True:
+                if not self.frame_decoder.recv_into(self.client_socket):
+                    raise (socket.error)
+                self.receive_commands(self.frame_decoder.frames())
+
+        except socket.error as err:
+            self.close_user()
+            self.debug(err.strerror)
+
+        except HandshakeError as err:
+            self.close_user()
+            self.debug(f"bad hello: {err}")
+
+
+    # The handshake runs on the user's own thread, so a slow client never holds up accepting others
+    def start_tls(self) -> None:
+        self.client_socket.settimeout(TLS_HANDSHAKE_TIMEOUT)
+        self.client_socket.do_handshake()
+        self.client_socket.settimeout(None)
+
+
+    def abort(self) -> None:
+        try: self.client_socket.shutdown(socket.SHUT_RDWR)
+        except socket.error: pass
+
+
+    def close_user(self) -> None:
+        self.send_queue.close()
+        self.client_socket.close()
+        self.close_callback(self.address)
@@ -0,0 +1,101 @@
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_BLOB_STORE_PATH = 'attachments'
+SHARD_DEPTH = 2 # Directory levels, each named after the next two characters of the hash
+FILE_HASH_PATTERN = re.compile('[0-9a-f]{64}')
+LOCK_STRIPES = 256 # One lock for each value of a hash's first byte
+
+
+# Attachments stored on disk by the SHA-256 of their contents, so the same worksheet sent to
+# dozens of chats is only written once. Only the hash goes into the database. Blobs are spread
+# over sharded directories to keep each one small, and they are read through mmap so sending a
+# file never copies the whole thing into Python memory
+class BlobStore:
+    def __init__(self, root: str = DEFAULT_BLOB_STORE_PATH) -> None:
+        self.root = root
+        self.temp_path = os.path.join(root, 'tmp')
+        self.lock_path = os.path.join(root, 'locks')
+        self.__locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        os.makedirs(self.temp_path, exist_ok=True)
+        os.makedirs(self.lock_path, exist_ok=True)
+
+
+    def get_path(self, file_hash: str) -> str:
+        if not is_file_hash(file_hash):
+            raise ValueError(f'not a sha-256 hash: {file_hash}')
+        shards = [file_hash[index * 2:index * 2 + 2] for index in range(SHARD_DEPTH)]
+        return os.path.join(self.root, *shards, file_hash)
+
+
+    def has(self, file_hash: str) -> bool:
+        return os.path.exists(self.get_path(file_hash))
+
+
+    # Written to a temporary file first and then renamed into place, so a blob is never seen half
+    # written and two uploads of the same file at once cannot corrupt it. Returns False for a duplicate
+    def put(self, file_hash: str, source: Union[bytes, bytearray, memoryview, BinaryIO]) -> bool:
+        path = self.get_path(file_hash)
+        if os.path.exists(path): return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.temp_path)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                if isinstance(source, (bytes, bytearray, memoryview)): temp_file.write(source)
+                else: shutil.copyfileobj(source, temp_file)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path): os.unlink(temp_path)
+            raise
+        return True
+
+
+    # The contents as a read only memory map, pages are only read from disk as they are sent.
+    # Views of it may still be queued to be written once the caller is done, the map is then
+    # unmapped when the last of them is let go instead
+    @contextmanager
+    def map(self, file_hash: str) -> Iterator[Union[mmap.mmap, bytes]]:
+        with open(self.get_path(file_hash), 'rb') as blob_file:
+            if not os.fstat(blob_file.fileno()).st_size: yield b''; return
+            contents = mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield contents
+        finally:
+            try: contents.close()
+            except BufferError: pass
+
+
+    def delete(self, file_hash: str) -> None:
+        try: os.unlink(self.get_path(file_hash))
+        except FileNotFoundError: pass
+
+
+    # Held while a blob gains or loses a reference, so checking that nothing refers to it and
+    # deleting it can never happen around another upload of the same file. Threads wait on a
+    # lock in memory, and where flock exists the worker processes sharing the store on a lock file
+    @contextmanager
+    def lock(self, file_hash: str) -> Iterator[None]:
+        if not is_file_hash(file_hash): raise ValueError(f'not a sha-256 hash: {file_hash}')
+        stripe = int(file_hash[:2], 16)
+        with self.__locks[stripe]:
+            if not fcntl: yield; return
+            with open(os.path.join(self.lock_path, f'{stripe:02x}'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                yield
+
+
+# A lower case hex SHA-256, the only names blobs are stored under
+def is_file_hash(file_hash: str) -> bool:
+    return isinstance(file_hash, str) and bool(FILE_HASH_PATTERN.fullmatch(file_hash))
@@ -0,0 +1,93 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_DISPATCH_WORKERS = 8 # Threads, none means handlers run on each connection's own thread
+DEFAULT_MAX_PENDING_COMMANDS = 64 # Per connection, its reader waits once this many are queued
+SLOW_QUEUE_WAIT = 1 # Seconds a command can wait for a worker before it is logged
+
+
+# Runs handlers on a fixed number of worker threads, which also bounds how much database work
+# happens at once. Every worker has its own queue and commands are sharded by key, the user id
+# once logged in, so each user's commands run one at a time in the order they arrived. A
+# connection stays on its shard until its queued commands have run, so the commands it sends
+# right after logging in cannot overtake the login. How long commands wait for a worker is
+# recorded per command name. The initializer runs once on each worker before it takes commands
+class Dispatcher:
+    def __init__(self, workers: int = DEFAULT_DISPATCH_WORKERS, max_pending: int = DEFAULT_MAX_PENDING_COMMANDS,
+                 initializer: Optional[Callable] = None) -> None:
+        self.workers = max(workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self.initializer = initializer
+        self.__queues: list[queue.SimpleQueue] = [queue.SimpleQueue() for _ in range(self.workers)]
+        self.__lock = threading.Lock()
+        self.__room = threading.Condition(self.__lock)
+        self.__connections: dict[Any, list[int]] = dict()
+        self.__queue_waits: dict[str, list[float]] = dict()
+
+        for index, work_queue in enumerate(self.__queues):
+            threading.Thread(target=self.__work, args=(work_queue,), name=f'dispatcher-{index}', daemon=True).start()
+
+
+    # Waits while the connection already has max pending commands queued, so a client sending
+    # faster than it is served is stopped being read instead of filling memory. Callers that
+    # must not wait (such as an event loop) pass block=False
+    def submit(self, connection: Any, key: Hashable, name: str, function: Callable, *args: Any, block: bool = True) -> None:
+        with self.__room:
+            if block: self.__room.wait_for(lambda: self.__pending(connection) < self.max_pending)
+            shard = self.__connections.get(connection)
+            if shard is None: shard = self.__connections[connection] = [hash(key) % self.workers, 0]
+            shard[1] += 1
+        self.__queues[shard[0]].put((time.monotonic(), connection, name, function, args))
+
+
+    # Number of commands, mean and longest wait in seconds for each command name
+    def queue_waits(self) -> dict[str, dict[str, float]]:
+        with self.__lock:
+            return {
+                name: {'count': count, 'mean': total / count, 'max': longest}
+                for name, (count, total, longest) in self.__queue_waits.items()
+            }
+
+
+    def __pending(self, connection: Any) -> int:
+        shard = self.__connections.get(connection)
+        return shard[1] if shard else 0
+
+
+    def __work(self, work_queue: queue.SimpleQueue) -> None:
+        if self.initializer: self.initializer()
+        while True:
+            queued_at, connection, name, function, args = work_queue.get()
+            queue_wait = time.monotonic() - queued_at
+            self.__record_wait(name, queue_wait)
+            if queue_wait >= SLOW_QUEUE_WAIT: self.__debug(f'{name} waited {round(queue_wait, 2)} seconds for a worker')
+            try:
+                function(*args)
+            except Exception as err:
+                self.__debug(f'{name} failed: {err!r}')
+            finally:
+                self.__finish(connection)
+
+
+    def __record_wait(self, name: str, queue_wait: float) -> None:
+        with self.__lock:
+            queue_waits = self.__queue_waits.setdefault(name, [0, 0.0, 0.0])
+            queue_waits[0] += 1
+            queue_waits[1] += queue_wait
+            queue_waits[2] = max(queue_waits[2], queue_wait)
+
+
+    def __finish(self, connection: Any) -> None:
+        with self.__room:
+            shard = self.__connections[connection]
+            shard[1] -= 1
+            if not shard[1]: del self.__connections[connection]
+            self.__room.notify_all()
+
+
+    @staticmethod
+    def __debug(message: str) -> None:
+        logging.debug(f'[dispatcher]: {message}')
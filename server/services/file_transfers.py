@@ -0,0 +1,172 @@
+import hashlib
+import secrets
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import BinaryIO, Optional
+
+DEFAULT_MAX_FILE_SIZE = 16_777_216 # Bytes
+DEFAULT_TRANSFER_TIMEOUT = 3600 # Seconds an unfinished upload is kept for
+DEFAULT_SPOOL_SIZE = 1_048_576 # Bytes of an upload kept in memory before it is moved to disk
+DEFAULT_MAX_USER_UPLOAD_BYTES = 67_108_864 # Bytes one user can have uploading at once
+DEFAULT_MAX_UPLOAD_BYTES = 268_435_456 # Bytes every user together can have uploading at once
+
+
+# An upload from one user into one chat. It is authorised once when it begins, after that each
+# binary chunk only has to start where the last one ended. Chunks are appended to a spooled file
+# that moves to disk once it passes the spool size, and the hash is updated as they arrive so the
+# finished file never has to be read again. Old clients do not send a hash, so theirs is empty
+class FileTransfer:
+    def __init__(self, transfer_id: int, user_id: int, chat_id: int, file_name: str,
+                 file_size: int, file_hash: str, spool_size: int = DEFAULT_SPOOL_SIZE,
+                 temp_path: Optional[str] = None) -> None:
+
+        self.transfer_id = transfer_id
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.file_name = file_name
+        self.file_size = file_size
+        self.file_hash = file_hash
+        self.received = 0
+        self.unacknowledged = 0
+        self.last_activity = time.monotonic()
+        self.__contents = tempfile.SpooledTemporaryFile(max_size=spool_size, dir=temp_path)
+        self.__hash = hashlib.sha256()
+        self.__lock = threading.Lock()
+
+
+    @property
+    def key(self) -> tuple:
+        return (self.user_id, self.chat_id, self.file_name, self.file_hash, self.file_size)
+
+
+    @property
+    def hexdigest(self) -> str:
+        return self.__hash.hexdigest()
+
+
+    def write(self, offset: int, data: memoryview) -> bool:
+        with self.__lock:
+            if self.__contents.closed or offset != self.received or self.received + len(data) > self.file_size: return False
+            self.__contents.write(data)
+            self.__hash.update(data)
+            self.received += len(data)
+            self.unacknowledged += len(data)
+            self.last_activity = time.monotonic()
+            return True
+
+
+    # With flow control the bytes written are handed back to the uploader once half of its window
+    # has been used, so it never has to stop while the window is being refilled
+    def release_window(self, window: int) -> int:
+        with self.__lock:
+            if self.unacknowledged < window // 2: return 0
+            increment, self.unacknowledged = self.unacknowledged, 0
+            return increment
+
+
+    def is_complete(self) -> bool:
+        return self.received == self.file_size and (not self.file_hash or self.hexdigest == self.file_hash)
+
+
+    # The finished upload from the start, for the blob store to copy out of
+    def read_contents(self) -> BinaryIO:
+        self.__contents.seek(0)
+        return self.__contents
+
+
+    # Moves whatever is still held in memory to disk
+    def spill(self) -> None:
+        with self.__lock:
+            if not self.__contents.closed: self.__contents.rollover()
+
+
+    def close(self) -> None:
+        with self.__lock: self.__contents.close()
+
+
+
+# Unfinished uploads, kept when the uploader disconnects so a resumed session can carry on from
+# the last offset the server has instead of sending the file again. The full size of every upload
+# is reserved against its user's quota and the server wide quota when it begins, so however many
+# uploads clients start and abandon the bytes held for them never pass the quotas
+class FileTransfers:
+    def __init__(self, timeout: float = DEFAULT_TRANSFER_TIMEOUT, spool_size: int = DEFAULT_SPOOL_SIZE,
+                 max_user_bytes: int = DEFAULT_MAX_USER_UPLOAD_BYTES, max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+                 temp_path: Optional[str] = None) -> None:
+
+        self.timeout = timeout
+        self.spool_size = spool_size
+        self.max_user_bytes = max_user_bytes
+        self.max_bytes = max_bytes
+        self.temp_path = temp_path
+        self.reserved_bytes = 0
+        self.__lock = threading.Lock()
+        self.__transfers: dict[int, FileTransfer] = dict()
+        self.__transfer_keys: dict[tuple, int] = dict()
+        self.__user_bytes: Counter = Counter()
+
+
+    # Starting the same file in the same chat again picks up the unfinished transfer. Returns
+    # None when there is no room for the file under the user's or the server's quota
+    def begin(self, user_id: int, chat_id: int, file_name: str, file_size: int, file_hash: str) -> Optional[FileTransfer]:
+        self.expire()
+        with self.__lock:
+            transfer_id = self.__transfer_keys.get((user_id, chat_id, file_name, file_hash, file_size))
+            if transfer_id is not None: return self.__transfers[transfer_id]
+
+            if self.__user_bytes[user_id] + file_size > self.max_user_bytes: return None
+            if self.reserved_bytes + file_size > self.max_bytes: return None
+
+            transfer_id = secrets.randbits(32)
+            while transfer_id in self.__transfers: transfer_id = secrets.randbits(32)
+            transfer = FileTransfer(transfer_id, user_id, chat_id, file_name, file_size, file_hash,
+                                    self.spool_size, self.temp_path)
+            self.__transfers[transfer_id] = transfer
+            self.__transfer_keys[transfer.key] = transfer_id
+            self.__user_bytes[user_id] += file_size
+            self.reserved_bytes += file_size
+            return transfer
+
+
+    # Transfers can only be written to by the user that started them
+    def get(self, transfer_id: int, user_id: int) -> Optional[FileTransfer]:
+        transfer = self.__transfers.get(transfer_id)
+        return transfer if transfer and transfer.user_id == user_id else None
+
+
+    # Frees the transfer's share of the quotas, its contents stay readable until it is closed
+    def finish(self, transfer: FileTransfer) -> bool:
+        with self.__lock:
+            if self.__transfers.pop(transfer.transfer_id, None) is None: return False
+            self.__transfer_keys.pop(transfer.key, None)
+            self.__user_bytes[transfer.user_id] -= transfer.file_size
+            if self.__user_bytes[transfer.user_id] <= 0: del self.__user_bytes[transfer.user_id]
+            self.reserved_bytes -= transfer.file_size
+            return True
+
+
+    def cancel(self, transfer: FileTransfer) -> None:
+        self.finish(transfer)
+        transfer.close()
+
+
+    # Called once the user's last connection has gone. Old clients cannot resume, so their uploads
+    # are dropped. The rest are moved to disk until they are resumed or expire
+    def suspend(self, user_id: int) -> None:
+        with self.__lock: transfers = [transfer for transfer in self.__transfers.values() if transfer.user_id == user_id]
+        for transfer in transfers:
+            if transfer.file_hash: transfer.spill()
+            else: self.cancel(transfer)
+        self.expire()
+
+
+    def expire(self) -> None:
+        now = time.monotonic()
+        with self.__lock: expired = [transfer for transfer in self.__transfers.values() if now - transfer.last_activity > self.timeout]
+        for transfer in expired: self.cancel(transfer)
+
+
+    def __len__(self) -> int:
+        return len(self.__transfers)
@@ -0,0 +1,34 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_MAX_MESSAGE_IDS = 100_000
+
+
+# The reply each recently stored client message id became, kept in least recently used order.
+# A message sent again after a reconnect is found here without going to the database. Ids that
+# have been evicted (or were stored by another worker) are caught by the unique index instead
+class RecentMessageIds:
+    def __init__(self, max_ids: int = DEFAULT_MAX_MESSAGE_IDS) -> None:
+        self.max_ids = max_ids
+        self.__lock = threading.Lock()
+        self.__reply_ids: OrderedDict[tuple[int, str], int] = OrderedDict()
+
+
+    def get(self, user_id: int, client_message_id: str) -> Optional[int]:
+        key = (user_id, client_message_id)
+        with self.__lock:
+            reply_id = self.__reply_ids.get(key)
+            if reply_id is not None: self.__reply_ids.move_to_end(key)
+            return reply_id
+
+
+    def add(self, user_id: int, client_message_id: str, reply_id: int) -> None:
+        with self.__lock:
+            self.__reply_ids[(user_id, client_message_id)] = reply_id
+            self.__reply_ids.move_to_end((user_id, client_message_id))
+            if len(self.__reply_ids) > self.max_ids: self.__reply_ids.popitem(last=False)
+
+
+    def __len__(self) -> int:
+        return len(self.__reply_ids)
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+DEFAULT_MAX_BUCKETS = 100_000
+DEFAULT_COMMAND_CLASS = 'default'
+
+# Tokens added per second and the most that can be saved up, per command class
+DEFAULT_RATE_LIMITS: dict[str, dict[str, float]] = {
+    'auth': {'rate': 0.2, 'burst': 5},
+    'search': {'rate': 2, 'burst': 10},
+    'message': {'rate': 5, 'burst': 20},
+    'file': {'rate': 200, 'burst': 2000},
+    DEFAULT_COMMAND_CLASS: {'rate': 10, 'burst': 50},
+}
+
+DEFAULT_COMMAND_CLASSES: dict[str, str] = {
+    'login': 'auth',
+    'register': 'auth',
+    'verify': 'auth',
+    'resume': 'auth',
+    'search-for-user': 'search',
+    'send-message-request': 'message',
+    'send-file-request': 'file',
+    'file-begin': 'file',
+    'file-end': 'file',
+    'file-download-request': 'file',
+}
+
+
+# Token buckets for every (command class, key) pair, kept in least recently used order. A bucket
+# that has not been touched refills to full, so the oldest ones can be evicted once the limit is
+# reached without changing anyone's allowance. Every check is O(1) and memory never grows past max buckets
+class RateLimiter:
+    def __init__(self, limits: dict[str, dict[str, float]] = DEFAULT_RATE_LIMITS,
+                 command_classes: dict[str, str] = DEFAULT_COMMAND_CLASSES, max_buckets: int = DEFAULT_MAX_BUCKETS) -> None:
+
+        self.limits = validate_rate_limits({**DEFAULT_RATE_LIMITS, **limits})
+        self.command_classes = {**DEFAULT_COMMAND_CLASSES, **command_classes}
+        self.max_buckets = max_buckets
+        self.__lock = threading.Lock()
+        self.__buckets: OrderedDict[tuple, list[float]] = OrderedDict()
+
+
+    def get_command_class(self, command_name: str) -> str:
+        return self.command_classes.get(command_name, DEFAULT_COMMAND_CLASS)
+
+
+    # Returns zero when the command is allowed, otherwise how many seconds until it would be
+    def acquire(self, command_name: str, key: Hashable) -> float:
+        command_class = self.get_command_class(command_name)
+        limit = self.limits[command_class]
+        rate, burst = limit['rate'], limit['burst']
+        bucket_key = (command_class, key)
+        now = time.monotonic()
+
+        with self.__lock:
+            bucket = self.__buckets.get(bucket_key)
+            if bucket is None:
+                bucket = [burst, now]
+                self.__buckets[bucket_key] = bucket
+                if len(self.__buckets) > self.max_buckets: self.__buckets.popitem(last=False)
+            else:
+                self.__buckets.move_to_end(bucket_key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0
+            return (1 - bucket[0]) / rate
+
+
+    def __len__(self) -> int:
+        return len(self.__buckets)
+
+
+
+# Limits come from the settings file, so a bad one is rejected when the server starts instead of
+# failing on the first command of its class. A rate of zero would never refill, and a burst under
+# one would never allow anything
+def validate_rate_limits(limits: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    for command_class, limit in limits.items():
+        if not isinstance(limit, dict): raise ValueError(f'rate limit for {command_class} is not an object: {limit}')
+        rate, burst = limit.get('rate'), limit.get('burst')
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not rate > 0:
+            raise ValueError(f'rate limit for {command_class} needs a rate above zero: {rate}')
+        if isinstance(burst, bool) or not isinstance(burst, (int, float)) or not burst >= 1:
+            raise ValueError(f'rate limit for {command_class} needs a burst of at least one: {burst}')
+    return limits
+
+
+
+# Users are limited by account once they have logged in, before that by the address they connect from
+def get_rate_limit_key(user: Any) -> tuple:
+    if user.session_active: return ('user', user.user_id)
+    return ('address', user.address[0])
@@ -0,0 +1,59 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Optional
+
+DEFAULT_RESUME_TOKEN_TTL = 86400 # Seconds
+DEFAULT_RESUME_SECRET_PATH = 'resume_secret'
+
+
+# Reads the secret resume tokens are signed with, creating it readable only by the server the
+# first time, so tokens handed out before a restart are still accepted after it
+def load_secret(path: str = DEFAULT_RESUME_SECRET_PATH) -> str:
+    try:
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "r") as secret_file:
+            return secret_file.read().strip()
+    with os.fdopen(descriptor, "w") as secret_file:
+        secret = secrets.token_hex(32)
+        secret_file.write(secret)
+    return secret
+
+
+# Tokens handed to a client on login so it can pick its session back up after a dropped
+# connection without the user logging in again. They are signed rather than stored, so any
+# worker process with the same secret can check them. Each one carries the user's session
+# generation when it was issued, the server revokes them all by moving the generation on
+class ResumeTokens:
+    def __init__(self, secret: str, ttl: float = DEFAULT_RESUME_TOKEN_TTL) -> None:
+        self.__secret = secret.encode()
+        self.ttl = ttl
+
+
+    def issue(self, user_id: int, generation: int) -> str:
+        payload = base64.urlsafe_b64encode(json.dumps([user_id, generation, int(time.time() + self.ttl)]).encode())
+        return f"{payload.decode()}.{self.__sign(payload)}"
+
+
+    # Returns the user the token was issued to and its generation, or None if it is forged,
+    # malformed or expired. Whether the generation is still the user's is up to the caller
+    def verify(self, token: str) -> Optional[tuple[int, int]]:
+        if not isinstance(token, str) or '.' not in token: return None
+        payload, signature = token.rsplit('.', 1)
+        if not hmac.compare_digest(signature, self.__sign(payload.encode())): return None
+
+        try:
+            user_id, generation, expires = json.loads(base64.urlsafe_b64decode(payload))
+        except (ValueError, TypeError):
+            return None
+        if expires < time.time() or not isinstance(user_id, int) or not isinstance(generation, int): return None
+        return user_id, generation
+
+
+    def __sign(self, payload: bytes) -> str:
+        return hmac.new(self.__secret, payload, hashlib.sha256).hexdigest()
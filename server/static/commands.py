@@ -1,156 +1,279 @@
-from enum import Enum
-from typing import Any, TypedDict, Union
-
-from static.shared_types import (
-    MessageDetails,
-    QuestionDetails,
-    QuestionStatistics,
-    SocketCommand,
-    UserDetails,
-)
-
-
-class InboundCommands(Enum):
-    Register = "register"
-    Verify = "verify"
-    Login = "login"
-    AskQuestion = 'ask-question'
-    ViewUserProfile = 'view-user-profile'
-    CreateNewChatRequest = 'create-new-chat-request'
-    SendMessageRequest = 'send-message-request'
-    DeletePendingQuestionRequest = 'delete-pending-question-request'
-    SendFileRequest = 'send-file-request'
-    SearchForUser = 'search-for-user'
-    EndChatAsPublisher = 'end-chat-as-publisher'
-    EndChatAsRecipient = 'end-chat-as-recipient'
-    DeleteIncomingQuestionRequest = 'delete-incoming-question-request'
-
-    @staticmethod
-    def has_command(item: Any):
-        return item in [v.value for v in InboundCommands.__members__.values()]
-
-
-class OutboundCommands:
-    @staticmethod
-    def register_response(accepted: bool = True, reason: str = '') -> SocketCommand:
-        return {
-            "command_name": "register-response",
-            "arguments": {"accepted": accepted, "reason": reason},
-        }
-
-    @staticmethod
-    def verify_response(accepted: bool = True, reason: str = '') -> SocketCommand:
-        return {
-            "command_name": "verify-response",
-            "arguments": {"accepted": accepted, "reason": reason},
-        }
-
-    @staticmethod
-    def login_response(accepted: bool = True, reason: str = '') -> SocketCommand:
-        return { 
-            "command_name": "login-response",
-            "arguments": {"accepted": accepted, "reason": reason},
-        }
-
-    @staticmethod
-    def ask_question_response(accepted: bool = True, reason: str = '') -> SocketCommand:
-        return {
-            "command_name": "ask-question-response",
-            "arguments": {"accepted": accepted, "reason": reason},
-        }
-    
-    @staticmethod
-    def add_pending_question(question_id: int, details: QuestionDetails, statistics: QuestionStatistics) -> SocketCommand:
-        return {
-            "command_name": "add-pending-question",
-            "arguments": {"question_id": question_id, "question_details": details, "question_statistics": statistics},
-        }
-  
-    @staticmethod
-    def add_incoming_question(question_id: int, publisher_id: int, first_name: str, last_name: str, details: QuestionDetails) -> SocketCommand:
-        return {
-            "command_name": "add-incoming-question",
-            "arguments": {"question_id": question_id, "publisher_id": publisher_id, 
-                          "first_name": first_name, "last_name": last_name, "question_details": details},
-        }
-    
-    @staticmethod
-    def load_user_details(user_id: Any, user_details: UserDetails, user_status: str) -> SocketCommand:
-        return {
-            "command_name": "load-user-details",
-            "arguments": {"user_id": user_id, "user_details": user_details, "user_status": user_status},
-        }
-
-    @staticmethod
-    def create_profile_viewer(user_details, user_status) -> SocketCommand:
-        return {
-            "command_name": "create-profile-viewer",
-            "arguments": {"user_details": user_details, "user_status": user_status},
-        } 
-    
-    @staticmethod
-    def create_new_chat(chat_id, user_id, first_name, last_name, question_details: QuestionDetails, question_publisher: bool) -> SocketCommand:
-        return {
-            "command_name": "create-new-chat",
-            "arguments": {"user_id": user_id, "chat_id": chat_id, "first_name": first_name, 
-                          "last_name": last_name, "question_details": question_details, "question_publisher": question_publisher},
-        } 
-    
-    @staticmethod
-    def create_chat_reply(chat_id: int, message_details: MessageDetails) -> SocketCommand:
-        return {
-            "command_name": "create-chat-reply",
-            "arguments": {"chat_id": chat_id, "message_details": message_details},
-        } 
-
-    @staticmethod
-    def delete_pending_question(question_id: int) -> SocketCommand:
-        return {
-            "command_name": "delete-pending-question",
-            "arguments": {"question_id": question_id},
-        }  
-
-    @staticmethod
-    def delete_incoming_question(question_id: int) -> SocketCommand:
-        return {
-            "command_name": "delete-incoming-question",
-            "arguments": {"question_id": question_id},
-        }  
-
-    @staticmethod
-    def delete_question_chat(chat_id: int) -> SocketCommand:
-        return {
-            "command_name": "delete-question-chat",
-            "arguments": {"chat_id": chat_id},
-        }  
-    
-    @staticmethod
-    def load_file(chat_id: int, file_name: str, contents: str, file_size: int, end: bool) -> SocketCommand:
-        return {
-            "command_name": "load-file",
-            "arguments": {"chat_id": chat_id, "file_name": file_name, 
-                          "contents": contents, 'file_size': file_size, 'end': end},
-        }  
-    
-    @staticmethod
-    def create_manual_user(user_id: int, first_name: str, last_name: str, user_status: str) -> SocketCommand:
-        return {
-            "command_name": "create-manual-user",
-            "arguments": {"user_id": user_id, "first_name": first_name, 
-                          "last_name": last_name, 'status': user_status},
-        }  
-    
-    @staticmethod
-    def update_question_statistics(question_id: int, question_statistics: QuestionStatistics) -> SocketCommand:
-        return {
-            "command_name": "update-question-statistics",
-            "arguments": {"question_id": question_id, "question_statistics": question_statistics}
-        }  
-
-    
-    @staticmethod
-    def display_rating_error(chat_id: int, reason: str) -> SocketCommand:
-        return {
-            "command_name": "display-rating-error",
-            "arguments": {"chat_id": chat_id, "reason": reason}
-        }  
\ No newline at end of file
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Optional, TypedDict, Union
+
+from static.shared_types import (
+    FileDetails,
+    MessageDetails,
+    QuestionDetails,
+    QuestionStatistics,
+    SocketCommand,
+    UserDetails,
+)
+
+
+class InboundCommands(Enum):
+    Register = "register"
+    Verify = "verify"
+    Login = "login"
+    AskQuestion = 'ask-question'
+    ViewUserProfile = 'view-user-profile'
+    CreateNewChatRequest = 'create-new-chat-request'
+    SendMessageRequest = 'send-message-request'
+    DeletePendingQuestionRequest = 'delete-pending-question-request'
+    SendFileRequest = 'send-file-request'
+    SearchForUser = 'search-for-user'
+    EndChatAsPublisher = 'end-chat-as-publisher'
+    EndChatAsRecipient = 'end-chat-as-recipient'
+    DeleteIncomingQuestionRequest = 'delete-incoming-question-request'
+    Ping = 'ping'
+    Pong = 'pong'
+    Resume = 'resume'
+    FileBegin = 'file-begin'
+    FileEnd = 'file-end'
+    FileDownloadRequest = 'file-download-request'
+    AckReplies = 'ack-replies'
+    SignOut = 'sign-out'
+
+    @staticmethod
+    def has_command(item: Any):
+        return item in [v.value for v in InboundCommands.__members__.values()]
+
+
+# Outbound commands that are safe to drop for a client that has fallen behind, the next
+# update replaces them. A rate-limited reply is not one of them, it is the only answer to the request
+DROPPABLE_COMMANDS = frozenset({'update-question-statistics', 'ping', 'pong'})
+
+# Outbound commands that belong to a file stream. They are queued behind the stream's binary frames
+# instead of with the other commands, which are sent first
+BULK_COMMANDS = frozenset({'load-file', 'file-begin', 'file-end'})
+
+# Set while a handler runs for a request that carried an id. Responses to it echo the id so the
+# client can match them up with several requests in flight
+current_request_id: ContextVar[Optional[int]] = ContextVar('current_request_id', default=None)
+
+
+def with_request_id(command: SocketCommand) -> SocketCommand:
+    request_id = current_request_id.get()
+    if request_id is not None: command['request_id'] = request_id
+    return command
+
+
+class OutboundCommands:
+    @staticmethod
+    def register_response(accepted: bool = True, reason: str = '') -> SocketCommand:
+        return with_request_id({
+            "command_name": "register-response",
+            "arguments": {"accepted": accepted, "reason": reason},
+        })
+
+    @staticmethod
+    def verify_response(accepted: bool = True, reason: str = '') -> SocketCommand:
+        return with_request_id({
+            "command_name": "verify-response",
+            "arguments": {"accepted": accepted, "reason": reason},
+        })
+
+    @staticmethod
+    def login_response(accepted: bool = True, reason: str = '') -> SocketCommand:
+        return with_request_id({ 
+            "command_name": "login-response",
+            "arguments": {"accepted": accepted, "reason": reason},
+        })
+
+    @staticmethod
+    def ask_question_response(accepted: bool = True, reason: str = '') -> SocketCommand:
+        return with_request_id({
+            "command_name": "ask-question-response",
+            "arguments": {"accepted": accepted, "reason": reason},
+        })
+    
+    @staticmethod
+    def add_pending_question(question_id: int, details: QuestionDetails, statistics: QuestionStatistics) -> SocketCommand:
+        return {
+            "command_name": "add-pending-question",
+            "arguments": {"question_id": question_id, "question_details": details, "question_statistics": statistics},
+        }
+  
+    @staticmethod
+    def add_incoming_question(question_id: int, publisher_id: int, first_name: str, last_name: str, details: QuestionDetails) -> SocketCommand:
+        return {
+            "command_name": "add-incoming-question",
+            "arguments": {"question_id": question_id, "publisher_id": publisher_id, 
+                          "first_name": first_name, "last_name": last_name, "question_details": details},
+        }
+    
+    @staticmethod
+    def load_user_details(user_id: Any, user_details: UserDetails, user_status: str) -> SocketCommand:
+        return {
+            "command_name": "load-user-details",
+            "arguments": {"user_id": user_id, "user_details": user_details, "user_status": user_status},
+        }
+
+    @staticmethod
+    def create_profile_viewer(user_details, user_status) -> SocketCommand:
+        return with_request_id({
+            "command_name": "create-profile-viewer",
+            "arguments": {"user_details": user_details, "user_status": user_status},
+        }) 
+    
+    # Tells the sender its message is stored, a reply id of zero means it was refused
+    @staticmethod
+    def message_ack(chat_id: int, client_message_id: str, reply_id: int) -> SocketCommand:
+        return {
+            "command_name": "message-ack",
+            "arguments": {"chat_id": chat_id, "client_message_id": client_message_id, "reply_id": reply_id},
+        }
+    
+    @staticmethod
+    def create_new_chat(chat_id, user_id, first_name, last_name, question_details: QuestionDetails, question_publisher: bool) -> SocketCommand:
+        return {
+            "command_name": "create-new-chat",
+            "arguments": {"user_id": user_id, "chat_id": chat_id, "first_name": first_name, 
+                          "last_name": last_name, "question_details": question_details, "question_publisher": question_publisher},
+        } 
+    
+    @staticmethod
+    def create_chat_reply(chat_id: int, message_details: MessageDetails) -> SocketCommand:
+        return {
+            "command_name": "create-chat-reply",
+            "arguments": {"chat_id": chat_id, "message_details": message_details},
+        } 
+
+    @staticmethod
+    def delete_pending_question(question_id: int) -> SocketCommand:
+        return {
+            "command_name": "delete-pending-question",
+            "arguments": {"question_id": question_id},
+        }  
+
+    @staticmethod
+    def delete_incoming_question(question_id: int) -> SocketCommand:
+        return {
+            "command_name": "delete-incoming-question",
+            "arguments": {"question_id": question_id},
+        }  
+
+    @staticmethod
+    def delete_question_chat(chat_id: int) -> SocketCommand:
+        return {
+            "command_name": "delete-question-chat",
+            "arguments": {"chat_id": chat_id},
+        }  
+    
+    @staticmethod
+    def load_file(chat_id: int, file_name: str, contents: str, file_size: int, end: bool) -> SocketCommand:
+        return {
+            "command_name": "load-file",
+            "arguments": {"chat_id": chat_id, "file_name": file_name, 
+                          "contents": contents, 'file_size': file_size, 'end': end},
+        }  
+    
+    # Only the details of a file are sent to a chat, its contents are downloaded when opened
+    @staticmethod
+    def create_chat_file(chat_id: int, file_details: FileDetails) -> SocketCommand:
+        return {
+            "command_name": "create-chat-file",
+            "arguments": {"chat_id": chat_id, "file_details": file_details},
+        }
+
+    # A file sent as binary frames is announced by file-begin and closed by file-end, the
+    # offset is where the first frame starts when only part of the file is being sent
+    @staticmethod
+    def file_begin(transfer_id: int, chat_id: int, file_name: str, file_size: int, file_hash: str, offset: int = 0) -> SocketCommand:
+        return {
+            "command_name": "file-begin",
+            "arguments": {"transfer_id": transfer_id, "chat_id": chat_id, "file_name": file_name,
+                          "file_size": file_size, "file_hash": file_hash, "offset": offset},
+        }
+
+    @staticmethod
+    def file_begin_response(chat_id: int, file_hash: str, transfer_id: int = 0, offset: int = 0, 
+                            accepted: bool = True, reason: str = '', window: int = 0) -> SocketCommand:
+        return with_request_id({
+            "command_name": "file-begin-response",
+            "arguments": {"chat_id": chat_id, "file_hash": file_hash, "transfer_id": transfer_id,
+                          "offset": offset, "accepted": accepted, "reason": reason, "window": window},
+        })
+
+    # Lets the uploader send this many more bytes on the transfer's stream
+    @staticmethod
+    def file_window(transfer_id: int, increment: int) -> SocketCommand:
+        return {
+            "command_name": "file-window",
+            "arguments": {"transfer_id": transfer_id, "increment": increment},
+        }
+
+    @staticmethod
+    def file_end(transfer_id: int) -> SocketCommand:
+        return {
+            "command_name": "file-end",
+            "arguments": {"transfer_id": transfer_id},
+        }
+    
+    @staticmethod
+    def create_manual_user(user_id: int, first_name: str, last_name: str, user_status: str) -> SocketCommand:
+        return {
+            "command_name": "create-manual-user",
+            "arguments": {"user_id": user_id, "first_name": first_name, 
+                          "last_name": last_name, 'status': user_status},
+        }  
+    
+    @staticmethod
+    def update_question_statistics(question_id: int, question_statistics: QuestionStatistics) -> SocketCommand:
+        return {
+            "command_name": "update-question-statistics",
+            "arguments": {"question_id": question_id, "question_statistics": question_statistics}
+        }  
+
+    
+    @staticmethod
+    def batch(commands: list[SocketCommand]) -> SocketCommand:
+        return {
+            "command_name": "batch",
+            "arguments": {"commands": commands}
+        }
+
+
+    @staticmethod
+    def display_rating_error(chat_id: int, reason: str) -> SocketCommand:
+        return {
+            "command_name": "display-rating-error",
+            "arguments": {"chat_id": chat_id, "reason": reason}
+        }
+
+
+    # Sent instead of running a command the client has been sending too often
+    @staticmethod
+    def rate_limited(command_name: str, retry_after: float) -> SocketCommand:
+        return with_request_id({
+            "command_name": "rate-limited",
+            "arguments": {"command": command_name, "retry_after": retry_after}
+        })
+
+
+    # Lets the client resume its session after a dropped connection instead of logging in again
+    @staticmethod
+    def session_token(token: str) -> SocketCommand:
+        return {
+            "command_name": "session-token",
+            "arguments": {"token": token}
+        }
+
+
+    @staticmethod
+    def resume_response(accepted: bool = True, reason: str = '') -> SocketCommand:
+        return with_request_id({
+            "command_name": "resume-response",
+            "arguments": {"accepted": accepted, "reason": reason}
+        })
+
+
+    @staticmethod
+    def ping() -> SocketCommand:
+        return {"command_name": "ping", "arguments": {}}
+
+
+    @staticmethod
+    def pong() -> SocketCommand:
+        return {"command_name": "pong", "arguments": {}}